@@ -0,0 +1,68 @@
+"""
+Admin changelists for large tables.
+
+The stock changelist counts every matching row twice per page (once for the
+paginator and once for the "N total" link). ``LargeTableAdminMixin`` drops the
+second count and pages with ``EstimatedCountPaginator``, which counts at most
+ADMIN_EXACT_COUNT_LIMIT rows. Beyond that, an unfiltered list takes the row
+count from the planner statistics (PostgreSQL ``pg_class``, SQLite
+``sqlite_stat1`` after ANALYZE) and a filtered one stops paging at the limit.
+"""
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+# Changelist parameters that don't narrow the rows: page and ordering
+UNFILTERED_PARAMS = {'p', 'o'}
+
+
+def estimated_count(model, using='default'):
+    """Row count of ``model``'s table from planner statistics, or None when there are none"""
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql, params = 'SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [connection.ops.quote_name(table)]
+    elif connection.vendor == 'sqlite':
+        sql, params = 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [table]
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+    except DatabaseError:
+        # sqlite_stat1 only exists once ANALYZE has run
+        return None
+    if row is None:
+        return None
+    estimate = int(float(str(row[0]).split()[0]))
+    return estimate if estimate > 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, unfiltered=False):
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        self.unfiltered = unfiltered
+
+    @cached_property
+    def count(self):
+        limit = settings.ADMIN_EXACT_COUNT_LIMIT
+        exact = self.object_list.order_by()[:limit + 1].count()
+        if exact <= limit:
+            return exact
+        if self.unfiltered:
+            estimate = estimated_count(self.object_list.model, self.object_list.db)
+            if estimate is not None:
+                return max(estimate, limit)
+        return limit
+
+
+class LargeTableAdminMixin:
+    """ModelAdmin mixin: bounded counts; pair with list_select_related and autocomplete_fields"""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        unfiltered = set(request.GET) <= UNFILTERED_PARAMS
+        return self.paginator(queryset, per_page, orphans, allow_empty_first_page, unfiltered=unfiltered)
@@ -0,0 +1,118 @@
+"""
+Content-encoding negotiation and compressors used by CompressionMiddleware.
+
+Brotli is used when the ``brotli`` package is installed and the client accepts
+it, gzip otherwise. Bodies of responses marked ``Cache-Control: public`` (the
+hackathon list and search endpoints) are also kept in the cache in
+compressed form, keyed by a digest of the raw body, so identical public
+payloads are only compressed once.
+"""
+import hashlib
+import re
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_max_age
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'application/json', 'application/x-ndjson', 'text/', 'application/javascript', 'application/xml',
+)
+
+_accept_encoding_re = re.compile(r'\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*')
+
+
+def supported_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick the best supported encoding from an Accept-Encoding header, or None."""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(','):
+        match = _accept_encoding_re.fullmatch(part)
+        if not match:
+            continue
+        try:
+            weights[match.group(1).lower()] = float(match.group(2) or 1)
+        except ValueError:
+            continue
+    best, best_weight = None, 0.0
+    for encoding in supported_encodings():
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(response):
+    content_type = response.get('Content-Type', '')
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding):
+    """Compress an iterator of byte chunks, flushing after every chunk."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+async def acompress_stream(chunks, encoding):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        async for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+        async for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def is_public(response):
+    return 'public' in response.get('Cache-Control', '')
+
+
+def compress_cached(data, encoding, timeout):
+    """compress() with the result kept in the cache for ``timeout`` seconds."""
+    key = f'compressed:{encoding}:{hashlib.blake2b(data, digest_size=16).hexdigest()}'
+    compressed = cache.get(key)
+    if compressed is None:
+        compressed = compress(data, encoding)
+        cache.set(key, compressed, timeout)
+    return compressed
+
+
+def public_cache_timeout(response):
+    max_age = get_max_age(response)
+    return max_age if max_age else settings.COMPRESSION_CACHE_SECONDS
@@ -0,0 +1,7 @@
+"""
+Database backends used by BuildBuddy.
+
+``config.db_backends.postgresql`` adds an in-process connection pool on top of
+Django's PostgreSQL backend and ``config.db_backends.sqlite3`` applies tuned
+PRAGMAs to every new SQLite connection.
+"""
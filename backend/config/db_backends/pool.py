@@ -0,0 +1,176 @@
+"""
+Thread-safe connection pool shared by the workers of one process.
+
+Django opens one connection per thread and, with CONN_MAX_AGE, keeps it for
+the life of that thread. Under bursty traffic that still means a connect per
+new thread plus a reconnect every time a connection expires. The pool keeps a
+bounded set of warm connections per database alias and hands them out on
+``connect()``/``close()`` instead.
+"""
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+# psycopg2.extensions.TRANSACTION_STATUS_* / psycopg.pq.TransactionStatus
+TRANSACTION_STATUS_IDLE = 0
+TRANSACTION_STATUS_UNKNOWN = 4
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, connect, min_size=2, max_size=10, timeout=30.0,
+                 check=True, max_idle=600.0, name='default'):
+        if min_size > max_size:
+            raise ValueError("Pool min_size cannot be larger than max_size")
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check = check
+        self.max_idle = max_idle
+        self._connect = connect
+        self._idle = deque()  # (connection, returned_at)
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._stats = {
+            'connections_created': 0,
+            'connections_reused': 0,
+            'connections_discarded': 0,
+            'health_check_failures': 0,
+            'checkouts': 0,
+            'timeouts': 0,
+            'wait_ms_total': 0.0,
+        }
+        self._in_use = 0
+        for _ in range(min_size):
+            self._idle.append((self._new_connection(), time.monotonic()))
+
+    def _new_connection(self):
+        conn = self._connect()
+        with self._lock:
+            self._stats['connections_created'] += 1
+        return conn
+
+    def _discard(self, conn):
+        with self._lock:
+            self._stats['connections_discarded'] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_usable(self, conn, idle_for):
+        if conn.closed:
+            return False
+        if not self.check or idle_for < 1.0:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if not conn.autocommit:
+                conn.rollback()
+            return True
+        except Exception:
+            with self._lock:
+                self._stats['health_check_failures'] += 1
+            return False
+
+    def getconn(self):
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise PoolTimeout(
+                f"Couldn't get a connection from pool '{self.name}' "
+                f"within {self.timeout}s ({self.max_size} in use)"
+            )
+        try:
+            while True:
+                with self._lock:
+                    entry = self._idle.pop() if self._idle else None
+                if entry is None:
+                    conn = self._new_connection()
+                    break
+                conn, returned_at = entry
+                idle_for = time.monotonic() - returned_at
+                if idle_for > self.max_idle or not self._is_usable(conn, idle_for):
+                    self._discard(conn)
+                    continue
+                with self._lock:
+                    self._stats['connections_reused'] += 1
+                break
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._in_use += 1
+            self._stats['checkouts'] += 1
+            self._stats['wait_ms_total'] += (time.monotonic() - started) * 1000
+        return conn
+
+    def putconn(self, conn):
+        try:
+            status = None if conn.closed else conn.info.transaction_status
+            if status is None or status == TRANSACTION_STATUS_UNKNOWN:
+                self._discard(conn)
+            else:
+                if status != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                with self._lock:
+                    self._idle.append((conn, time.monotonic()))
+        except Exception:
+            self._discard(conn)
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(
+                name=self.name,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                in_use=self._in_use,
+                idle=len(self._idle),
+            )
+        return stats
+
+
+def get_pool(alias, connect, **options):
+    """Return the pool for ``alias``, creating it on first use."""
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                pool = _pools[alias] = ConnectionPool(connect, name=alias, **options)
+    return pool
+
+
+def pool_stats():
+    """Metrics for every pool opened in this process."""
+    return [pool.stats() for pool in list(_pools.values())]
+
+
+def close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,52 @@
+"""
+PostgreSQL backend that borrows connections from a per-process pool.
+
+Enable it with ``ENGINE='config.db_backends.postgresql'`` and configure the
+pool through ``OPTIONS['pool']``::
+
+    'OPTIONS': {'pool': {'min_size': 2, 'max_size': 10, 'timeout': 30}}
+
+``CONN_MAX_AGE`` should stay at 0: Django "closes" the connection at the end of
+each request, which returns it to the pool instead of dropping it.
+"""
+from django.db.backends.postgresql import base
+
+from config.db_backends.pool import get_pool
+
+
+class _PooledDatabase:
+    """Stands in for the driver module so ``connect()`` checks out from the pool."""
+
+    def __init__(self, wrapper):
+        self._wrapper = wrapper
+
+    def connect(self, **conn_params):
+        wrapper = self._wrapper
+        pool = get_pool(
+            wrapper.alias,
+            lambda: base.Database.connect(**conn_params),
+            **wrapper.pool_options
+        )
+        return pool.getconn()
+
+    def __getattr__(self, name):
+        return getattr(base.Database, name)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        options = self.settings_dict.get('OPTIONS', {})
+        self.pool_options = dict(options.get('pool') or {})
+        self.Database = _PooledDatabase(self)
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+        return conn_params
+
+    def _close(self):
+        if self.connection is not None:
+            pool = get_pool(self.alias, None)
+            with self.wrap_database_errors:
+                pool.putconn(self.connection)
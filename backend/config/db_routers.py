@@ -0,0 +1,87 @@
+"""
+Read-replica routing.
+
+Browse endpoints opt in with ``@use_replica``; every other query keeps going to
+``default``. A client that has just written (any successful non-GET request,
+see ``config.middleware.ReadYourWritesMiddleware``) is pinned to ``default``
+for ``READ_YOUR_WRITES_SECONDS`` so it sees its own change even when the
+replica lags, e.g. a freshly created team shows up in ``list_teams``. The
+window is kept in the default cache, so settings refuse a real replica
+without a cache shared by every worker (REDIS_URL).
+"""
+import functools
+import hashlib
+import inspect
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+def replica_alias():
+    alias = getattr(settings, 'REPLICA_DATABASE_ALIAS', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+def _client_key(request):
+    auth_header = request.headers.get('Authorization', '')
+    if not auth_header:
+        return None
+    return 'ryw:' + hashlib.sha1(auth_header.encode()).hexdigest()
+
+
+def mark_recent_write(request):
+    """Pin this client to the primary for the read-your-writes window."""
+    key = _client_key(request)
+    if key:
+        cache.set(key, True, settings.READ_YOUR_WRITES_SECONDS)
+
+
+def wrote_recently(request):
+    key = _client_key(request)
+    return bool(key) and cache.get(key, False)
+
+
+def use_replica(view_func):
+    """Route the view's reads to the replica unless the client just wrote."""
+    def should_use_replica(request):
+        return replica_alias() is not None and not wrote_recently(request)
+
+    if inspect.iscoroutinefunction(view_func):
+        @functools.wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            token = _read_from_replica.set(should_use_replica(request))
+            try:
+                return await view_func(request, *args, **kwargs)
+            finally:
+                _read_from_replica.reset(token)
+        return async_wrapper
+
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        token = _read_from_replica.set(should_use_replica(request))
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _read_from_replica.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _read_from_replica.get():
+            return replica_alias()
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives schema changes through replication
+        return db == 'default'
@@ -0,0 +1,135 @@
+"""
+Facet counts for the browse filters.
+
+A browse endpoint describes its active filters as one Q per dimension. Each
+facet is then one GROUP BY query over the rows matching every other filter: a
+scalar facet ignores its own filter, so every option shows how many results
+picking it instead would give, while list facets (skills) narrow like their
+filter does. List values stored in a JSON array are unnested and counted in
+SQL (``json_each`` on SQLite, ``jsonb_array_elements_text`` on PostgreSQL).
+
+Results are cached per filter set under a name ('hackathons', 'teams'). Code
+that writes the grouped columns calls ``invalidate``, which bumps the name's
+version so every cached filter set is dropped at once; FACET_CACHE_SECONDS
+bounds staleness for writes that go around it. The version only reaches every
+process through a shared cache, so without REDIS_URL FACET_CACHE_SECONDS
+defaults to 0 and every request counts afresh.
+"""
+import hashlib
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import NotSupportedError, connections
+from django.db.models import Count, JSONField, Lookup
+
+
+@JSONField.register_lookup
+class ContainsAll(Lookup):
+    """``field__contains_all=[...]``: the JSON array holds every listed value"""
+    lookup_name = 'contains_all'
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError(f'contains_all is not supported on {connection.vendor}')
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        return f'{lhs} @> %s::jsonb', [*lhs_params, json.dumps(list(self.rhs))]
+
+    def as_sqlite(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        values = list(dict.fromkeys(self.rhs))
+        placeholders = ', '.join(['%s'] * len(values))
+        sql = f'(SELECT COUNT(DISTINCT value) FROM json_each({lhs}) WHERE value IN ({placeholders})) = %s'
+        return sql, [*lhs_params, *values, len(values)]
+
+
+def _version_key(name):
+    return f'facets:{name}:version'
+
+
+async def aget(name, filters, build):
+    """Cached result of the ``build`` coroutine for the ``filters`` dict"""
+    if not settings.FACET_CACHE_SECONDS:
+        return await build()
+    version = await cache.aget(_version_key(name), 0)
+    digest = hashlib.md5(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+    key = f'facets:{name}:{version}:{digest}'
+    result = await cache.aget(key)
+    if result is None:
+        result = await build()
+        await cache.aset(key, result, settings.FACET_CACHE_SECONDS)
+    return result
+
+
+def invalidate(*names):
+    cache.set_many({_version_key(name): time.time_ns() for name in names}, None)
+
+
+def excluding(queryset, filters, dimension):
+    """``queryset`` narrowed by every filter in ``filters`` but ``dimension``'s"""
+    return queryset.filter(*(q for dim, q in filters.items() if dim != dimension))
+
+
+async def acount_by(queryset, field, label=None, limit=None):
+    """
+    Count ``queryset`` rows per value of ``field`` in one GROUP BY.
+
+    Returns ``(value, label, count)`` tuples, where ``label`` is another field
+    grouped alongside (the value itself when not given); with ``limit`` only the
+    largest groups are returned, largest first.
+    """
+    fields = [field, label] if label else [field]
+    rows = queryset.order_by().values_list(*fields).annotate(n=Count('pk'))
+    if limit:
+        rows = rows.order_by('-n', field)[:limit]
+    return [(row[0], row[-2], row[-1]) async for row in rows]
+
+
+def _json_array_counts(queryset, field, limit):
+    using = queryset.db
+    connection = connections[using]
+    column = connection.ops.quote_name(queryset.model._meta.get_field(field).column)
+    inner, params = queryset.order_by().values(field).query.get_compiler(using=using).as_sql()
+    if connection.vendor == 'postgresql':
+        elements = (
+            f"jsonb_array_elements_text(CASE WHEN jsonb_typeof(t.{column}) = 'array' "
+            f"THEN t.{column} ELSE '[]'::jsonb END) AS e(value)"
+        )
+    elif connection.vendor == 'sqlite':
+        elements = f"json_each(CASE WHEN json_type(t.{column}) = 'array' THEN t.{column} ELSE '[]' END) AS e"
+    else:
+        raise NotSupportedError(f'JSON array facets are not supported on {connection.vendor}')
+    sql = (
+        f'SELECT e.value, COUNT(*) AS n FROM ({inner}) AS t, {elements} '
+        f'GROUP BY e.value ORDER BY n DESC, e.value LIMIT %s'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, limit])
+        return [(value, value, n) for value, n in cursor.fetchall()]
+
+
+async def acount_json_array(queryset, field, limit=None):
+    """Like ``acount_by`` for a JSON array field, counting each element of every row"""
+    return await sync_to_async(_json_array_counts)(queryset, field, limit or settings.FACET_LIMIT)
+
+
+def choice_facet(rows, choices):
+    """Every choice with its label and count, zero counts included"""
+    counts = {value: count for value, _, count in rows}
+    return [{'value': value, 'label': label, 'count': counts.get(value, 0)} for value, label in choices]
+
+
+def top_facet(rows):
+    """``acount_by`` rows as facet options, in the order given"""
+    return [{'value': value, 'label': label, 'count': count} for value, label, count in rows]
+
+
+def selected_count(rows, selected):
+    """The total for a scalar facet's rows: its selected value's count, or every row when unfiltered"""
+    if selected:
+        return next((count for value, _, count in rows if value == selected), 0)
+    return sum(count for _, _, count in rows)
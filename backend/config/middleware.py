@@ -0,0 +1,74 @@
+"""
+Project-wide middleware for BuildBuddy.
+"""
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from config import compression
+from config.db_routers import mark_recent_write, replica_alias
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReadYourWritesMiddleware(MiddlewareMixin):
+    """Remember clients that just wrote so their next reads skip the replica."""
+
+    def process_response(self, request, response):
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and replica_alias() is not None
+        ):
+            mark_recent_write(request)
+        return response
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Brotli/gzip compression for JSON and text responses.
+
+    Responses smaller than COMPRESSION_MIN_SIZE are sent as-is, since the
+    encoding overhead outweighs the savings. Streaming responses are always
+    compressed chunk by chunk.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or not compression.is_compressible(response):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = compression.negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compression.acompress_stream(
+                    response.streaming_content, encoding
+                )
+            else:
+                response.streaming_content = compression.compress_stream(
+                    response.streaming_content, encoding
+                )
+            del response.headers['Content-Length']
+        else:
+            if compression.is_public(response):
+                compressed = compression.compress_cached(
+                    response.content, encoding, compression.public_cache_timeout(response)
+                )
+            else:
+                compressed = compression.compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,229 @@
+"""
+Opt-in request profiling.
+
+With PROFILING_ENABLED, ``ProfilingMiddleware`` profiles requests that carry a
+signed ``X-Profile`` header (``manage.py profiling_token``) and a random
+PROFILING_SAMPLE_RATE share of the rest. A profiled request gets a sampler
+thread that records the stacks of the process's threads every
+PROFILING_INTERVAL_MS; nothing is traced in between, so the request runs at
+close to full speed. Every thread is sampled, each stack rooted at the
+thread's name, because async views run on an event loop thread (asgiref's
+under WSGI) and sync views under ASGI on asgiref's sync threads. Sync gunicorn
+workers serve one request at a time, so there the profile is the request's
+alone; under ASGI it also holds whatever else the worker ran meanwhile.
+
+Each profile is written to PROFILING_DIR, which keeps the newest
+PROFILING_MAX_PROFILES, by a background writer thread so the profiled request
+doesn't wait for the disk: ``<id>.json`` holds the stacks and a small
+``<id>.meta`` sidecar the metadata, so listing profiles never parses stacks.
+The response's ``X-Profile-Id`` header names it (the files appear once the
+writer gets to them); staff download it from ``/api/profiles/<id>`` as
+collapsed stacks (``frame;frame;frame count`` lines), which flamegraph.pl,
+speedscope and similar tools render as a flame graph.
+"""
+import json
+import logging
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+
+HEADER = 'X-Profile'
+TOKEN_SALT = 'config.profiling'
+PROFILE_ID = re.compile(r'^[0-9]+-[0-9a-f]+$')
+WRITER_THREAD = 'profile-writer'
+
+logger = logging.getLogger(__name__)
+
+# One thread, so writes and pruning never race each other
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix=WRITER_THREAD)
+
+
+def make_token():
+    """A header value that asks for a profile until PROFILING_TOKEN_MAX_AGE runs out"""
+    return signing.dumps('profile', salt=TOKEN_SALT)
+
+
+def _valid_token(token):
+    try:
+        return signing.loads(token, salt=TOKEN_SALT, max_age=settings.PROFILING_TOKEN_MAX_AGE) == 'profile'
+    except signing.BadSignature:
+        return False
+
+
+def wants_profile(request):
+    token = request.headers.get(HEADER)
+    if token:
+        return _valid_token(token)
+    return random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+def _frame_name(code, module):
+    return f'{module}.{code.co_qualname}' if module else code.co_qualname
+
+
+class Sampler:
+    """Count the stacks of every other thread from a background thread until stopped"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _run(self):
+        names = {}
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            threads = None
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                if threads is None:
+                    threads = {thread.ident: thread.name for thread in threading.enumerate()}
+                thread_name = threads.get(thread_id, str(thread_id))
+                if thread_name.startswith(WRITER_THREAD):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    name = names.get(code)
+                    if name is None:
+                        name = names[code] = _frame_name(code, frame.f_globals.get('__name__'))
+                    stack.append(name)
+                    frame = frame.f_back
+                stack.append(thread_name)
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+
+def _directory():
+    directory = Path(settings.PROFILING_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def save(request, response, sampler):
+    """Hand the profile to the writer thread and return its id"""
+    profile_id = f'{time.time_ns()}-{secrets.token_hex(4)}'
+    profile = {
+        'id': profile_id,
+        'method': request.method,
+        'path': request.path,
+        'status': response.status_code,
+        'duration_ms': round(sampler.duration * 1000, 2),
+        'interval_ms': settings.PROFILING_INTERVAL_MS,
+        'samples': sampler.samples,
+        'pid': os.getpid(),
+    }
+    # The sampler thread has stopped, so its stacks no longer change
+    _writer.submit(_write, profile, sampler.stacks)
+    return profile_id
+
+
+def _write(profile, stacks):
+    """Write the profile and its metadata sidecar, and drop the oldest beyond PROFILING_MAX_PROFILES"""
+    profile_id = profile['id']
+    try:
+        directory = _directory()
+        # The sidecar goes last, so a listed profile is always complete
+        _replace(directory / f'{profile_id}.json', {**profile, 'stacks': dict(stacks.most_common())})
+        _replace(directory / f'{profile_id}.meta', profile)
+
+        # Ids start with the creation time, so name order is age order
+        stored = sorted(directory.glob('*.json'))
+        for old in stored[:-settings.PROFILING_MAX_PROFILES]:
+            old.with_suffix('.meta').unlink(missing_ok=True)
+            old.unlink(missing_ok=True)
+    except OSError:
+        logger.exception('Could not write profile %s', profile_id)
+
+
+def _replace(path, data):
+    temporary = path.with_name(f'.{path.name}.tmp')
+    temporary.write_text(json.dumps(data))
+    os.replace(temporary, path)
+
+
+def load(profile_id):
+    """The stored profile with ``profile_id``, or None"""
+    if not PROFILE_ID.match(profile_id):
+        return None
+    try:
+        return json.loads((Path(settings.PROFILING_DIR) / f'{profile_id}.json').read_text())
+    except FileNotFoundError:
+        return None
+
+
+def list_profiles():
+    """Stored profiles without their stacks, newest first"""
+    directory = Path(settings.PROFILING_DIR)
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for path in sorted(directory.glob('*.meta'), reverse=True):
+        try:
+            profiles.append(json.loads(path.read_text()))
+        except FileNotFoundError:
+            # Pruned since the glob
+            continue
+    return profiles
+
+
+def collapsed(profile):
+    """The profile as collapsed stacks, one ``frame;frame count`` line per stack"""
+    return ''.join(f'{stack} {count}\n' for stack, count in profile['stacks'].items())
+
+
+class ProfilingMiddleware:
+    """Profile requests that ask for it with X-Profile or are picked by PROFILING_SAMPLE_RATE"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.interval = settings.PROFILING_INTERVAL_MS / 1000
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not wants_profile(request):
+            return self.get_response(request)
+        with Sampler(self.interval) as sampler:
+            response = self.get_response(request)
+        response[f'{HEADER}-Id'] = save(request, response, sampler)
+        return response
+
+    async def __acall__(self, request):
+        if not wants_profile(request):
+            return await self.get_response(request)
+        with Sampler(self.interval) as sampler:
+            response = await self.get_response(request)
+        response[f'{HEADER}-Id'] = save(request, response, sampler)
+        return response
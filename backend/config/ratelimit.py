@@ -0,0 +1,132 @@
+"""
+Token-bucket rate limiting for API routes.
+
+A route opts in with ``@rate_limit('<policy>')`` under its router decorator.
+RATE_LIMITS maps each policy to ``'<requests>/<seconds>'``: a bucket that holds
+that many requests and refills at that rate. Every route has its own buckets,
+one per authenticated user or, for anonymous requests, per client IP. A request that finds its bucket
+empty gets 429 with a Retry-After header (see the handler in config/urls.py).
+
+Local-memory caches are per process anyway, so with one as RATE_LIMIT_CACHE
+the buckets live in a plain dict in this module, guarded by a lock; a bucket is
+stored as one number, the time at which it will be full again. Shared caches
+such as Redis or Memcached have no compare-and-set in Django's cache API, so
+there every worker counts requests per window of the policy's length with the
+atomic ``cache.add`` and ``cache.incr``: at most ``<requests>`` per window,
+with up to twice that across a window boundary.
+"""
+import functools
+import inspect
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+# Local buckets are pruned of full ones once there are this many
+LOCAL_PRUNE_SIZE = 10000
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f'Rate limited, retry after {retry_after}s')
+        self.retry_after = retry_after
+
+
+def _parse(rate):
+    requests, seconds = rate.split('/')
+    return int(requests), float(seconds) / int(requests)
+
+
+class _LocalBuckets:
+    def __init__(self):
+        self.full_at = {}
+        self.lock = threading.Lock()
+        self.prune_at = LOCAL_PRUNE_SIZE
+
+    def take(self, key, capacity, interval, now):
+        with self.lock:
+            full_at = max(self.full_at.get(key, now), now)
+            wait = full_at - now - (capacity - 1) * interval
+            if wait > 0:
+                return wait
+            self.full_at[key] = full_at + interval
+            if len(self.full_at) >= self.prune_at:
+                self.full_at = {k: t for k, t in self.full_at.items() if t > now}
+                self.prune_at = max(LOCAL_PRUNE_SIZE, 2 * len(self.full_at))
+            return 0
+
+
+class _CacheBuckets:
+    def __init__(self, cache):
+        self.cache = cache
+
+    def take(self, key, capacity, interval, now):
+        window = capacity * interval
+        index = int(now // window)
+        key = f'{key}:{index}'
+        timeout = math.ceil(window) + 1
+        self.cache.add(key, 0, timeout)
+        try:
+            count = self.cache.incr(key)
+        except ValueError:
+            # Expired between add and incr
+            count = 1 if self.cache.add(key, 1, timeout) else self.cache.incr(key)
+        if count > capacity:
+            return (index + 1) * window - now
+        return 0
+
+
+@functools.lru_cache(maxsize=None)
+def _buckets(alias):
+    cache = caches[alias]
+    return _LocalBuckets() if isinstance(cache, LocMemCache) else _CacheBuckets(cache)
+
+
+def client_ip(request):
+    """The client address, skipping RATE_LIMIT_PROXY_COUNT trusted proxies in X-Forwarded-For"""
+    proxies = settings.RATE_LIMIT_PROXY_COUNT
+    if proxies:
+        hops = request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+        if len(hops) >= proxies and hops[-proxies].strip():
+            return hops[-proxies].strip()
+    # No usable header: keep clients apart by the connecting address rather than one '' bucket
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _identity(request):
+    user = getattr(request, 'auth', None)
+    if user is not None and getattr(user, 'pk', None) is not None:
+        return f'u{user.pk}'
+    return f'ip{client_ip(request)}'
+
+
+def rate_limit(policy):
+    """Limit the decorated view with the ``policy`` bucket; unknown policies fail at import"""
+    capacity, interval = _parse(settings.RATE_LIMITS[policy])
+
+    def decorator(view_func):
+        key_prefix = f'ratelimit:{view_func.__module__}.{view_func.__name__}:'
+
+        def check(request):
+            if settings.RATE_LIMIT_ENABLED:
+                buckets = _buckets(settings.RATE_LIMIT_CACHE)
+                wait = buckets.take(key_prefix + _identity(request), capacity, interval, time.time())
+                if wait:
+                    raise RateLimited(math.ceil(wait))
+
+        if inspect.iscoroutinefunction(view_func):
+            @functools.wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                check(request)
+                return await view_func(request, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            check(request)
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,52 @@
+"""
+JSON renderer and parser for the NinjaAPI instance.
+
+Uses orjson when it is installed and falls back to the stdlib ``json`` module
+otherwise. Both paths write datetimes as ``datetime.isoformat()`` would, so
+endpoints can hand datetime objects to the renderer instead of formatting each
+field themselves.
+"""
+import datetime
+import json
+
+from ninja.parser import Parser
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the deployment
+    orjson = None
+
+
+class IsoformatJSONEncoder(NinjaJSONEncoder):
+    """NinjaJSONEncoder that keeps full isoformat() datetimes, like orjson"""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.date, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+_fallback_encoder = IsoformatJSONEncoder()
+
+
+def dumps(data):
+    """Serialize ``data`` to JSON bytes the same way API responses are rendered"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_fallback_encoder.default)
+    return json.dumps(data, cls=IsoformatJSONEncoder).encode()
+
+
+class FastJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+
+    def render(self, request, data, *, response_status):
+        return dumps(data)
+
+
+class FastJSONParser(Parser):
+    def parse_body(self, request):
+        if orjson is not None:
+            return orjson.loads(request.body)
+        return json.loads(request.body)
@@ -0,0 +1,24 @@
+"""
+Settings for the replica routing tests (config/tests.py).
+
+    python manage.py test config --settings=config.replica_test_settings
+
+Gives the SQLite stand-in replica a test database of its own, which the tests
+fill from default with sync_sqlite_replica, so they can check which database
+served a read and simulate replication lag. Under the regular settings a
+replica mirrors default in tests, so every other test reads what it wrote.
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, DATABASES, REPLICA_DATABASE_ALIAS, SQLITE_DATABASE
+
+if DATABASES['default']['ENGINE'] != 'config.db_backends.sqlite3':
+    raise ImproperlyConfigured('The replica routing tests need the SQLite default database')
+
+DATABASES[REPLICA_DATABASE_ALIAS] = {
+    **SQLITE_DATABASE,
+    'NAME': BASE_DIR / 'replica.sqlite3',
+    'TEST': {'NAME': BASE_DIR / 'test_replica.sqlite3'},
+}
+DATABASE_ROUTERS = ['config.db_routers.ReplicaRouter']
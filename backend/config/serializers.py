@@ -0,0 +1,14 @@
+"""
+Helpers shared by the per-app serializers.
+
+Endpoints build their payloads from ``.values()`` rows that already match the
+response schema, so re-validating them with pydantic on the way out only costs
+time. ``trusted_response`` renders such a payload directly while the route
+keeps its ``response=`` schema for the OpenAPI docs. Datetime values are left
+as-is; the API's renderer (config/renderers.py) writes them in ISO 8601.
+"""
+
+
+def trusted_response(router, request, data, status=200):
+    """Render a server-built payload without validating it against the route's schema."""
+    return router.api.create_response(request, data, status=status)
@@ -4,6 +4,7 @@ Django settings for BuildBuddy project.
 
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -39,11 +40,14 @@ INSTALLED_APPS = [
     'teams',
     'hackathons',
     'messages_app',
+    'jobs',
 ]
 
 MIDDLEWARE = [
+    'config.profiling.ProfilingMiddleware',  # opt-in, see PROFILING_ENABLED
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # For static files in production
+    'config.middleware.CompressionMiddleware',  # gzip/brotli for large API responses
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -51,6 +55,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'config.middleware.ReadYourWritesMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -78,6 +83,38 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Use DATABASE_URL for production (PostgreSQL), fallback to SQLite for development
 DATABASE_URL = config('DATABASE_URL', default=None)
 
+# Persistent connections: seconds a worker keeps its connection open (0 = close per request)
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=600, cast=int)
+
+# Optional in-process connection pool for PostgreSQL (see config/db_backends/pool.py)
+DB_POOL_ENABLED = config('DB_POOL_ENABLED', default=False, cast=bool)
+DB_POOL_OPTIONS = {
+    'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+    'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+    'timeout': config('DB_POOL_TIMEOUT', default=30.0, cast=float),
+    'check': config('DB_POOL_HEALTH_CHECKS', default=True, cast=bool),
+    'max_idle': config('DB_POOL_MAX_IDLE', default=600.0, cast=float),
+}
+
+# Single-node SQLite tuning, applied by config.db_backends.sqlite3 on connect
+SQLITE_OPTIONS = {
+    'journal_mode': config('SQLITE_JOURNAL_MODE', default='WAL'),
+    'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int),
+    'synchronous': config('SQLITE_SYNCHRONOUS', default='NORMAL'),
+    'transaction_mode': config('SQLITE_TRANSACTION_MODE', default='IMMEDIATE'),  # BEGIN mode for atomic blocks
+}
+
+SQLITE_DATABASE = {
+    'ENGINE': 'config.db_backends.sqlite3',
+    'NAME': BASE_DIR / 'db.sqlite3',
+    'OPTIONS': SQLITE_OPTIONS,
+    'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+    'CONN_HEALTH_CHECKS': True,
+    # A file rather than shared-cache memory, so tests that write from several
+    # threads get WAL and busy_timeout instead of "database table is locked"
+    'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+}
+
 if DATABASE_URL:
     # Production: Use PostgreSQL via DATABASE_URL
     try:
@@ -85,26 +122,158 @@ if DATABASE_URL:
         DATABASES = {
             'default': dj_database_url.config(
                 default=DATABASE_URL,
-                conn_max_age=600,
-                conn_health_checks=True,
+                # Pooled connections are returned to the pool after every request
+                conn_max_age=0 if DB_POOL_ENABLED else DB_CONN_MAX_AGE,
+                conn_health_checks=not DB_POOL_ENABLED,
             )
         }
+        if DB_POOL_ENABLED and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+            DATABASES['default']['ENGINE'] = 'config.db_backends.postgresql'
+            DATABASES['default'].setdefault('OPTIONS', {})['pool'] = DB_POOL_OPTIONS
     except ImportError:
         # Fallback if dj_database_url not installed
         DATABASES = {
-            'default': {
-                'ENGINE': 'django.db.backends.sqlite3',
-                'NAME': BASE_DIR / 'db.sqlite3',
-            }
+            'default': SQLITE_DATABASE,
         }
 else:
     # Development: Use SQLite
     DATABASES = {
+        'default': SQLITE_DATABASE,
+    }
+
+# Read replica for browse endpoints (see config/db_routers.py)
+REPLICA_DATABASE_ALIAS = 'replica'
+DATABASE_REPLICA_URL = config('DATABASE_REPLICA_URL', default=None)
+# Local stand-in replica: a second SQLite file kept in sync with `manage.py sync_sqlite_replica`
+SQLITE_REPLICA_NAME = config('SQLITE_REPLICA_NAME', default=None)
+# Seconds a client that just wrote keeps reading from the primary
+READ_YOUR_WRITES_SECONDS = config('READ_YOUR_WRITES_SECONDS', default=5, cast=int)
+
+if DATABASE_REPLICA_URL:
+    import dj_database_url
+    DATABASES[REPLICA_DATABASE_ALIAS] = dj_database_url.config(
+        default=DATABASE_REPLICA_URL,
+        conn_max_age=0 if DB_POOL_ENABLED else DB_CONN_MAX_AGE,
+        conn_health_checks=not DB_POOL_ENABLED,
+    )
+    if DB_POOL_ENABLED and DATABASES[REPLICA_DATABASE_ALIAS]['ENGINE'] == 'django.db.backends.postgresql':
+        DATABASES[REPLICA_DATABASE_ALIAS]['ENGINE'] = 'config.db_backends.postgresql'
+        DATABASES[REPLICA_DATABASE_ALIAS].setdefault('OPTIONS', {})['pool'] = DB_POOL_OPTIONS
+elif SQLITE_REPLICA_NAME and DATABASES['default']['ENGINE'] == 'config.db_backends.sqlite3':
+    DATABASES[REPLICA_DATABASE_ALIAS] = {**SQLITE_DATABASE, 'NAME': BASE_DIR / SQLITE_REPLICA_NAME}
+
+if REPLICA_DATABASE_ALIAS in DATABASES:
+    # Tests read the replica's queries through the default connection
+    # (config/replica_test_settings.py gives the routing tests a separate one)
+    DATABASES[REPLICA_DATABASE_ALIAS]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['config.db_routers.ReplicaRouter']
+
+
+# Cache (local memory per process by default; set REDIS_URL to share it between workers)
+REDIS_URL = config('REDIS_URL', default=None)
+
+if DATABASE_REPLICA_URL and not REDIS_URL:
+    # The read-your-writes window lives in the cache; with a per-process cache a writer's
+    # next request can land on another worker and read the lagging replica. The SQLite
+    # stand-in is for single-process local runs (runserver), where local memory is enough
+    raise ImproperlyConfigured('DATABASE_REPLICA_URL needs REDIS_URL for the read-your-writes window')
+
+if REDIS_URL:
+    CACHES = {
         'default': {
-            'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3',
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
         }
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'buildbuddy',
+        }
+    }
+
+
+# Response compression (config/middleware.py)
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)  # bytes
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)
+# How long compressed copies of public responses stay cached when they carry no max-age
+COMPRESSION_CACHE_SECONDS = config('COMPRESSION_CACHE_SECONDS', default=60, cast=int)
+# max-age of the public hackathon browse endpoints (list, search), which only staff and imports change
+PUBLIC_CACHE_MAX_AGE = config('PUBLIC_CACHE_MAX_AGE', default=60, cast=int)
+
+
+# Background jobs (jobs/queue.py, run with `manage.py run_workers`)
+JOB_QUEUES = config('JOB_QUEUES', default='default:4,purge:1')  # queue:concurrency pairs per worker process
+JOB_POLL_INTERVAL = config('JOB_POLL_INTERVAL', default=1.0, cast=float)  # seconds
+JOB_MAX_ATTEMPTS = config('JOB_MAX_ATTEMPTS', default=5, cast=int)
+JOB_RETRY_BACKOFF = config('JOB_RETRY_BACKOFF', default=5, cast=int)  # seconds, doubled per attempt
+JOB_RETRY_BACKOFF_MAX = config('JOB_RETRY_BACKOFF_MAX', default=600, cast=int)
+JOB_STALE_AFTER = config('JOB_STALE_AFTER', default=900, cast=int)  # seconds without a heartbeat before a job is requeued
+JOB_HEARTBEAT_INTERVAL = config('JOB_HEARTBEAT_INTERVAL', default=60, cast=int)  # seconds; keep well under JOB_STALE_AFTER
+JOB_RETENTION_SECONDS = config('JOB_RETENTION_SECONDS', default=7 * 24 * 3600, cast=int)  # done jobs older than this are deleted
+JOB_CLEANUP_BATCH_SIZE = config('JOB_CLEANUP_BATCH_SIZE', default=1000, cast=int)  # rows per DELETE
+
+# Background purge of soft-deleted teams, hackathons and users (config/soft_delete.py)
+PURGE_BATCH_SIZE = config('PURGE_BATCH_SIZE', default=1000, cast=int)  # rows per DELETE
+PURGE_BATCHES_PER_JOB = config('PURGE_BATCHES_PER_JOB', default=20, cast=int)  # then continue in a new job
+
+
+# Organizer exports (hackathons/exports.py): rows fetched and written per chunk
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+
+# Hackathon catalog imports (hackathons/importer.py): rows validated and upserted per batch
+IMPORT_BATCH_SIZE = config('IMPORT_BATCH_SIZE', default=500, cast=int)
+
+
+# Team formation (teams/formation.py): time spent improving the greedy match with member swaps
+TEAM_FORMATION_SEARCH_SECONDS = config('TEAM_FORMATION_SEARCH_SECONDS', default=1.0, cast=float)
+
+
+# Hackathon analytics rollups (hackathons/stats.py): seconds a refresh waits so bursts of changes coalesce
+HACKATHON_STATS_REFRESH_DELAY = config('HACKATHON_STATS_REFRESH_DELAY', default=10, cast=int)
+
+
+# Browse facet counts (config/facets.py)
+# Invalidation bumps a version in the cache, which only reaches every worker when the cache is
+# shared, so facet counts are cached only with REDIS_URL (0 turns caching off)
+FACET_CACHE_SECONDS = config('FACET_CACHE_SECONDS', default=300 if REDIS_URL else 0, cast=int)
+FACET_LIMIT = config('FACET_LIMIT', default=50, cast=int)  # values returned for open-ended facets (skills, hackathons)
+
+
+# Hackathon status lifecycle (hackathons/lifecycle.py)
+HACKATHON_REGISTRATION_WINDOW_DAYS = config('HACKATHON_REGISTRATION_WINDOW_DAYS', default=30, cast=int)  # upcoming -> registration_open
+HACKATHON_STATUS_INTERVAL = config('HACKATHON_STATUS_INTERVAL', default=60, cast=int)  # seconds between scheduler passes
+
+
+# Login (users/passwords.py): threads hashing passwords for async logins, per worker process
+PASSWORD_HASH_WORKERS = config('PASSWORD_HASH_WORKERS', default=4, cast=int)
+
+
+# Rate limiting (config/ratelimit.py): '<requests>/<seconds>' per user, or per IP when anonymous
+RATE_LIMIT_ENABLED = config('RATE_LIMIT_ENABLED', default=True, cast=bool)
+RATE_LIMITS = {
+    'poll': config('RATE_LIMIT_POLL', default='30/60'),  # navbar polls every 30 s and on each navigation
+    'login': config('RATE_LIMIT_LOGIN', default='10/60'),
+}
+RATE_LIMIT_CACHE = config('RATE_LIMIT_CACHE', default='default')
+RATE_LIMIT_PROXY_COUNT = config('RATE_LIMIT_PROXY_COUNT', default=0, cast=int)  # proxies appending to X-Forwarded-For
+
+
+# Admin changelists (config/admin.py): rows counted exactly before falling back to planner estimates
+ADMIN_EXACT_COUNT_LIMIT = config('ADMIN_EXACT_COUNT_LIMIT', default=10000, cast=int)
+
+
+# Request profiling (config/profiling.py): requests with a signed X-Profile header
+# (`python manage.py profiling_token`) or a PROFILING_SAMPLE_RATE share of all requests
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_INTERVAL_MS = config('PROFILING_INTERVAL_MS', default=5.0, cast=float)  # between stack samples
+PROFILING_DIR = config('PROFILING_DIR', default=str(BASE_DIR / 'profiles'))
+PROFILING_MAX_PROFILES = config('PROFILING_MAX_PROFILES', default=200, cast=int)  # oldest are deleted beyond this
+PROFILING_TOKEN_MAX_AGE = config('PROFILING_TOKEN_MAX_AGE', default=3600, cast=int)  # seconds a token stays valid
 
 
 # Password validation
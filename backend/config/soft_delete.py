@@ -0,0 +1,72 @@
+"""
+Soft deletion with a chunked background purge.
+
+Deleting a team, hackathon or user through Django's CASCADE collects every
+dependent row (memberships, tasks, chats and all their messages) in Python
+before issuing the deletes, all inside the request. Instead the row gets a
+``deleted_at`` timestamp, which ``SoftDeleteManager`` (the default manager)
+filters out, and a purge job removes the dependents in bounded batches of raw
+DELETEs. The small remainder goes through a regular ``.delete()`` at the end.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+
+
+class SoftDeleteManager(models.Manager):
+    """Default manager that hides soft-deleted rows; use ``all_objects`` to see them"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+def purge_batches(steps, progress, batch_size=None, max_batches=None):
+    """
+    Delete the rows of each ``(label, queryset)`` step in order, batch by batch.
+
+    Deleted counts are accumulated into ``progress`` by label. Returns True
+    once every step is empty, or False after ``max_batches`` batches so the
+    caller can continue in a fresh job (and transaction).
+    """
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    max_batches = max_batches or settings.PURGE_BATCHES_PER_JOB
+    batches = 0
+    for label, queryset in steps:
+        while True:
+            if batches >= max_batches:
+                return False
+            ids = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            # Raw DELETE: no signal dispatch or cascade collection; every step
+            # runs after the steps for the rows that reference it
+            deleted = queryset.model._base_manager.filter(pk__in=ids)._raw_delete(queryset.db)
+            progress[label] = progress.get(label, 0) + deleted
+            batches += 1
+    return True
+
+
+class SoftDeleteAdminMixin:
+    """
+    ModelAdmin mixin: delete actions soft-delete and leave the cascade to the purge job.
+
+    ``soft_delete_func`` is the model's entry point that hides rows by id and
+    queues their purge, e.g. ``soft_delete_func = staticmethod(soft_delete_teams)``.
+    """
+    soft_delete_func = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.soft_delete_func is None:
+            raise ImproperlyConfigured(f'{type(self).__name__} must set soft_delete_func')
+
+    def delete_model(self, request, obj):
+        self.soft_delete_func([obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        self.soft_delete_func(list(queryset.values_list('pk', flat=True)))
+
+    def get_deleted_objects(self, objs, request):
+        # Skip the cascade walk the confirmation page would otherwise run
+        to_delete = [str(obj) for obj in objs]
+        return to_delete, {self.model._meta.verbose_name_plural: len(to_delete)}, set(), []
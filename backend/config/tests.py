@@ -0,0 +1,104 @@
+import io
+import json
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from hackathons.models import Hackathon
+from teams.models import Team
+
+User = get_user_model()
+
+REPLICA = settings.REPLICA_DATABASE_ALIAS
+# Only config.replica_test_settings gives the replica a test database of its own;
+# otherwise it mirrors default and there is no lag to observe
+SEPARATE_REPLICA = REPLICA in settings.DATABASES and not settings.DATABASES[REPLICA].get('TEST', {}).get('MIRROR')
+
+
+@skipUnless(SEPARATE_REPLICA, 'run with --settings=config.replica_test_settings')
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {'default', REPLICA} if SEPARATE_REPLICA else {'default'}
+
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.user = User.objects.create_user(email='lead@buildbuddy.local', username='lead', password='x')
+        self.hackathon = Hackathon.objects.create(
+            name='General Teams', description='', category='other', mode='remote',
+            start_date=now, end_date=now + timedelta(days=365), location='Online',
+        )
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+        self.sync_replica()
+
+    def tearDown(self):
+        cache.clear()
+
+    def sync_replica(self):
+        call_command('sync_sqlite_replica', stdout=io.StringIO())
+
+    def list_team_names(self, **headers):
+        """GET /api/teams/ and the number of queries each database served"""
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = self.client.get('/api/teams/', **headers)
+        self.assertEqual(response.status_code, 200)
+        return [team['name'] for team in json.loads(response.content)], len(primary), len(replica)
+
+    def create_team(self, name):
+        response = self.client.post(
+            '/api/teams/',
+            data=json.dumps({'name': name, 'description': 'New team', 'hackathon': 'General Teams'}),
+            content_type='application/json',
+            **self.auth,
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_browse_reads_go_to_the_replica(self):
+        Team.objects.create(
+            name='Unreplicated', description='', category='other', hackathon=self.hackathon, lead=self.user,
+        )
+
+        names, primary_queries, replica_queries = self.list_team_names()
+        self.assertEqual(names, [])
+        self.assertGreater(replica_queries, 0)
+        self.assertEqual(primary_queries, 0)
+
+        self.sync_replica()
+        self.assertEqual(self.list_team_names()[0], ['Unreplicated'])
+
+    def test_writer_reads_the_primary_within_the_window(self):
+        self.create_team('Fresh Team')
+
+        names, primary_queries, replica_queries = self.list_team_names(**self.auth)
+        self.assertEqual(names, ['Fresh Team'])
+        self.assertEqual(replica_queries, 0)
+        self.assertGreater(primary_queries, 0)
+
+        # Other clients still read the lagging replica
+        self.assertEqual(self.list_team_names()[0], [])
+
+    def test_writer_reads_the_replica_after_the_window(self):
+        self.create_team('Fresh Team')
+        # The window is a cache entry that expires after READ_YOUR_WRITES_SECONDS
+        cache.clear()
+
+        names, _, replica_queries = self.list_team_names(**self.auth)
+        self.assertEqual(names, [])
+        self.assertGreater(replica_queries, 0)
+
+    def test_writes_and_unrouted_reads_use_the_primary(self):
+        with CaptureQueriesContext(connections[REPLICA]) as replica:
+            self.create_team('Fresh Team')
+            response = self.client.get('/api/teams/myteams', **self.auth)
+        self.assertEqual([team['name'] for team in json.loads(response.content)], ['Fresh Team'])
+        self.assertEqual(len(replica), 0)
+        self.assertTrue(Team.objects.using('default').filter(name='Fresh Team').exists())
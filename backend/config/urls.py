@@ -2,6 +2,7 @@
 URL configuration for BuildBuddy project.
 """
 from django.contrib import admin
+from django.http import HttpResponse
 from django.urls import path
 from django.conf import settings
 from django.conf.urls.static import static
@@ -10,12 +11,19 @@ from users.api import router as users_router
 from teams.api import router as teams_router
 from hackathons.api import router as hackathons_router
 from messages_app.api import router as messages_router
+from users.api import AuthBearer
+from config import profiling
+from config.db_backends.pool import pool_stats
+from config.ratelimit import RateLimited
+from config.renderers import FastJSONParser, FastJSONRenderer
 
 # Create the main API instance
 api = NinjaAPI(
     title="BuildBuddy API",
     version="1.0.0",
-    description="API for BuildBuddy - Hackathon Team Building Platform"
+    description="API for BuildBuddy - Hackathon Team Building Platform",
+    renderer=FastJSONRenderer(),
+    parser=FastJSONParser(),
 )
 
 # Add routers
@@ -24,6 +32,49 @@ api.add_router("/teams/", teams_router)
 api.add_router("/hackathons/", hackathons_router)
 api.add_router("/messages/", messages_router)
 
+
+@api.exception_handler(RateLimited)
+def rate_limited(request, exc):
+    response = api.create_response(request, {"detail": "Too many requests"}, status=429)
+    response['Retry-After'] = str(exc.retry_after)
+    return response
+
+
+@api.get("/health/db", auth=AuthBearer())
+def database_health(request):
+    """Connection pool metrics for this worker process (staff only)"""
+    if not request.auth.is_staff:
+        return api.create_response(request, {"detail": "Staff only"}, status=403)
+    from django.db import connections
+    return {
+        "databases": {
+            alias: connections.settings[alias]['ENGINE'] for alias in connections
+        },
+        "pools": pool_stats(),
+    }
+
+
+@api.get("/profiles", auth=AuthBearer())
+def list_profiles(request):
+    """Stored request profiles, newest first (staff only)"""
+    if not request.auth.is_staff:
+        return api.create_response(request, {"detail": "Staff only"}, status=403)
+    return {"profiles": profiling.list_profiles()}
+
+
+@api.get("/profiles/{profile_id}", auth=AuthBearer())
+def download_profile(request, profile_id: str):
+    """A request profile as collapsed stacks for flame graph tools (staff only)"""
+    if not request.auth.is_staff:
+        return api.create_response(request, {"detail": "Staff only"}, status=403)
+    profile = profiling.load(profile_id)
+    if profile is None:
+        return api.create_response(request, {"detail": "Not found"}, status=404)
+    response = HttpResponse(profiling.collapsed(profile), content_type='text/plain; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{profile_id}.folded"'
+    return response
+
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', api.urls),
@@ -0,0 +1,23 @@
+"""
+Gunicorn configuration for BuildBuddy.
+
+SERVER_INTERFACE selects how the app is served:
+    wsgi (default) - sync workers running config.wsgi
+    asgi           - uvicorn workers running config.asgi, so the async
+                     endpoints (unread counts, browse lists) don't tie up a
+                     worker while they wait on the database
+"""
+import os
+
+SERVER_INTERFACE = os.environ.get('SERVER_INTERFACE', 'wsgi').lower()
+
+if SERVER_INTERFACE == 'asgi':
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'config.wsgi:application'
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+accesslog = '-'
+errorlog = '-'
@@ -1,18 +1,38 @@
 from django.contrib import admin
+from config import facets
+from config.admin import LargeTableAdminMixin
+from config.soft_delete import SoftDeleteAdminMixin
 from .models import Hackathon, HackathonRegistration
+from .serializers import participant_count
+from .tasks import soft_delete_hackathons
 
 
 @admin.register(Hackathon)
-class HackathonAdmin(admin.ModelAdmin):
-    list_display = ('name', 'category', 'mode', 'status', 'start_date', 'location', 'participant_count')
+class HackathonAdmin(LargeTableAdminMixin, SoftDeleteAdminMixin, admin.ModelAdmin):
+    list_display = ('name', 'category', 'mode', 'status', 'start_date', 'location', 'get_participant_count')
     list_filter = ('category', 'mode', 'status')
     search_fields = ('name', 'description', 'location')
     ordering = ('start_date',)
+    soft_delete_func = staticmethod(soft_delete_hackathons)
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(registered=participant_count())
+    
+    def get_participant_count(self, obj):
+        return obj.registered
+    get_participant_count.short_description = 'Participants'
+    get_participant_count.admin_order_field = 'registered'
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        facets.invalidate('hackathons', 'teams')
 
 
 @admin.register(HackathonRegistration)
-class HackathonRegistrationAdmin(admin.ModelAdmin):
+class HackathonRegistrationAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('user', 'hackathon', 'registered_at')
     list_filter = ('hackathon',)
+    list_select_related = ('user', 'hackathon')
+    autocomplete_fields = ('user', 'hackathon')
     search_fields = ('user__username', 'hackathon__name')
     ordering = ('-registered_at',)
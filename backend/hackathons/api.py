@@ -1,9 +1,18 @@
-from ninja import Router, Schema
+from ninja import File, Router, Schema
+from ninja.files import UploadedFile
 from typing import List, Optional
+from django.conf import settings
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.db import models as django_models
-from users.api import AuthBearer
-from .models import Hackathon, HackathonRegistration
+from django.views.decorators.cache import cache_control
+from users.api import AuthBearer, AsyncAuthBearer
+from config import facets
+from config.db_routers import use_replica
+from config.serializers import trusted_response
+from .models import Hackathon, HackathonRegistration, HackathonStats
+from .serializers import aserialize_hackathons
+from . import exports, importer, lifecycle, stats
 
 router = Router()
 
@@ -40,7 +49,9 @@ class HackathonCreateSchema(Schema):
 
 # Hackathon endpoints
 @router.get("/", response=List[HackathonSchema], auth=None)
-def list_hackathons(request, category: str = "", mode: str = "", status: str = "", limit: int = 20, offset: int = 0):
+@cache_control(public=True, max_age=settings.PUBLIC_CACHE_MAX_AGE)
+@use_replica
+async def list_hackathons(request, category: str = "", mode: str = "", status: str = "", limit: int = 20, offset: int = 0):
     """List all hackathons with filters"""
     hackathons = Hackathon.objects.all()
     
@@ -51,33 +62,17 @@ def list_hackathons(request, category: str = "", mode: str = "", status: str = "
         hackathons = hackathons.filter(mode=mode)
     
     if status:
-        hackathons = hackathons.filter(status=status)
+        # Matches on the date-derived status, so results don't wait for the scheduler
+        hackathons = hackathons.filter(lifecycle.status_q(status))
     
-    hackathons_list = hackathons[offset:offset + limit]
-    
-    return [
-        {
-            'id': h.id,
-            'name': h.name,
-            'description': h.description,
-            'category': h.category,
-            'mode': h.mode,
-            'status': h.status,
-            'start_date': h.start_date.isoformat() if hasattr(h.start_date, 'isoformat') else str(h.start_date),
-            'end_date': h.end_date.isoformat() if hasattr(h.end_date, 'isoformat') else str(h.end_date),
-            'location': h.location,
-            'prize': h.prize,
-            'max_participants': h.max_participants,
-            'participant_count': h.participant_count,
-            'website_url': h.website_url or '',
-            'registration_url': h.registration_url or '',
-        }
-        for h in hackathons_list
-    ]
+    rows = await aserialize_hackathons(hackathons[offset:offset + limit])
+    return trusted_response(router, request, rows)
 
 
 @router.get("/search", response=List[HackathonSchema], auth=None)
-def search_hackathons(request, q: str = ""):
+@cache_control(public=True, max_age=settings.PUBLIC_CACHE_MAX_AGE)
+@use_replica
+async def search_hackathons(request, q: str = ""):
     """Search hackathons by name or description"""
     hackathons = Hackathon.objects.all()
     
@@ -88,49 +83,117 @@ def search_hackathons(request, q: str = ""):
             django_models.Q(location__icontains=q)
         )
     
-    hackathons_list = hackathons[:50]
-    
-    return [
-        {
-            'id': h.id,
-            'name': h.name,
-            'description': h.description,
-            'category': h.category,
-            'mode': h.mode,
-            'status': h.status,
-            'start_date': h.start_date.isoformat() if hasattr(h.start_date, 'isoformat') else str(h.start_date),
-            'end_date': h.end_date.isoformat() if hasattr(h.end_date, 'isoformat') else str(h.end_date),
-            'location': h.location,
-            'prize': h.prize,
-            'max_participants': h.max_participants,
-            'participant_count': h.participant_count,
-            'website_url': h.website_url or '',
-            'registration_url': h.registration_url or '',
+    rows = await aserialize_hackathons(hackathons[:50])
+    return trusted_response(router, request, rows)
+
+
+@router.get("/facets", auth=None)
+async def hackathon_facets(request, category: str = "", mode: str = "", status: str = ""):
+    """Result counts per category, mode and status for the current browse filters"""
+    filters = {
+        'category': django_models.Q(category=category) if category else django_models.Q(),
+        'mode': django_models.Q(mode=mode) if mode else django_models.Q(),
+        'current_status': lifecycle.status_q(status) if status else django_models.Q(),
+    }
+
+    async def build():
+        # Read from the primary: the counts outlive a replica's lag once cached
+        hackathons = Hackathon.objects.annotate(current_status=lifecycle.effective_status())
+        categories = await facets.acount_by(facets.excluding(hackathons, filters, 'category'), 'category')
+        modes = await facets.acount_by(facets.excluding(hackathons, filters, 'mode'), 'mode')
+        statuses = await facets.acount_by(facets.excluding(hackathons, filters, 'current_status'), 'current_status')
+        return {
+            "total": facets.selected_count(categories, category),
+            "facets": {
+                "category": facets.choice_facet(categories, Hackathon.CATEGORY_CHOICES),
+                "mode": facets.choice_facet(modes, Hackathon.MODE_CHOICES),
+                "status": facets.choice_facet(statuses, Hackathon.STATUS_CHOICES),
+            },
         }
-        for h in hackathons_list
-    ]
+
+    result = await facets.aget('hackathons', {'category': category, 'mode': mode, 'status': status}, build)
+    return trusted_response(router, request, result)
+
+
+@router.get("/my-registrations", response=List[HackathonSchema], auth=AsyncAuthBearer())
+async def get_my_registrations(request):
+    """Get all hackathons the current user is registered for"""
+    hackathons = Hackathon.objects.filter(
+        registrations__user=request.auth
+    ).order_by('-registrations__registered_at')
+    
+    rows = await aserialize_hackathons(hackathons)
+    return trusted_response(router, request, rows)
+
+
+@router.post("/import", auth=AuthBearer())
+def import_hackathons(request, file: UploadedFile = File(...), format: str = "", dry_run: bool = False):
+    """Upsert a CSV/JSON hackathon catalog keyed on external_id (staff only)"""
+    if not request.auth.is_staff:
+        return router.api.create_response(request, {"detail": "Staff only"}, status=403)
+    fmt = format or importer.detect_format(file.name)
+    if fmt not in ('csv', 'json'):
+        return router.api.create_response(request, {"detail": "format must be csv or json"}, status=400)
+    try:
+        return importer.import_catalog(importer.read_rows(file, fmt), dry_run=dry_run)
+    except (ValueError, UnicodeDecodeError) as e:
+        return router.api.create_response(request, {"detail": f"Could not read catalog: {e}"}, status=400)
 
 
 @router.get("/{hackathon_id}", response=HackathonSchema, auth=None)
-def get_hackathon(request, hackathon_id: int):
+async def get_hackathon(request, hackathon_id: int):
     """Get hackathon details"""
+    rows = await aserialize_hackathons(Hackathon.objects.filter(id=hackathon_id))
+    if not rows:
+        raise Http404("No Hackathon matches the given query.")
+    return trusted_response(router, request, rows[0])
+
+
+@router.get("/{hackathon_id}/export/{kind}", auth=AuthBearer())
+def export_hackathon(request, hackathon_id: int, kind: str, format: str = "ndjson"):
+    """Stream a hackathon's registrations, teams or memberships as NDJSON or CSV (staff only)"""
+    if not request.auth.is_staff:
+        return router.api.create_response(request, {"detail": "Staff only"}, status=403)
+    if kind not in exports.EXPORTS or format not in exports.FORMATS:
+        return router.api.create_response(
+            request,
+            {"detail": f"Export kind must be one of {', '.join(exports.EXPORTS)} "
+                       f"and format one of {', '.join(exports.FORMATS)}"},
+            status=400
+        )
     hackathon = get_object_or_404(Hackathon, id=hackathon_id)
-    return {
-        'id': hackathon.id,
-        'name': hackathon.name,
-        'description': hackathon.description,
-        'category': hackathon.category,
-        'mode': hackathon.mode,
-        'status': hackathon.status,
-        'start_date': hackathon.start_date.isoformat() if hasattr(hackathon.start_date, 'isoformat') else str(hackathon.start_date),
-        'end_date': hackathon.end_date.isoformat() if hasattr(hackathon.end_date, 'isoformat') else str(hackathon.end_date),
-        'location': hackathon.location,
-        'prize': hackathon.prize,
-        'max_participants': hackathon.max_participants,
-        'participant_count': hackathon.participant_count,
-        'website_url': hackathon.website_url or '',
-        'registration_url': hackathon.registration_url or '',
-    }
+    return exports.export_response(request, hackathon, kind, format)
+
+
+@router.get("/{hackathon_id}/stats", auth=AuthBearer())
+def get_hackathon_stats(request, hackathon_id: int):
+    """Registration, skill and team fill analytics, served from the precomputed rollup (staff only)"""
+    if not request.auth.is_staff:
+        return router.api.create_response(request, {"detail": "Staff only"}, status=403)
+    hackathon = get_object_or_404(Hackathon, id=hackathon_id)
+    rollup = HackathonStats.objects.filter(hackathon=hackathon).first()
+    if rollup is None:
+        # The first request queues the build; later changes refresh it in the background
+        stats.queue_refresh([hackathon.id])
+        return router.api.create_response(
+            request,
+            {"detail": "Stats are being computed, retry shortly", "hackathon_id": hackathon.id},
+            status=202
+        )
+    return stats.serialize(rollup)
+
+
+@router.post("/{hackathon_id}/form-teams", auth=AuthBearer())
+def form_teams(request, hackathon_id: int, team_size: int = 4, dry_run: bool = False):
+    """Match solo registrants to open teams and group the rest into new teams (staff only)"""
+    from teams.formation import form_teams as run_formation
+
+    if not request.auth.is_staff:
+        return router.api.create_response(request, {"detail": "Staff only"}, status=403)
+    if team_size < 2:
+        return router.api.create_response(request, {"detail": "team_size must be at least 2"}, status=400)
+    hackathon = get_object_or_404(Hackathon, id=hackathon_id)
+    return run_formation(hackathon, team_size=team_size, dry_run=dry_run)
 
 
 @router.post("/{hackathon_id}/register", auth=AuthBearer())
@@ -163,6 +226,7 @@ def register_for_hackathon(request, hackathon_id: int):
         hackathon=hackathon,
         user=request.auth
     )
+    stats.mark_stale([hackathon.id])
     
     return {"success": True}
 
@@ -179,32 +243,5 @@ def unregister_from_hackathon(request, hackathon_id: int):
     )
     
     registration.delete()
+    stats.mark_stale([hackathon.id])
     return {"success": True}
-
-
-@router.get("/my-registrations", response=List[HackathonSchema], auth=AuthBearer())
-def get_my_registrations(request):
-    """Get all hackathons the current user is registered for"""
-    registrations = HackathonRegistration.objects.filter(
-        user=request.auth
-    ).select_related('hackathon')
-    
-    return [
-        {
-            'id': r.hackathon.id,
-            'name': r.hackathon.name,
-            'description': r.hackathon.description,
-            'category': r.hackathon.category,
-            'mode': r.hackathon.mode,
-            'status': r.hackathon.status,
-            'start_date': r.hackathon.start_date.isoformat() if hasattr(r.hackathon.start_date, 'isoformat') else str(r.hackathon.start_date),
-            'end_date': r.hackathon.end_date.isoformat() if hasattr(r.hackathon.end_date, 'isoformat') else str(r.hackathon.end_date),
-            'location': r.hackathon.location,
-            'prize': r.hackathon.prize,
-            'max_participants': r.hackathon.max_participants,
-            'participant_count': r.hackathon.participant_count,
-            'website_url': r.hackathon.website_url or '',
-            'registration_url': r.hackathon.registration_url or '',
-        }
-        for r in registrations
-    ]
@@ -0,0 +1,179 @@
+"""
+Streaming exports of a hackathon's registrations, teams and memberships.
+
+Rows come from ``.values()`` querysets read with ``.iterator(chunk_size=...)``
+(``.aiterator()`` under ASGI), which uses a server-side cursor on PostgreSQL.
+They are encoded as NDJSON or CSV a chunk at a time, so memory stays flat no
+matter how many rows an export has.
+"""
+import csv
+import io
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import F
+from django.http import StreamingHttpResponse
+
+from config.renderers import dumps
+from teams.models import Team, TeamMembership
+from teams.serializers import accepted_member_count
+from .models import HackathonRegistration
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def registrations(hackathon_id):
+    return HackathonRegistration.objects.filter(
+        hackathon_id=hackathon_id,
+        user__deleted_at__isnull=True
+    ).order_by('id').values(
+        'id',
+        'user_id',
+        'registered_at',
+        username=F('user__username'),
+        email=F('user__email'),
+        full_name=F('user__full_name'),
+    )
+
+
+def teams(hackathon_id):
+    return Team.objects.filter(hackathon_id=hackathon_id).order_by('id').values(
+        'id',
+        'name',
+        'category',
+        'lead_id',
+        'open_positions',
+        'required_skills',
+        'created_at',
+        lead_username=F('lead__username'),
+        member_count=accepted_member_count(),
+    )
+
+
+def memberships(hackathon_id):
+    return TeamMembership.objects.filter(
+        team__hackathon_id=hackathon_id,
+        team__deleted_at__isnull=True
+    ).order_by('id').values(
+        'id',
+        'team_id',
+        'user_id',
+        'role',
+        'status',
+        'joined_at',
+        team_name=F('team__name'),
+        username=F('user__username'),
+        email=F('user__email'),
+    )
+
+
+EXPORTS = {
+    'registrations': registrations,
+    'teams': teams,
+    'memberships': memberships,
+}
+
+
+class _LineBuffer:
+    """File-like sink that hands back whatever csv.writer wrote"""
+
+    def __init__(self):
+        self.buffer = io.StringIO()
+
+    def write(self, value):
+        self.buffer.write(value)
+
+    def take(self):
+        value = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return value.encode()
+
+
+class Encoder:
+    """Turns rows into byte chunks of ``settings.EXPORT_CHUNK_SIZE`` rows each"""
+
+    def __init__(self, queryset, fmt):
+        self.fields = list(queryset.query.values_select) + list(queryset.query.annotation_select)
+        self.fmt = fmt
+        self.lines = []
+        self.count = 0
+        if fmt == 'csv':
+            self.sink = _LineBuffer()
+            self.writer = csv.writer(self.sink)
+
+    def header(self):
+        if self.fmt != 'csv':
+            return b''
+        self.writer.writerow(self.fields)
+        return self.sink.take()
+
+    def add(self, row):
+        """Buffer one row; returns a chunk once enough rows have accumulated"""
+        if self.fmt == 'csv':
+            self.writer.writerow(self._csv_value(row[field]) for field in self.fields)
+        else:
+            self.lines.append(dumps(row))
+        self.count += 1
+        if self.count % settings.EXPORT_CHUNK_SIZE == 0:
+            return self.flush()
+        return None
+
+    def flush(self):
+        if self.fmt == 'csv':
+            return self.sink.take()
+        chunk = b''.join(line + b'\n' for line in self.lines)
+        self.lines = []
+        return chunk
+
+    def _csv_value(self, value):
+        if isinstance(value, list):
+            return ', '.join(str(item) for item in value)
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return value
+
+
+def iter_export(queryset, fmt):
+    encoder = Encoder(queryset, fmt)
+    header = encoder.header()
+    if header:
+        yield header
+    for row in queryset.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        chunk = encoder.add(row)
+        if chunk:
+            yield chunk
+    tail = encoder.flush()
+    if tail:
+        yield tail
+
+
+async def aiter_export(queryset, fmt):
+    encoder = Encoder(queryset, fmt)
+    header = encoder.header()
+    if header:
+        yield header
+    async for row in queryset.aiterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        chunk = encoder.add(row)
+        if chunk:
+            yield chunk
+    tail = encoder.flush()
+    if tail:
+        yield tail
+
+
+def export_response(request, hackathon, kind, fmt):
+    """StreamingHttpResponse with the export, using an async iterator under ASGI"""
+    queryset = EXPORTS[kind](hackathon.id)
+    # Django buffers a sync iterator in full under ASGI (and an async one under
+    # WSGI), so hand each server the kind it can stream
+    if isinstance(request, ASGIRequest):
+        content = aiter_export(queryset, fmt)
+    else:
+        content = iter_export(queryset, fmt)
+    response = StreamingHttpResponse(content, content_type=FORMATS[fmt])
+    response['Content-Disposition'] = f'attachment; filename="hackathon-{hackathon.id}-{kind}.{fmt}"'
+    return response
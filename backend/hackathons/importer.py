@@ -0,0 +1,194 @@
+"""
+Bulk import of hackathon catalogs (CSV, NDJSON or a JSON array).
+
+Rows are read lazily from the file, validated in batches against
+``HackathonImportRow`` and upserted with ``bulk_create(update_conflicts=True)``
+keyed on ``Hackathon.external_id``. Rows without an ``external_id`` are keyed
+on their name and start date, the same key the 0005 migration gave existing
+hackathons and ``Hackathon.save()`` gives new ones created without a key.
+Rows whose key belongs to a soft-deleted hackathon are rejected rather than
+written to a row that stays hidden until its purge removes it.
+"""
+import csv
+import io
+import json
+import time
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.utils import timezone
+from ninja import Schema
+from pydantic import ValidationError, field_validator, model_validator
+
+from config import facets
+from .models import Hackathon
+
+UPDATE_FIELDS = [
+    'name',
+    'description',
+    'category',
+    'mode',
+    'status',
+    'start_date',
+    'end_date',
+    'location',
+    'prize',
+    'max_participants',
+    'website_url',
+    'registration_url',
+    'updated_at',
+]
+
+
+def _choices(choices):
+    return {value for value, _ in choices}
+
+
+class HackathonImportRow(Schema):
+    external_id: Optional[str] = None
+    name: str
+    description: str = ""
+    category: str = "other"
+    mode: str
+    status: str = "upcoming"
+    start_date: datetime
+    end_date: datetime
+    location: str
+    prize: str = ""
+    max_participants: int = 500
+    website_url: str = ""
+    registration_url: str = ""
+
+    @field_validator('category')
+    @classmethod
+    def check_category(cls, value):
+        if value not in _choices(Hackathon.CATEGORY_CHOICES):
+            raise ValueError(f'unknown category {value!r}')
+        return value
+
+    @field_validator('mode')
+    @classmethod
+    def check_mode(cls, value):
+        if value not in _choices(Hackathon.MODE_CHOICES):
+            raise ValueError(f'unknown mode {value!r}')
+        return value
+
+    @field_validator('status')
+    @classmethod
+    def check_status(cls, value):
+        if value not in _choices(Hackathon.STATUS_CHOICES):
+            raise ValueError(f'unknown status {value!r}')
+        return value
+
+    @field_validator('start_date', 'end_date')
+    @classmethod
+    def make_aware(cls, value):
+        return timezone.make_aware(value) if timezone.is_naive(value) else value
+
+    @model_validator(mode='after')
+    def check_dates_and_key(self):
+        if self.end_date < self.start_date:
+            raise ValueError('end_date is before start_date')
+        if not self.external_id:
+            self.external_id = Hackathon.derive_external_id(self.name, self.start_date)
+        return self
+
+
+def read_rows(stream, fmt):
+    """Yield dict rows from a binary file object in 'csv' or 'json' (NDJSON or array) format"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        yield from csv.DictReader(text)
+        return
+
+    first = text.read(1)
+    while first and first.isspace():
+        first = text.read(1)
+    if first == '[':
+        # A JSON array has to be parsed whole; NDJSON is read line by line
+        yield from json.loads(first + text.read())
+        return
+    pending = first
+    for line in text:
+        line = pending + line
+        pending = ''
+        if line.strip():
+            yield json.loads(line)
+
+
+def detect_format(filename):
+    return 'csv' if filename.lower().endswith('.csv') else 'json'
+
+
+def import_catalog(rows, batch_size=None, dry_run=False, max_errors=100):
+    """
+    Validate and upsert catalog rows in batches.
+
+    Returns a report with inserted/updated/rejected counts, the first
+    ``max_errors`` rejections (1-based row number and message) and throughput.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    report = {'inserted': 0, 'updated': 0, 'rejected': 0, 'errors': []}
+    started = time.perf_counter()
+
+    def reject(number, message):
+        report['rejected'] += 1
+        if len(report['errors']) < max_errors:
+            report['errors'].append({'row': number, 'error': message})
+
+    batch = {}
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            reject(number, 'row: expected an object')
+            continue
+        try:
+            # CSV cells arrive as '' rather than missing; let the defaults apply
+            row = {key: value for key, value in row.items() if value not in ('', None)}
+            parsed = HackathonImportRow.model_validate(row)
+        except ValidationError as e:
+            reject(number, '; '.join(
+                f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()
+            ))
+            continue
+        if parsed.external_id in batch:
+            # A key can only be upserted once per statement; the later row wins
+            reject(batch[parsed.external_id][0], f'superseded by row {number}')
+        batch[parsed.external_id] = (number, parsed)
+        if len(batch) >= batch_size:
+            _upsert(batch, report, dry_run, reject)
+            batch = {}
+    if batch:
+        _upsert(batch, report, dry_run, reject)
+
+    elapsed = time.perf_counter() - started
+    processed = report['inserted'] + report['updated'] + report['rejected']
+    report['seconds'] = round(elapsed, 3)
+    report['rows_per_second'] = round(processed / elapsed) if elapsed else processed
+    return report
+
+
+def _upsert(batch, report, dry_run, reject):
+    existing = set()
+    for external_id, deleted_at in Hackathon.all_objects.filter(
+        external_id__in=batch
+    ).values_list('external_id', 'deleted_at'):
+        if deleted_at is None:
+            existing.add(external_id)
+        else:
+            # Updating it in place would leave it hidden while its purge runs
+            reject(batch.pop(external_id)[0], f'external_id {external_id!r} belongs to a deleted hackathon')
+    if not batch:
+        return
+    report['updated'] += len(existing)
+    report['inserted'] += len(batch) - len(existing)
+    if dry_run:
+        return
+    Hackathon.all_objects.bulk_create(
+        [Hackathon(**parsed.model_dump()) for _, parsed in batch.values()],
+        update_conflicts=True,
+        unique_fields=['external_id'],
+        update_fields=UPDATE_FIELDS,
+    )
+    # Team facets carry hackathon names
+    facets.invalidate('hackathons', 'teams')
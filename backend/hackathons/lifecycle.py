@@ -0,0 +1,79 @@
+"""
+Date-driven hackathon status lifecycle.
+
+Statuses only move forward: ``upcoming`` becomes ``registration_open`` once
+start_date is within HACKATHON_REGISTRATION_WINDOW_DAYS, ``in_progress`` at
+start_date and ``completed`` at end_date. A status set ahead of the dates by
+hand is kept.
+
+``advance_statuses`` stores the transitions with one range UPDATE per target
+status (``manage.py advance_hackathon_statuses``). Between runs, reads use
+``status_q`` and ``effective_status``, which compute the same status in SQL
+from the dates, so filters and responses never lag the scheduler.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Case, CharField, Q, Value, When
+from django.utils import timezone
+
+from config import facets
+from .models import Hackathon
+
+STAGES = ['upcoming', 'registration_open', 'in_progress', 'completed']
+
+
+def _registration_opens(now):
+    return now + timedelta(days=settings.HACKATHON_REGISTRATION_WINDOW_DAYS)
+
+
+def transitions(now):
+    """(status, rows due to move to it) pairs; each row matches at most one"""
+    return [
+        ('completed', Q(status__in=STAGES[:3], end_date__lte=now)),
+        ('in_progress', Q(status__in=STAGES[:2], start_date__lte=now, end_date__gt=now)),
+        ('registration_open', Q(status='upcoming', start_date__gt=now, start_date__lte=_registration_opens(now))),
+    ]
+
+
+def advance_statuses(now=None, dry_run=False):
+    """Apply due transitions with one UPDATE each and return the number of rows per new status"""
+    now = now or timezone.now()
+    moved = {}
+    for status, due in transitions(now):
+        rows = Hackathon.all_objects.filter(due)
+        moved[status] = rows.count() if dry_run else rows.update(status=status, updated_at=now)
+    if not dry_run and any(moved.values()):
+        facets.invalidate('hackathons')
+    return moved
+
+
+def status_q(status, now=None):
+    """Filter for hackathons whose status is ``status`` right now, whether or not it is stored yet"""
+    now = now or timezone.now()
+    if status == 'completed':
+        return Q(status='completed') | Q(end_date__lte=now)
+    live = Q(end_date__gt=now) & ~Q(status='completed')
+    if status == 'in_progress':
+        return live & (Q(status='in_progress') | Q(start_date__lte=now))
+    not_started = live & Q(start_date__gt=now) & ~Q(status='in_progress')
+    if status == 'registration_open':
+        return not_started & (Q(status='registration_open') | Q(start_date__lte=_registration_opens(now)))
+    if status == 'upcoming':
+        return not_started & Q(status='upcoming', start_date__gt=_registration_opens(now))
+    return Q(status=status)
+
+
+def effective_status(now=None):
+    """Expression for the current status, for ``.values()`` and ``.annotate()``"""
+    now = now or timezone.now()
+    return Case(
+        When(status='completed', then=Value('completed')),
+        When(end_date__lte=now, then=Value('completed')),
+        When(status='in_progress', then=Value('in_progress')),
+        When(start_date__lte=now, then=Value('in_progress')),
+        When(status='registration_open', then=Value('registration_open')),
+        When(start_date__lte=_registration_opens(now), then=Value('registration_open')),
+        default='status',
+        output_field=CharField(),
+    )
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathons', '0003_hackathon_hackathon_status_start_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hackathon',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-19 19:36
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def backfill_external_id(apps, schema_editor):
+    """Give existing hackathons the key an import derives for rows without an id"""
+    Hackathon = apps.get_model('hackathons', 'Hackathon')
+    seen = set()
+    for hackathon in Hackathon.objects.filter(external_id=None).order_by('id'):
+        key = slugify(f'{hackathon.name}-{hackathon.start_date.date().isoformat()}')[:255]
+        if key in seen:
+            key = f'{key[:240]}-{hackathon.id}'
+        seen.add(key)
+        hackathon.external_id = key
+        hackathon.save(update_fields=['external_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathons', '0004_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hackathon',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_external_id, migrations.RunPython.noop),
+    ]
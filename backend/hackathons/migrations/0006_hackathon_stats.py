@@ -0,0 +1,46 @@
+# Generated by Django 5.0.1 on 2026-10-19 19:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathons', '0005_hackathon_external_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HackathonStats',
+            fields=[
+                ('hackathon', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='hackathons.hackathon')),
+                ('registrations', models.IntegerField(default=0)),
+                ('teamed_registrants', models.IntegerField(default=0)),
+                ('solo_registrants', models.IntegerField(default=0)),
+                ('teams', models.IntegerField(default=0)),
+                ('full_teams', models.IntegerField(default=0)),
+                ('team_members', models.IntegerField(default=0)),
+                ('team_capacity', models.IntegerField(default=0)),
+                ('skill_counts', models.JSONField(default=dict)),
+                ('stale', models.BooleanField(default=True)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='HackathonDailyRegistrations',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('registrations', models.IntegerField(default=0)),
+                ('hackathon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_registrations', to='hackathons.hackathon')),
+            ],
+            options={
+                'ordering': ['day'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='hackathondailyregistrations',
+            constraint=models.UniqueConstraint(fields=('hackathon', 'day'), name='daily_registrations_unique'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-19 19:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathons', '0006_hackathon_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hackathon',
+            index=models.Index(fields=['status', 'end_date'], name='hackathon_status_end_idx'),
+        ),
+    ]
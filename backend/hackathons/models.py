@@ -1,5 +1,9 @@
+import secrets
+
 from django.db import models
 from django.conf import settings
+from django.utils.text import slugify
+from config.soft_delete import SoftDeleteManager
 
 
 class Hackathon(models.Model):
@@ -43,15 +47,43 @@ class Hackathon(models.Model):
     website_url = models.URLField(blank=True)
     registration_url = models.URLField(blank=True)
     
+    # Natural key for catalog imports (hackathons/importer.py)
+    external_id = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)  # Set while awaiting purge
+    
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
     
     class Meta:
         ordering = ['start_date']
+        indexes = [
+            models.Index(fields=['status', 'start_date'], name='hackathon_status_start_idx'),
+            models.Index(fields=['status', 'end_date'], name='hackathon_status_end_idx'),
+        ]
     
     def __str__(self):
         return self.name
     
+    def save(self, *args, **kwargs):
+        if not self.external_id:
+            # Same key a catalog import derives, so re-importing the row updates it
+            key = self.derive_external_id(self.name, self.start_date)
+            if Hackathon.all_objects.filter(external_id=key).exclude(pk=self.pk).exists():
+                key = f'{key[:246]}-{secrets.token_hex(4)}'
+            self.external_id = key
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'external_id'}
+        super().save(*args, **kwargs)
+    
+    @staticmethod
+    def derive_external_id(name, start_date):
+        """Import key for a hackathon without an external id: its name and start date"""
+        return slugify(f'{name}-{start_date.date().isoformat()}')[:255]
+    
     @property
     def participant_count(self):
         return self.registrations.count()
@@ -76,3 +108,49 @@ class HackathonRegistration(models.Model):
     
     def __str__(self):
         return f"{self.user.username} - {self.hackathon.name}"
+
+
+class HackathonStats(models.Model):
+    """Organizer analytics rollup, refreshed by hackathons/stats.py"""
+    hackathon = models.OneToOneField(
+        Hackathon,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    registrations = models.IntegerField(default=0)
+    teamed_registrants = models.IntegerField(default=0)  # Accepted on a team of this hackathon
+    solo_registrants = models.IntegerField(default=0)
+    teams = models.IntegerField(default=0)
+    full_teams = models.IntegerField(default=0)
+    team_members = models.IntegerField(default=0)  # Accepted memberships, leads included
+    team_capacity = models.IntegerField(default=0)  # Accepted members plus open positions left
+    skill_counts = models.JSONField(default=dict)  # Registrant skill -> number of registrants
+    stale = models.BooleanField(default=True)  # A refresh job is pending
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"Stats for hackathon {self.hackathon_id}"
+    
+    @property
+    def fill_rate(self):
+        return round(self.team_members / self.team_capacity, 4) if self.team_capacity else 0.0
+
+
+class HackathonDailyRegistrations(models.Model):
+    hackathon = models.ForeignKey(
+        Hackathon,
+        on_delete=models.CASCADE,
+        related_name='daily_registrations'
+    )
+    day = models.DateField()
+    registrations = models.IntegerField(default=0)
+    
+    class Meta:
+        ordering = ['day']
+        constraints = [
+            models.UniqueConstraint(fields=['hackathon', 'day'], name='daily_registrations_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.hackathon_id} {self.day}: {self.registrations}"
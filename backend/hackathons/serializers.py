@@ -0,0 +1,57 @@
+"""
+Response serializers for hackathon endpoints.
+
+Rows are fetched with ``.values()`` so only the columns in HackathonSchema are
+read, and the participant count comes from a correlated subquery instead of a
+COUNT per hackathon. ``status`` is the date-derived current status (see
+hackathons/lifecycle.py), not necessarily the stored column.
+"""
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .lifecycle import effective_status
+from .models import HackathonRegistration
+
+HACKATHON_FIELDS = (
+    'id',
+    'name',
+    'description',
+    'category',
+    'mode',
+    'start_date',
+    'end_date',
+    'location',
+    'prize',
+    'max_participants',
+    'website_url',
+    'registration_url',
+)
+
+
+def participant_count():
+    registrations = HackathonRegistration.objects.filter(
+        hackathon=OuterRef('pk')
+    ).order_by().values('hackathon').annotate(n=Count('id')).values('n')
+    return Coalesce(Subquery(registrations), 0)
+
+
+def hackathon_values(queryset):
+    # An annotation can't reuse a field's name, so the status is renamed per row
+    return queryset.values(
+        *HACKATHON_FIELDS,
+        current_status=effective_status(),
+        participant_count=participant_count(),
+    )
+
+
+def _with_status(row):
+    row['status'] = row.pop('current_status')
+    return row
+
+
+def serialize_hackathons(queryset):
+    return [_with_status(row) for row in hackathon_values(queryset)]
+
+
+async def aserialize_hackathons(queryset):
+    return [_with_status(row) async for row in hackathon_values(queryset)]
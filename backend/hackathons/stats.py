@@ -0,0 +1,175 @@
+"""
+Per-hackathon analytics rollups.
+
+``HackathonStats`` and ``HackathonDailyRegistrations`` hold precomputed
+numbers for GET /api/hackathons/{id}/stats. Endpoints that change
+registrations, teams or accepted memberships call ``mark_stale``, which flags
+the hackathon's row and queues a delayed refresh job unless one is already
+queued, so a burst of changes costs one refresh and a refresh that failed for
+good is retried by the next change. ``refresh`` recomputes any set of
+hackathons with one grouped query per figure;
+``manage.py rebuild_hackathon_stats`` runs it over every hackathon.
+
+Refreshes recompute a hackathon's figures in full rather than applying
+per-change deltas: teamed/solo splits and skill counts depend on memberships
+and profiles that change outside the registration endpoints, and the delayed,
+deduplicated job already folds a burst of changes into one recompute.
+"""
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from jobs.models import Job
+from teams.models import Team, TeamMembership
+from .models import HackathonDailyRegistrations, HackathonRegistration, HackathonStats
+
+ROLLUP_FIELDS = [
+    'registrations',
+    'teamed_registrants',
+    'solo_registrants',
+    'teams',
+    'full_teams',
+    'team_members',
+    'team_capacity',
+    'skill_counts',
+    'refreshed_at',
+]
+
+
+def queue_refresh(hackathon_ids, delay=0):
+    """Queue a refresh job for each hackathon that doesn't have one waiting already"""
+    from .tasks import refresh_hackathon_stats
+
+    ids = set(hackathon_ids)
+    # A running job may have read its data before the latest change, so only
+    # queued ones (including failed attempts waiting for a retry) count
+    pending = set(Job.objects.filter(
+        task=refresh_hackathon_stats.name,
+        status='queued',
+        payload__hackathon_id__in=ids,
+    ).values_list('payload__hackathon_id', flat=True))
+    refresh_hackathon_stats.enqueue_many(
+        [{'hackathon_id': hackathon_id} for hackathon_id in sorted(ids - pending)],
+        delay=delay,
+    )
+
+
+def mark_stale(hackathon_ids):
+    """Flag the hackathons' rollups and queue a refresh unless one is already queued"""
+    ids = {hackathon_id for hackathon_id in hackathon_ids if hackathon_id is not None}
+    if not ids:
+        return
+    HackathonStats.objects.filter(hackathon_id__in=ids, stale=False).update(stale=True)
+    # Rows that don't exist yet are built when the stats endpoint is first read
+    known = HackathonStats.objects.filter(hackathon_id__in=ids).values_list('hackathon_id', flat=True)
+    queue_refresh(known, delay=settings.HACKATHON_STATS_REFRESH_DELAY)
+
+
+def _registrations(hackathon_ids):
+    return HackathonRegistration.objects.filter(
+        hackathon_id__in=hackathon_ids,
+        user__deleted_at__isnull=True,
+    )
+
+
+def _per_hackathon(queryset):
+    return dict(
+        queryset.order_by().values('hackathon_id').annotate(n=Count('id')).values_list('hackathon_id', 'n')
+    )
+
+
+def refresh(hackathon_ids):
+    """Recompute the rollups of ``hackathon_ids``"""
+    ids = list(hackathon_ids)
+    HackathonStats.objects.bulk_create(
+        [HackathonStats(hackathon_id=hackathon_id) for hackathon_id in ids],
+        ignore_conflicts=True,
+    )
+    # Cleared before reading, so changes made while this runs re-flag the row
+    HackathonStats.objects.filter(hackathon_id__in=ids).update(stale=False)
+
+    registrations = _registrations(ids)
+    teamed = registrations.filter(Exists(TeamMembership.objects.filter(
+        user_id=OuterRef('user_id'),
+        team__hackathon_id=OuterRef('hackathon_id'),
+        team__deleted_at__isnull=True,
+        status='accepted',
+    )))
+    registration_counts = _per_hackathon(registrations)
+    teamed_counts = _per_hackathon(teamed)
+
+    team_totals = defaultdict(Counter)
+    for hackathon_id, open_positions, members in Team.objects.filter(hackathon_id__in=ids).annotate(
+        members=Count('memberships', filter=Q(memberships__status='accepted'))
+    ).order_by().values_list('hackathon_id', 'open_positions', 'members'):
+        totals = team_totals[hackathon_id]
+        totals['teams'] += 1
+        totals['team_members'] += members
+        totals['team_capacity'] += members + max(open_positions, 0)
+        totals['full_teams'] += open_positions <= 0
+
+    skill_counts = defaultdict(Counter)
+    for hackathon_id, skills in registrations.values_list('hackathon_id', 'user__skills').iterator(chunk_size=2000):
+        if isinstance(skills, list):
+            skill_counts[hackathon_id].update({str(skill).strip().lower() for skill in skills if str(skill).strip()})
+
+    daily = [
+        HackathonDailyRegistrations(hackathon_id=row['hackathon_id'], day=row['day'], registrations=row['n'])
+        for row in registrations.order_by().annotate(day=TruncDate('registered_at'))
+        .values('hackathon_id', 'day').annotate(n=Count('id'))
+    ]
+
+    now = timezone.now()
+    rows = []
+    for hackathon_id in ids:
+        totals = team_totals[hackathon_id]
+        count, teamed_count = registration_counts.get(hackathon_id, 0), teamed_counts.get(hackathon_id, 0)
+        rows.append(HackathonStats(
+            hackathon_id=hackathon_id,
+            registrations=count,
+            teamed_registrants=teamed_count,
+            solo_registrants=count - teamed_count,
+            teams=totals['teams'],
+            full_teams=totals['full_teams'],
+            team_members=totals['team_members'],
+            team_capacity=totals['team_capacity'],
+            skill_counts=dict(skill_counts[hackathon_id].most_common()),
+            refreshed_at=now,
+        ))
+    with transaction.atomic():
+        HackathonStats.objects.bulk_update(rows, ROLLUP_FIELDS, batch_size=500)
+        HackathonDailyRegistrations.objects.filter(hackathon_id__in=ids).delete()
+        HackathonDailyRegistrations.objects.bulk_create(daily, batch_size=1000)
+
+
+def serialize(stats):
+    """Stats endpoint payload, with the daily series and a running total"""
+    total = 0
+    by_day = []
+    daily = HackathonDailyRegistrations.objects.filter(hackathon_id=stats.hackathon_id)
+    for day, count in daily.values_list('day', 'registrations'):
+        total += count
+        by_day.append({'day': day, 'registrations': count, 'total': total})
+    return {
+        'hackathon_id': stats.hackathon_id,
+        'registrations': stats.registrations,
+        'teamed_registrants': stats.teamed_registrants,
+        'solo_registrants': stats.solo_registrants,
+        'teams': stats.teams,
+        'full_teams': stats.full_teams,
+        'team_members': stats.team_members,
+        'team_capacity': stats.team_capacity,
+        'fill_rate': stats.fill_rate,
+        # Sorted here: jsonb doesn't keep the most_common() key order refresh() stored
+        'skills': [
+            {'skill': skill, 'registrants': count}
+            for skill, count in sorted(stats.skill_counts.items(), key=lambda item: (-item[1], item[0]))
+        ],
+        'registrations_by_day': by_day,
+        'stale': stats.stale,
+        'refreshed_at': stats.refreshed_at,
+    }
@@ -0,0 +1,50 @@
+import logging
+
+from django.utils import timezone
+
+from config import facets
+from config.soft_delete import purge_batches
+from jobs.queue import task
+from messages_app.models import Conversation
+from teams.models import Team
+from teams.tasks import detach_last_messages, team_purge_steps
+from . import stats
+from .models import Hackathon, HackathonDailyRegistrations, HackathonRegistration, HackathonStats
+
+logger = logging.getLogger(__name__)
+
+
+def soft_delete_hackathons(hackathon_ids):
+    """Hide the hackathons and their teams now and queue the purge"""
+    now = timezone.now()
+    Hackathon.all_objects.filter(id__in=hackathon_ids, deleted_at=None).update(deleted_at=now)
+    Team.all_objects.filter(hackathon_id__in=hackathon_ids, deleted_at=None).update(deleted_at=now)
+    facets.invalidate('hackathons', 'teams')
+    for hackathon_id in hackathon_ids:
+        purge_hackathon.enqueue(hackathon_id=hackathon_id)
+
+
+@task(queue='purge')
+def purge_hackathon(hackathon_id, progress=None):
+    """Delete a soft-deleted hackathon's teams and registrations in batches, then the hackathon"""
+    progress = progress or {}
+    hackathons = Hackathon.all_objects.filter(id=hackathon_id, deleted_at__isnull=False)
+    teams = Team.all_objects.filter(hackathon__in=hackathons)
+    detach_last_messages(Conversation.objects.filter(team__in=teams))
+    steps = team_purge_steps(teams) + [
+        ('registrations', HackathonRegistration.objects.filter(hackathon__in=hackathons)),
+        ('daily registrations', HackathonDailyRegistrations.objects.filter(hackathon__in=hackathons)),
+        ('stats', HackathonStats.objects.filter(hackathon__in=hackathons)),
+    ]
+    if purge_batches(steps, progress):
+        hackathons.delete()
+        logger.info('Purged hackathon %s: %s', hackathon_id, progress)
+    else:
+        logger.info('Purging hackathon %s: %s so far', hackathon_id, progress)
+        purge_hackathon.enqueue(hackathon_id=hackathon_id, progress=progress)
+
+
+@task
+def refresh_hackathon_stats(hackathon_id):
+    """Recompute a hackathon's analytics rollup after it was marked stale"""
+    stats.refresh([hackathon_id])
@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .importer import import_catalog
+from .models import Hackathon
+from .tasks import soft_delete_hackathons
+
+
+def catalog_row(external_id, name):
+    start = timezone.now() + timedelta(days=30)
+    return {
+        'external_id': external_id,
+        'name': name,
+        'mode': 'remote',
+        'start_date': start.isoformat(),
+        'end_date': (start + timedelta(days=2)).isoformat(),
+        'location': 'Online',
+    }
+
+
+class CatalogImportTests(TestCase):
+    def setUp(self):
+        import_catalog([catalog_row('kept', 'Kept Hack'), catalog_row('deleted', 'Deleted Hack')])
+        soft_delete_hackathons([Hackathon.objects.get(external_id='deleted').id])
+
+    def test_rows_keyed_to_a_deleted_hackathon_are_rejected(self):
+        report = import_catalog([
+            catalog_row('kept', 'Kept Hack v2'),
+            catalog_row('deleted', 'Deleted Hack v2'),
+            catalog_row('new', 'New Hack'),
+        ])
+
+        self.assertEqual((report['inserted'], report['updated'], report['rejected']), (1, 1, 1))
+        self.assertEqual(report['errors'][0]['row'], 2)
+        self.assertEqual(Hackathon.objects.get(external_id='kept').name, 'Kept Hack v2')
+        self.assertEqual(Hackathon.all_objects.get(external_id='deleted').name, 'Deleted Hack')
+        self.assertFalse(Hackathon.objects.filter(external_id='deleted').exists())
+
+    def test_a_batch_of_only_deleted_keys_writes_nothing(self):
+        report = import_catalog([catalog_row('deleted', 'Deleted Hack v2')])
+
+        self.assertEqual((report['inserted'], report['updated'], report['rejected']), (0, 0, 1))
+        self.assertEqual(Hackathon.all_objects.get(external_id='deleted').name, 'Deleted Hack')
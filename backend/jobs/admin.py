@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'queue', 'status', 'attempts', 'run_at', 'locked_by', 'updated_at')
+    list_filter = ('queue', 'status')
+    search_fields = ('task', 'last_error')
+    ordering = ('-created_at',)
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-19 20:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'updated_at'], name='job_status_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
+    queue = models.CharField(max_length=50, default='default')
+    task = models.CharField(max_length=255)  # Registered task name, see jobs/queue.py
+    payload = models.JSONField(default=dict, blank=True)  # Keyword arguments for the task
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)  # Not claimed before this time
+    locked_by = models.CharField(max_length=100, blank=True)  # Worker that claimed the job
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['run_at']
+        indexes = [
+            models.Index(fields=['queue', 'status', 'run_at'], name='job_claim_idx'),
+            # Retention deletes of old 'done' jobs and lookups of queued ones
+            models.Index(fields=['status', 'updated_at'], name='job_status_updated_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.task} [{self.status}]"
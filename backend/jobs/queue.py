@@ -0,0 +1,231 @@
+"""
+Durable job queue stored in the jobs_job table.
+
+Tasks are plain functions decorated with @task in an app's tasks.py; calling
+``some_task.enqueue(**kwargs)`` inserts a Job row in the caller's transaction,
+so the job only becomes visible if the request's own writes commit. Workers
+(``manage.py run_workers``) claim due jobs with SELECT ... FOR UPDATE SKIP
+LOCKED where the database supports it, and with a compare-and-set UPDATE under
+a process lock on SQLite.
+
+While a job runs, its worker refreshes ``locked_at`` every
+JOB_HEARTBEAT_INTERVAL seconds. ``requeue_stale`` only takes back jobs whose
+heartbeat stopped for JOB_STALE_AFTER seconds, i.e. whose worker died, and
+fails them instead once they have used up their attempts. SQLite can't take
+the heartbeat's UPDATE while the job's own transaction holds the write lock,
+so there (and for any worker on this host) a job is also left alone while the
+worker process named in ``locked_by`` is still alive.
+
+Workers also delete 'done' jobs older than JOB_RETENTION_SECONDS
+(``delete_finished``), so the table only holds recent and pending work.
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+_claim_lock = threading.Lock()
+
+
+class Task:
+    def __init__(self, func, name, queue, max_attempts):
+        self.func = func
+        self.name = name
+        self.queue = queue
+        self.max_attempts = max_attempts
+
+    def __call__(self, **kwargs):
+        return self.func(**kwargs)
+
+    def enqueue(self, delay=0, **kwargs):
+        """Queue the task with JSON-serializable keyword arguments"""
+        return Job.objects.create(
+            queue=self.queue,
+            task=self.name,
+            payload=kwargs,
+            max_attempts=self.max_attempts,
+            run_at=timezone.now() + timedelta(seconds=delay),
+        )
+
+    def enqueue_many(self, payloads, delay=0):
+        """Queue one job per kwargs dict in ``payloads`` with a single INSERT"""
+        run_at = timezone.now() + timedelta(seconds=delay)
+        return Job.objects.bulk_create([
+            Job(queue=self.queue, task=self.name, payload=payload,
+                max_attempts=self.max_attempts, run_at=run_at)
+            for payload in payloads
+        ])
+
+
+def task(func=None, *, queue='default', max_attempts=None):
+    """Register a function as a background task"""
+    def decorator(func):
+        name = f'{func.__module__}.{func.__name__}'
+        registry[name] = Task(func, name, queue, max_attempts or settings.JOB_MAX_ATTEMPTS)
+        return registry[name]
+    return decorator(func) if func is not None else decorator
+
+
+def claim(queue, limit, worker_id):
+    """Mark up to ``limit`` due jobs on ``queue`` as running and return them"""
+    now = timezone.now()
+    due = Job.objects.filter(queue=queue, status='queued', run_at__lte=now).order_by('run_at', 'id')
+    claimed_fields = dict(status='running', locked_by=worker_id, locked_at=now, attempts=F('attempts') + 1)
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('id', flat=True)[:limit])
+            Job.objects.filter(id__in=ids).update(**claimed_fields)
+    else:
+        # SQLite has no row locks: serialize claims within this process and
+        # only keep rows whose status flip we won against other processes
+        ids = []
+        with _claim_lock:
+            for job_id in due.values_list('id', flat=True)[:limit]:
+                if Job.objects.filter(id=job_id, status='queued').update(**claimed_fields):
+                    ids.append(job_id)
+    return list(Job.objects.filter(id__in=ids).order_by('run_at', 'id'))
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter, capped at JOB_RETRY_BACKOFF_MAX seconds"""
+    delay = min(settings.JOB_RETRY_BACKOFF * 2 ** (attempts - 1), settings.JOB_RETRY_BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+class _Heartbeat:
+    """Refresh a running job's locked_at from a background thread until the job ends"""
+
+    def __init__(self, job):
+        self.job = job
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f'job-{job.id}-heartbeat', daemon=True)
+
+    def __enter__(self):
+        # SQLite would block the beat behind the job's transaction; see requeue_stale
+        if connection.vendor != 'sqlite':
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        try:
+            while not self._stop.wait(settings.JOB_HEARTBEAT_INTERVAL):
+                try:
+                    Job.objects.filter(id=self.job.id, status='running', locked_by=self.job.locked_by).update(
+                        locked_at=timezone.now()
+                    )
+                except DatabaseError:
+                    logger.warning('Heartbeat for job %s failed', self.job.id, exc_info=True)
+        finally:
+            connection.close()
+
+
+def run(job):
+    """Execute a claimed job and record the outcome; returns the final status"""
+    registered = registry.get(job.task)
+    try:
+        if registered is None:
+            raise LookupError(f'Unknown task {job.task}')
+        with _Heartbeat(job), transaction.atomic():
+            registered(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts < job.max_attempts and registered is not None:
+            status, run_at = 'queued', timezone.now() + timedelta(seconds=retry_delay(job.attempts))
+        else:
+            status, run_at = 'failed', job.run_at
+        logger.warning('Job %s (%s) attempt %s failed: %s', job.id, job.task, job.attempts, error)
+        Job.objects.filter(id=job.id).update(
+            status=status, run_at=run_at, last_error=error, locked_by='', locked_at=None,
+            updated_at=timezone.now(),
+        )
+        return status
+
+    Job.objects.filter(id=job.id).update(
+        status='done', last_error='', locked_by='', locked_at=None, updated_at=timezone.now()
+    )
+    return 'done'
+
+
+def _local_worker_alive(locked_by):
+    """Whether ``locked_by`` ('host:pid', see run_workers) is a live process on this host"""
+    host, _, pid = locked_by.rpartition(':')
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def requeue_stale(older_than):
+    """
+    Recover jobs whose worker died mid-run (no heartbeat for ``older_than`` seconds).
+
+    Jobs with attempts left go back to the queue; the rest are marked failed so
+    a job that keeps killing its worker doesn't loop forever. Returns the
+    number of (requeued, failed) jobs.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status='running', locked_at__lt=now - timedelta(seconds=older_than))
+    alive = [job_id for job_id, locked_by in stale.values_list('id', 'locked_by') if _local_worker_alive(locked_by)]
+    stale = stale.exclude(id__in=alive)
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', last_error=f'Worker stopped responding (no heartbeat for {older_than}s)',
+        locked_by='', locked_at=None, updated_at=now,
+    )
+    requeued = stale.update(status='queued', locked_by='', locked_at=None, updated_at=now)
+    if failed or requeued:
+        logger.warning('Recovered stale jobs: %s requeued, %s failed', requeued, failed)
+    return requeued, failed
+
+
+def delete_finished(older_than, batch_size):
+    """
+    Delete jobs that finished ``older_than`` seconds ago, ``batch_size`` rows per DELETE.
+
+    Only 'done' jobs go; failed ones stay for inspection. Returns the number deleted.
+    """
+    finished = Job.objects.filter(
+        status='done', updated_at__lt=timezone.now() - timedelta(seconds=older_than)
+    ).order_by('updated_at')
+    deleted = 0
+    while True:
+        ids = list(finished.values_list('id', flat=True)[:batch_size])
+        if ids:
+            deleted += Job.objects.filter(id__in=ids).delete()[0]
+        if len(ids) < batch_size:
+            break
+    if deleted:
+        logger.info('Deleted %s finished jobs', deleted)
+    return deleted
+
+
+def parse_queues(spec):
+    """Parse 'default:4,email:1' into {'default': 4, 'email': 1}"""
+    queues = {}
+    for part in filter(None, (p.strip() for p in spec.split(','))):
+        name, _, concurrency = part.partition(':')
+        queues[name] = int(concurrency or 1)
+    return queues
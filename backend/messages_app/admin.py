@@ -1,22 +1,32 @@
 from django.contrib import admin
+from django.db.models import Prefetch
+from config.admin import LargeTableAdminMixin
+from users.models import User
 from .models import Conversation, Message
 
 
 @admin.register(Conversation)
-class ConversationAdmin(admin.ModelAdmin):
+class ConversationAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'get_participants', 'created_at', 'updated_at')
+    autocomplete_fields = ('participants', 'team', 'user_low', 'user_high', 'last_message', 'last_message_sender')
     search_fields = ('participants__username',)
     ordering = ('-updated_at',)
     
+    def get_queryset(self, request):
+        participants = Prefetch('participants', queryset=User.objects.only('id', 'username'))
+        return super().get_queryset(request).select_related('team', 'user_low', 'user_high').prefetch_related(participants)
+    
     def get_participants(self, obj):
         return ', '.join([p.username for p in obj.participants.all()[:3]])
     get_participants.short_description = 'Participants'
 
 
 @admin.register(Message)
-class MessageAdmin(admin.ModelAdmin):
+class MessageAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('sender', 'conversation', 'content_preview', 'is_read', 'created_at')
     list_filter = ('is_read',)
+    list_select_related = ('sender', 'conversation__team', 'conversation__user_low', 'conversation__user_high')
+    autocomplete_fields = ('sender', 'conversation')
     search_fields = ('sender__username', 'content')
     ordering = ('-created_at',)
     
@@ -1,13 +1,20 @@
 from ninja import Router, Schema
 from typing import List, Optional
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Max
-from users.api import AuthBearer
-from .models import Conversation, Message
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from users.api import AuthBearer, AsyncAuthBearer
+from config.ratelimit import rate_limit
+from config.serializers import trusted_response
+from .models import Conversation, ConversationParticipant, Message
+from . import team_chat
 from users.models import User
 
 router = Router()
 
+# Team chats disappear with their team's soft delete, before the purge removes them
+VISIBLE = Q(team__isnull=True) | Q(team__deleted_at__isnull=True)
+
 
 # Schemas
 class MessageSchema(Schema):
@@ -45,47 +52,43 @@ class SendMessageToConversationSchema(Schema):
 
 
 # Message endpoints
-@router.get("/conversations", response=List[ConversationSchema], auth=AuthBearer())
-def list_conversations(request):
+@router.get("/conversations", response=List[ConversationSchema], auth=AsyncAuthBearer())
+async def list_conversations(request):
     """List all conversations for the current user"""
+    # The unread count is stored on the participant row the filter joins, so no message is read here
     conversations = Conversation.objects.filter(
-        participants=request.auth
-    ).prefetch_related('participants', 'messages', 'team')
+        VISIBLE, participant_rows__user=request.auth
+    ).select_related('team').prefetch_related('participants').annotate(
+        unread=F('participant_rows__unread_count'),
+    )
     
     result = []
-    for conv in conversations:
+    async for conv in conversations:
         participants = conv.participants.all()
         participant_ids = [p.id for p in participants]
         participant_names = [p.full_name or p.username for p in participants]
         
-        last_msg = conv.last_message
-        last_message_text = last_msg.content if last_msg else None
-        
-        unread_count = conv.messages.filter(
-            ~Q(sender=request.auth),
-            is_read=False
-        ).count()
-        
         result.append({
             'id': conv.id,
             'participants': participant_ids,
             'participant_names': participant_names,
-            'last_message': last_message_text,
-            'unread_count': unread_count,
-            'updated_at': conv.updated_at.isoformat(),
+            'last_message': conv.last_message_preview or None,
+            'unread_count': conv.unread,
+            'updated_at': conv.updated_at,
             'is_group_chat': conv.team is not None,
             'team_id': conv.team.id if conv.team else None,
             'team_name': conv.team.name if conv.team else None,
         })
     
-    return result
+    return trusted_response(router, request, result)
 
 
 @router.get("/conversations/{conversation_id}", response=ConversationDetailSchema, auth=AuthBearer())
 def get_conversation(request, conversation_id: int):
     """Get conversation details with messages"""
     conversation = get_object_or_404(
-        Conversation.objects.prefetch_related('participants', 'messages__sender'),
+        Conversation.objects.filter(VISIBLE)
+        .select_related('team').prefetch_related('participants', 'messages__sender'),
         id=conversation_id
     )
     
@@ -97,19 +100,21 @@ def get_conversation(request, conversation_id: int):
             status=403
         )
     
-    # Mark messages as read
-    conversation.messages.filter(~Q(sender=request.auth)).update(is_read=True)
+    conversation.mark_read(request.auth)
     
     participants = conversation.participants.all()
     messages = conversation.messages.all()
     
-    return {
+    return trusted_response(router, request, {
         'id': conversation.id,
         'participants': [p.id for p in participants],
         'participant_names': [p.full_name or p.username for p in participants],
         'last_message': messages[0].content if messages else None,
         'unread_count': 0,  # All read now
-        'updated_at': conversation.updated_at.isoformat(),
+        'updated_at': conversation.updated_at,
+        'is_group_chat': conversation.team is not None,
+        'team_id': conversation.team.id if conversation.team else None,
+        'team_name': conversation.team.name if conversation.team else None,
         'messages': [
             {
                 'id': m.id,
@@ -117,11 +122,11 @@ def get_conversation(request, conversation_id: int):
                 'sender_name': m.sender.full_name or m.sender.username,
                 'content': m.content,
                 'is_read': m.is_read,
-                'created_at': m.created_at.isoformat(),
+                'created_at': m.created_at,
             }
             for m in reversed(messages)  # Oldest first for display
         ]
-    }
+    })
 
 
 @router.post("/send", auth=AuthBearer())
@@ -129,26 +134,15 @@ def send_message(request, data: SendMessageSchema):
     """Send a message to a user (creates conversation if needed)"""
     recipient = get_object_or_404(User, id=data.recipient_id)
     
-    # Find or create conversation (exclude team conversations)
-    conversation = Conversation.objects.filter(
-        participants=request.auth,
-        team__isnull=True  # Only get direct message conversations
-    ).filter(
-        participants=recipient
-    ).first()
-    
-    if not conversation:
-        conversation = Conversation.objects.create()
-        conversation.participants.add(request.auth, recipient)
-    
-    message = Message.objects.create(
-        conversation=conversation,
-        sender=request.auth,
-        content=data.content
-    )
+    conversation, _ = Conversation.get_or_create_direct(request.auth, recipient)
     
-    # Update conversation timestamp
-    conversation.save()
+    with transaction.atomic():
+        message = Message.objects.create(
+            conversation=conversation,
+            sender=request.auth,
+            content=data.content
+        )
+        conversation.record_message(message)
     
     return {
         'id': message.id,
@@ -156,14 +150,14 @@ def send_message(request, data: SendMessageSchema):
         'sender_name': message.sender.full_name or message.sender.username,
         'content': message.content,
         'is_read': message.is_read,
-        'created_at': message.created_at.isoformat(),
+        'created_at': message.created_at,
     }
 
 
 @router.post("/conversations/{conversation_id}/send", auth=AuthBearer())
 def send_message_to_conversation(request, conversation_id: int, data: SendMessageToConversationSchema):
     """Send a message to an existing conversation"""
-    conversation = get_object_or_404(Conversation, id=conversation_id)
+    conversation = get_object_or_404(Conversation.objects.filter(VISIBLE), id=conversation_id)
     
     # Check if user is participant
     if request.auth not in conversation.participants.all():
@@ -173,14 +167,13 @@ def send_message_to_conversation(request, conversation_id: int, data: SendMessag
             status=403
         )
     
-    message = Message.objects.create(
-        conversation=conversation,
-        sender=request.auth,
-        content=data.content
-    )
-    
-    # Update conversation timestamp
-    conversation.save()
+    with transaction.atomic():
+        message = Message.objects.create(
+            conversation=conversation,
+            sender=request.auth,
+            content=data.content
+        )
+        conversation.record_message(message)
     
     return {
         'id': message.id,
@@ -188,21 +181,20 @@ def send_message_to_conversation(request, conversation_id: int, data: SendMessag
         'sender_name': message.sender.full_name or message.sender.username,
         'content': message.content,
         'is_read': message.is_read,
-        'created_at': message.created_at.isoformat(),
+        'created_at': message.created_at,
     }
 
 
-@router.get("/unread-count", auth=AuthBearer())
-def get_unread_count(request):
+@router.get("/unread-count", auth=AsyncAuthBearer())
+@rate_limit('poll')
+async def get_unread_count(request):
     """Get total unread message count"""
-    count = Message.objects.filter(
-        conversation__participants=request.auth
-    ).filter(
-        ~Q(sender=request.auth),
-        is_read=False
-    ).count()
+    totals = await ConversationParticipant.objects.filter(
+        user=request.auth,
+        conversation__in=Conversation.objects.filter(VISIBLE),
+    ).aaggregate(unread=Sum('unread_count'))
     
-    return {"unread_count": count}
+    return {"unread_count": totals['unread'] or 0}
 
 
 @router.get("/team/{team_id}/conversation", response=ConversationDetailSchema, auth=AuthBearer())
@@ -225,32 +217,20 @@ def get_team_conversation(request, team_id: int):
             status=403
         )
     
-    # Get or create team conversation
-    conversation = Conversation.objects.filter(team=team).first()
+    conversation = team_chat.get_or_create_team_conversation(team)
     
-    if not conversation:
-        # Create new team conversation
-        conversation = Conversation.objects.create(team=team)
-        # Add all team members as participants
-        members = User.objects.filter(
-            team_memberships__team=team,
-            team_memberships__status='accepted'
-        )
-        conversation.participants.set(members)
-    
-    # Mark messages as read
-    conversation.messages.filter(~Q(sender=request.auth)).update(is_read=True)
+    conversation.mark_read(request.auth)
     
     participants = conversation.participants.all()
     messages = conversation.messages.all()
     
-    return {
+    return trusted_response(router, request, {
         'id': conversation.id,
         'participants': [p.id for p in participants],
         'participant_names': [p.full_name or p.username for p in participants],
         'last_message': messages[0].content if messages else None,
         'unread_count': 0,
-        'updated_at': conversation.updated_at.isoformat(),
+        'updated_at': conversation.updated_at,
         'is_group_chat': True,
         'team_id': team.id,
         'team_name': team.name,
@@ -261,8 +241,8 @@ def get_team_conversation(request, team_id: int):
                 'sender_name': m.sender.full_name or m.sender.username,
                 'content': m.content,
                 'is_read': m.is_read,
-                'created_at': m.created_at.isoformat(),
+                'created_at': m.created_at,
             }
             for m in reversed(messages)
         ]
-    }
+    })
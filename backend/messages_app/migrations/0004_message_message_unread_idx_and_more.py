@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-19 19:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messages_app', '0003_conversation_team'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'is_read', 'sender'], name='message_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', '-created_at'], name='message_conv_created_idx'),
+        ),
+    ]
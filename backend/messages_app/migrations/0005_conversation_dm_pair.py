@@ -0,0 +1,59 @@
+# Generated by Django 5.0.1 on 2026-10-19 19:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def merge_direct_conversations(apps, schema_editor):
+    """Key every direct conversation by its participant pair, folding duplicate threads into the oldest"""
+    Conversation = apps.get_model('messages_app', 'Conversation')
+    Message = apps.get_model('messages_app', 'Message')
+    Participant = Conversation.participants.through
+
+    participants = {}
+    for conversation_id, user_id in Participant.objects.filter(
+        conversation__team__isnull=True
+    ).values_list('conversation_id', 'user_id'):
+        participants.setdefault(conversation_id, set()).add(user_id)
+
+    threads = {}
+    for conversation_id, user_ids in sorted(participants.items()):
+        # Conversations with more than two people are not direct messages
+        if 1 <= len(user_ids) <= 2:
+            pair = (min(user_ids), max(user_ids))
+            threads.setdefault(pair, []).append(conversation_id)
+
+    for (low, high), conversation_ids in threads.items():
+        keeper, duplicates = conversation_ids[0], conversation_ids[1:]
+        if duplicates:
+            Message.objects.filter(conversation_id__in=duplicates).update(conversation_id=keeper)
+            latest = max(
+                Conversation.objects.filter(id__in=conversation_ids).values_list('updated_at', flat=True)
+            )
+            Conversation.objects.filter(id__in=duplicates).delete()
+            Conversation.objects.filter(id=keeper).update(updated_at=latest)
+        Conversation.objects.filter(id=keeper).update(user_low_id=low, user_high_id=high)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messages_app', '0004_message_message_unread_idx_and_more'),
+        ('teams', '0007_team_team_hackathon_created_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='user_high',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='user_low',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(merge_direct_conversations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-19 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messages_app', '0005_conversation_dm_pair'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='conversation',
+            constraint=models.UniqueConstraint(fields=('user_low', 'user_high'), name='conversation_dm_pair_unique'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.1 on 2026-10-19 19:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Substr
+
+
+def backfill_last_message(apps, schema_editor):
+    Conversation = apps.get_model('messages_app', 'Conversation')
+    Message = apps.get_model('messages_app', 'Message')
+    latest = Message.objects.filter(conversation=OuterRef('pk')).order_by('-created_at', '-id')
+    Conversation.objects.update(
+        last_message=Subquery(latest.values('id')[:1]),
+        last_message_preview=Coalesce(Substr(Subquery(latest.values('content')[:1]), 1, 255), Value('')),
+        last_message_sender=Subquery(latest.values('sender')[:1]),
+        last_message_at=Subquery(latest.values('created_at')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messages_app', '0006_conversation_dm_pair_unique'),
+        ('teams', '0007_team_team_hackathon_created_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messages_app.message'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message_preview',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message_sender',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['-updated_at'], name='conversation_updated_idx'),
+        ),
+        migrations.RunPython(backfill_last_message, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0.1 on 2026-10-19 19:28
+
+from django.db import migrations
+from django.db.models import Count, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Substr
+
+
+def merge_team_conversations(apps, schema_editor):
+    """Fold duplicate chats of the same team into the oldest one"""
+    Conversation = apps.get_model('messages_app', 'Conversation')
+    Message = apps.get_model('messages_app', 'Message')
+    Participant = Conversation.participants.through
+
+    duplicated = Conversation.objects.filter(team__isnull=False).values('team').annotate(
+        keeper=Min('id'), n=Count('id')
+    ).filter(n__gt=1)
+
+    keepers = []
+    for row in duplicated:
+        keeper = row['keeper']
+        duplicates = list(
+            Conversation.objects.filter(team_id=row['team']).exclude(id=keeper).values_list('id', flat=True)
+        )
+        Message.objects.filter(conversation_id__in=duplicates).update(conversation_id=keeper)
+        Participant.objects.bulk_create(
+            [
+                Participant(conversation_id=keeper, user_id=user_id)
+                for user_id in Participant.objects.filter(
+                    conversation_id__in=duplicates
+                ).values_list('user_id', flat=True).distinct()
+            ],
+            ignore_conflicts=True,
+        )
+        Conversation.objects.filter(id__in=duplicates).delete()
+        keepers.append(keeper)
+
+    latest = Message.objects.filter(conversation=OuterRef('pk')).order_by('-created_at', '-id')
+    Conversation.objects.filter(id__in=keepers).update(
+        last_message=Subquery(latest.values('id')[:1]),
+        last_message_preview=Coalesce(Substr(Subquery(latest.values('content')[:1]), 1, 255), Value('')),
+        last_message_sender=Subquery(latest.values('sender')[:1]),
+        last_message_at=Subquery(latest.values('created_at')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messages_app', '0007_conversation_last_message'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_team_conversations, migrations.RunPython.noop),
+    ]
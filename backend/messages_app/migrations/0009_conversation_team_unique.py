@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-19 19:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messages_app', '0008_merge_team_conversations'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='conversation',
+            constraint=models.UniqueConstraint(fields=('team',), name='conversation_team_unique'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.1 on 2026-10-19 20:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_unread(apps, schema_editor):
+    """Start every participant's unread_count from the messages still flagged unread"""
+    ConversationParticipant = apps.get_model('messages_app', 'ConversationParticipant')
+    Message = apps.get_model('messages_app', 'Message')
+
+    unread = Message.objects.filter(
+        ~Q(sender=OuterRef('user')), conversation=OuterRef('conversation'), is_read=False
+    ).order_by().values('conversation').annotate(n=Count('id')).values('n')
+    ConversationParticipant.objects.update(unread_count=Coalesce(Subquery(unread), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messages_app', '0009_conversation_team_unique'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Adopt the table Django created for the implicit M2M as an explicit model
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ConversationParticipant',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('conversation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participant_rows', to='messages_app.conversation')),
+                        ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'db_table': 'messages_app_conversation_participants',
+                        'unique_together': {('conversation', 'user')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='conversation',
+                    name='participants',
+                    field=models.ManyToManyField(related_name='conversations', through='messages_app.ConversationParticipant', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='conversationparticipant',
+            name='unread_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(count_unread, migrations.RunPython.noop),
+    ]
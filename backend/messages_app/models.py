@@ -1,10 +1,13 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 
+PREVIEW_LENGTH = 255
+
 
 class Conversation(models.Model):
     participants = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
+        through='ConversationParticipant',
         related_name='conversations'
     )
     team = models.ForeignKey(
@@ -15,25 +18,116 @@ class Conversation(models.Model):
         blank=True,
         help_text='If set, this is a team group chat'
     )
+    # Direct messages are keyed by the ordered pair of participant ids so the
+    # thread between two users is a single unique-index lookup
+    user_low = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True
+    )
+    user_high = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True
+    )
+    # Copy of the newest message so the inbox renders from this table alone;
+    # kept current by record_message()
+    last_message = models.ForeignKey(
+        'Message',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True
+    )
+    last_message_preview = models.CharField(max_length=PREVIEW_LENGTH, blank=True)
+    last_message_sender = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True
+    )
+    last_message_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['-updated_at'], name='conversation_updated_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user_low', 'user_high'], name='conversation_dm_pair_unique'),
+            models.UniqueConstraint(fields=['team'], name='conversation_team_unique'),
+        ]
     
     def __str__(self):
         if self.team:
             return f"Team Chat: {self.team.name}"
+        if self.user_low_id and self.user_high_id:
+            # Direct messages name their pair from the row itself, so lists
+            # that select_related it don't query participants per row
+            return f"Conversation: {self.user_low.username}, {self.user_high.username}"
         participant_names = ', '.join([p.username for p in self.participants.all()[:3]])
         return f"Conversation: {participant_names}"
     
-    @property
-    def last_message(self):
-        return self.messages.first()
-    
     @property
     def is_group_chat(self):
         return self.team is not None
+    
+    @classmethod
+    def get_or_create_direct(cls, user_a, user_b):
+        """Return (conversation, created) for the direct thread between two users"""
+        low, high = sorted((user_a.id, user_b.id))
+        with transaction.atomic():
+            # A concurrent creator hits the unique constraint and get_or_create
+            # falls back to fetching the row the other request inserted
+            conversation, created = cls.objects.get_or_create(user_low_id=low, user_high_id=high)
+            if created:
+                conversation.participants.add(low, high)
+        return conversation, created
+    
+    def record_message(self, message):
+        """Point the denormalized last-message columns at a newly sent message"""
+        fields = {
+            'last_message': message,
+            'last_message_preview': message.content[:PREVIEW_LENGTH],
+            'last_message_sender': message.sender,
+            'last_message_at': message.created_at,
+            'updated_at': message.created_at,
+        }
+        Conversation.objects.filter(id=self.id).update(**fields)
+        ConversationParticipant.objects.filter(conversation_id=self.id).exclude(user_id=message.sender_id).update(
+            unread_count=models.F('unread_count') + 1
+        )
+        for name, value in fields.items():
+            setattr(self, name, value)
+    
+    def mark_read(self, user):
+        """Clear ``user``'s unread count and flag the others' messages as read"""
+        ConversationParticipant.objects.filter(conversation_id=self.id, user=user).update(unread_count=0)
+        self.messages.filter(~models.Q(sender=user)).update(is_read=True)
+
+
+class ConversationParticipant(models.Model):
+    """
+    A user's membership of a conversation (the participants M2M row).
+
+    ``unread_count`` is kept by Conversation.record_message() and mark_read(),
+    so the inbox reads it from this row instead of counting messages.
+    """
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='participant_rows')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    unread_count = models.IntegerField(default=0)  # Messages from others since the user last opened it
+    
+    class Meta:
+        # The table Django created for the implicit M2M
+        db_table = 'messages_app_conversation_participants'
+        unique_together = ['conversation', 'user']
 
 
 class Message(models.Model):
@@ -53,6 +147,10 @@ class Message(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['conversation', 'is_read', 'sender'], name='message_unread_idx'),
+            models.Index(fields=['conversation', '-created_at'], name='message_conv_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.sender.username}: {self.content[:50]}"
@@ -0,0 +1,18 @@
+from jobs.queue import task
+from teams.models import Team
+from . import team_chat
+
+
+@task
+def create_team_chat(team_id):
+    """Create a new team's group chat ahead of its first visit"""
+    team = Team.objects.filter(id=team_id).first()
+    if team is not None:
+        team_chat.get_or_create_team_conversation(team)
+
+
+@task(max_attempts=1)
+def sync_team_chats(batch_size=500):
+    """Repair every team chat's participants (see manage.py sync_team_chats)"""
+    for _ in team_chat.sync_team_chats(batch_size=batch_size):
+        pass
@@ -0,0 +1,97 @@
+"""
+Keeps team group-chat participants in step with accepted team memberships.
+
+Membership transitions in teams.api call add_member()/remove_member(), which
+touch only the affected M2M row. sync_team_chats() diffs whole batches of team
+chats against memberships and backs the sync_team_chats management command.
+"""
+from django.db import transaction
+
+from teams.models import TeamMembership
+from .models import Conversation
+
+Participant = Conversation.participants.through
+
+
+def accepted_member_ids(team_id):
+    return set(
+        TeamMembership.objects.filter(team_id=team_id, status='accepted').values_list('user_id', flat=True)
+    )
+
+
+def get_or_create_team_conversation(team):
+    """Return the team's group chat, creating it with the current members if needed"""
+    with transaction.atomic():
+        # The unique constraint on Conversation.team turns a concurrent
+        # create into a fetch of the other request's row
+        conversation, created = Conversation.objects.get_or_create(team=team)
+        if created:
+            conversation.participants.add(*accepted_member_ids(team.id))
+    return conversation
+
+
+def add_member(team_id, user_id):
+    """Add a newly accepted member to the team chat, if the chat exists yet"""
+    conversation_id = Conversation.objects.filter(team_id=team_id).values_list('id', flat=True).first()
+    if conversation_id is not None:
+        Participant.objects.bulk_create(
+            [Participant(conversation_id=conversation_id, user_id=user_id)],
+            ignore_conflicts=True,
+        )
+
+
+def remove_member(team_id, user_id):
+    """Drop a member who is no longer accepted from the team chat"""
+    Participant.objects.filter(conversation__team_id=team_id, user_id=user_id).delete()
+
+
+def sync_team_chats(batch_size=500, dry_run=False):
+    """
+    Diff every team chat against accepted memberships, batch by batch.
+
+    Yields (conversation_id, added_user_ids, removed_user_ids) for each chat
+    that was out of sync.
+    """
+    last_id = 0
+    while True:
+        batch = list(
+            Conversation.objects.filter(team__isnull=False, id__gt=last_id)
+            .order_by('id').values_list('id', 'team_id')[:batch_size]
+        )
+        if not batch:
+            return
+        last_id = batch[-1][0]
+        team_to_conversation = {team_id: conversation_id for conversation_id, team_id in batch}
+
+        expected = {conversation_id: set() for conversation_id, _ in batch}
+        for team_id, user_id in TeamMembership.objects.filter(
+            team_id__in=team_to_conversation, status='accepted'
+        ).values_list('team_id', 'user_id'):
+            expected[team_to_conversation[team_id]].add(user_id)
+
+        actual = {conversation_id: set() for conversation_id, _ in batch}
+        for conversation_id, user_id in Participant.objects.filter(
+            conversation_id__in=expected
+        ).values_list('conversation_id', 'user_id'):
+            actual[conversation_id].add(user_id)
+
+        additions, removals = [], []
+        for conversation_id, members in expected.items():
+            added = members - actual[conversation_id]
+            removed = actual[conversation_id] - members
+            if added or removed:
+                additions.extend(
+                    Participant(conversation_id=conversation_id, user_id=user_id) for user_id in added
+                )
+                removals.extend((conversation_id, user_id) for user_id in removed)
+                yield conversation_id, sorted(added), sorted(removed)
+
+        if dry_run:
+            continue
+        with transaction.atomic():
+            Participant.objects.bulk_create(additions, ignore_conflicts=True)
+            for conversation_id in {c for c, _ in removals}:
+                Participant.objects.filter(
+                    conversation_id=conversation_id,
+                    user_id__in=[u for c, u in removals if c == conversation_id],
+                ).delete()
@@ -1,27 +1,50 @@
 from django.contrib import admin
+from config import facets
+from config.admin import LargeTableAdminMixin
+from config.soft_delete import SoftDeleteAdminMixin
 from .models import Team, TeamMembership, TeamTask
+from .serializers import accepted_member_count
+from .tasks import soft_delete_teams
 
 
 @admin.register(Team)
-class TeamAdmin(admin.ModelAdmin):
-    list_display = ('name', 'category', 'hackathon', 'lead', 'member_count', 'open_positions', 'created_at')
+class TeamAdmin(LargeTableAdminMixin, SoftDeleteAdminMixin, admin.ModelAdmin):
+    list_display = ('name', 'category', 'hackathon', 'lead', 'get_member_count', 'open_positions', 'created_at')
     list_filter = ('category', 'hackathon')
+    list_select_related = ('hackathon', 'lead')
+    autocomplete_fields = ('hackathon', 'lead')
     search_fields = ('name', 'description', 'lead__username')
     ordering = ('-created_at',)
+    soft_delete_func = staticmethod(soft_delete_teams)
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(accepted_members=accepted_member_count())
+    
+    def get_member_count(self, obj):
+        return obj.accepted_members
+    get_member_count.short_description = 'Members'
+    get_member_count.admin_order_field = 'accepted_members'
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        facets.invalidate('teams')
 
 
 @admin.register(TeamMembership)
-class TeamMembershipAdmin(admin.ModelAdmin):
+class TeamMembershipAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('user', 'team', 'role', 'status', 'joined_at')
     list_filter = ('role', 'status')
+    list_select_related = ('user', 'team')
+    autocomplete_fields = ('user', 'team')
     search_fields = ('user__username', 'team__name')
     ordering = ('-joined_at',)
 
 
 @admin.register(TeamTask)
-class TeamTaskAdmin(admin.ModelAdmin):
+class TeamTaskAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'team', 'assigned_to', 'created_by', 'status', 'priority', 'due_date', 'created_at')
-    list_filter = ('status', 'priority', 'team')
+    list_filter = ('status', 'priority')
+    list_select_related = ('team', 'assigned_to', 'created_by')
+    autocomplete_fields = ('team', 'assigned_to', 'created_by')
     search_fields = ('title', 'description', 'team__name')
     ordering = ('-created_at',)
-
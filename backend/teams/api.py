@@ -1,12 +1,28 @@
+import json
+import logging
 from ninja import Router, Schema
 from typing import List, Optional
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from django.db import models as django_models
+from django.conf import settings
+from django.db import models as django_models, transaction
+from django.db.models import F
 from users.api import AuthBearer
+from config import facets
+from config.db_routers import use_replica
+from config.ratelimit import rate_limit
+from config.serializers import trusted_response
 from .models import Team, TeamMembership, TeamTask
+from .serializers import aserialize_teams, member_values, serialize_member, serialize_tasks, serialize_teams
 from users.models import User
+from hackathons import stats as hackathon_stats
+from messages_app import team_chat
+from messages_app.tasks import create_team_chat
+from .tasks import soft_delete_teams
 
-router = Router()
+logger = logging.getLogger(__name__)
+
+router = Router(auth=AuthBearer())
 
 
 # Test endpoint
@@ -19,68 +35,19 @@ def test_endpoint(request):
 @router.post("/test-invite", auth=None)
 def test_invite_endpoint(request):
     """Test POST endpoint"""
-    print("=== TEST INVITE ENDPOINT CALLED ===")
     return {"status": "ok", "message": "POST is working"}
 
 
-@router.get("/myteams", auth=None)
+@router.get("/myteams")
 def get_my_teams_new(request):
     """Get all teams the current user is a member of - NEW VERSION"""
-    import traceback
-    try:
-        print(f"=== GET /myteams called ===")
-        
-        # Check if user is authenticated
-        from users.api import AuthBearer
-        auth_header = request.headers.get('Authorization', '')
-        token = auth_header.replace('Bearer ', '').strip()
-        
-        if not token:
-            print("ERROR: No token provided!")
-            return []
-        
-        auth = AuthBearer()
-        user = auth.authenticate(request, token)
-        
-        if not user:
-            print("ERROR: Authentication failed!")
-            return []
-        
-        print(f"User ID: {user.id}, Username: {user.username}")
-        
-        memberships = TeamMembership.objects.filter(
-            user=user,
-            status='accepted'
-        ).select_related('team__hackathon', 'team__lead')
-        
-        print(f"Found {memberships.count()} memberships")
-        
-        result = []
-        for membership in memberships:
-            team = membership.team
-            team_data = {
-                'id': team.id,
-                'name': team.name,
-                'description': team.description,
-                'category': team.category,
-                'hackathon_name': team.hackathon.name if team.hackathon else 'No Hackathon',
-                'lead_name': team.lead.full_name or team.lead.username,
-                'lead_id': team.lead.id,
-                'role': membership.role,  # Add the user's role in this team
-                'required_skills': team.required_skills,
-                'open_positions': team.open_positions,
-                'member_count': team.member_count,
-                'created_at': team.created_at.isoformat(),
-            }
-            result.append(team_data)
-            print(f"Added team: {team.name}, Role: {membership.role}")
-        
-        print(f"Returning {len(result)} teams")
-        return result
-    except Exception as e:
-        print(f"ERROR in get_my_teams_new: {str(e)}")
-        print(traceback.format_exc())
-        return []
+    teams = Team.objects.filter(
+        memberships__user=request.auth,
+        memberships__status='accepted'
+    )
+    
+    # lead_id and the user's role in each team on top of the TeamSchema fields
+    return serialize_teams(teams, 'lead_id', role=F('memberships__role'))
 
 
 # Schemas
@@ -136,6 +103,12 @@ class TeamInviteSchema(Schema):
     message: Optional[str] = None
 
 
+class TeamBatchInviteSchema(Schema):
+    team_id: int
+    user_ids: Optional[List[int]] = None
+    emails: Optional[List[str]] = None
+
+
 class InviteResponseSchema(Schema):
     id: int
     team_id: int
@@ -181,9 +154,10 @@ class TaskUpdateSchema(Schema):
 
 # Team endpoints
 @router.get("/", response=List[TeamSchema], auth=None)
-def list_teams(request, category: str = "", hackathon_id: int = None, limit: int = 20, offset: int = 0):
+@use_replica
+async def list_teams(request, category: str = "", hackathon_id: int = None, limit: int = 20, offset: int = 0):
     """List all teams with filters"""
-    teams = Team.objects.select_related('hackathon', 'lead').all()
+    teams = Team.objects.all()
     
     if category:
         teams = teams.filter(category=category)
@@ -191,29 +165,15 @@ def list_teams(request, category: str = "", hackathon_id: int = None, limit: int
     if hackathon_id:
         teams = teams.filter(hackathon_id=hackathon_id)
     
-    teams = teams[offset:offset + limit]
-    
-    return [
-        {
-            'id': team.id,
-            'name': team.name,
-            'description': team.description,
-            'category': team.category,
-            'hackathon_name': team.hackathon.name,
-            'lead_name': team.lead.full_name or team.lead.username,
-            'required_skills': team.required_skills,
-            'open_positions': team.open_positions,
-            'member_count': team.member_count,
-            'created_at': team.created_at.isoformat(),
-        }
-        for team in teams
-    ]
+    rows = await aserialize_teams(teams[offset:offset + limit])
+    return trusted_response(router, request, rows)
 
 
 @router.get("/search", response=List[TeamSchema], auth=None)
-def search_teams(request, q: str = "", skills: str = ""):
+@use_replica
+async def search_teams(request, q: str = "", skills: str = ""):
     """Search teams by name or skills"""
-    teams = Team.objects.select_related('hackathon', 'lead').all()
+    teams = Team.objects.all()
     
     if q:
         teams = teams.filter(
@@ -226,158 +186,247 @@ def search_teams(request, q: str = "", skills: str = ""):
         for skill in skill_list:
             teams = teams.filter(required_skills__contains=skill.strip())
     
-    teams = teams[:50]
-    
-    return [
-        {
-            'id': team.id,
-            'name': team.name,
-            'description': team.description,
-            'category': team.category,
-            'hackathon_name': team.hackathon.name,
-            'lead_name': team.lead.full_name or team.lead.username,
-            'required_skills': team.required_skills,
-            'open_positions': team.open_positions,
-            'member_count': team.member_count,
-            'created_at': team.created_at.isoformat(),
+    rows = await aserialize_teams(teams[:50])
+    return trusted_response(router, request, rows)
+
+
+@router.get("/facets", auth=None)
+async def team_facets(request, category: str = "", hackathon_id: int = None, skills: str = ""):
+    """Result counts per category, hackathon and required skill for the current browse filters"""
+    selected_skills = sorted({skill.strip() for skill in skills.split(',') if skill.strip()})
+    filters = {
+        'category': django_models.Q(category=category) if category else django_models.Q(),
+        'hackathon_id': django_models.Q(hackathon_id=hackathon_id) if hackathon_id else django_models.Q(),
+        'required_skills': (
+            django_models.Q(required_skills__contains_all=selected_skills) if selected_skills else django_models.Q()
+        ),
+    }
+
+    async def build():
+        # Read from the primary: the counts outlive a replica's lag once cached
+        teams = Team.objects.all()
+        categories = await facets.acount_by(facets.excluding(teams, filters, 'category'), 'category')
+        hackathons = await facets.acount_by(
+            facets.excluding(teams, filters, 'hackathon_id'), 'hackathon_id',
+            label='hackathon__name', limit=settings.FACET_LIMIT,
+        )
+        # Skills narrow like the skills filter, so every filter applies
+        required_skills = await facets.acount_json_array(teams.filter(*filters.values()), 'required_skills')
+        return {
+            "total": facets.selected_count(categories, category),
+            "facets": {
+                "category": facets.choice_facet(categories, Team.CATEGORY_CHOICES),
+                "hackathon": facets.top_facet(hackathons),
+                "skills": facets.top_facet(required_skills),
+            },
         }
-        for team in teams
-    ]
 
+    return await facets.aget('teams', {
+        'category': category, 'hackathon_id': hackathon_id, 'skills': selected_skills,
+    }, build)
 
-@router.post("/invite", auth=None)
+
+@router.post("/invite")
 def invite_to_team(request):
     """Invite a user to join a team"""
-    from users.api import AuthBearer
     from django.http import JsonResponse
     
-    print("=== INVITE ENDPOINT CALLED ===")
-    print(f"Request method: {request.method}")
-    print(f"Request path: {request.path}")
-    print(f"Content-Type: {request.headers.get('Content-Type')}")
-    
     try:
-        # Get the raw body
-        raw_body = request.body
-        print(f"Raw body: {raw_body}")
-        
-        # Parse request body
-        import json
-        body = json.loads(raw_body)
-        team_id = body.get('team_id')
-        user_id = body.get('user_id')
-        
-        print(f"Parsed data: team_id={team_id}, user_id={user_id}")
-        
-        # Manual authentication
-        auth_header = request.headers.get('Authorization', '')
-        token = auth_header.replace('Bearer ', '').strip()
-        
-        if not token:
-            print("ERROR: No token")
-            return JsonResponse({"error": "Authentication required"}, status=401)
-        
-        auth = AuthBearer()
-        current_user = auth.authenticate(request, token)
-        
-        if not current_user:
-            print("ERROR: Invalid token")
-            return JsonResponse({"error": "Invalid authentication"}, status=401)
-        
-        print(f"Authenticated user: {current_user.username}")
-        
-        team = get_object_or_404(Team, id=team_id)
-        user = get_object_or_404(User, id=user_id)
-        
-        print(f"Team: {team.name}, User to invite: {user.username}")
-        
-        # Check if requester is team lead or member
-        membership = TeamMembership.objects.filter(
-            team=team,
-            user=current_user,
-            status='accepted'
-        ).first()
-        
-        if not membership:
-            print("ERROR: User not a team member")
-            return JsonResponse({"error": "You must be a team member to invite users"}, status=403)
-        
-        print(f"Membership found: {membership.role}")
-        
-        # Check if user already has a membership
-        existing = TeamMembership.objects.filter(
-            team=team,
-            user=user
-        ).first()
-        
-        if existing:
-            print(f"Found existing membership with status: {existing.status}")
-            
-            # If user sent a join request (pending), convert it to an invite
-            if existing.status == 'pending':
-                print("Converting pending join request to invite")
-                existing.status = 'invited'
-                existing.save()
-                print(f"Converted to invite: {existing.id}")
-                return {"success": True, "invite_id": existing.id, "message": "Join request converted to invite"}
-            
-            # If already invited or accepted, return error
-            elif existing.status == 'invited':
-                print("ERROR: User already invited")
-                return JsonResponse({"error": "User has already been invited to this team"}, status=400)
-            elif existing.status == 'accepted':
-                print("ERROR: User already a member")
-                return JsonResponse({"error": "User is already a member of this team"}, status=400)
-            elif existing.status == 'rejected':
-                print("User previously rejected, creating new invite")
-                # Allow re-inviting if previously rejected
-                existing.status = 'invited'
-                existing.save()
-                print(f"Re-invited user: {existing.id}")
-                return {"success": True, "invite_id": existing.id, "message": "User re-invited"}
-        
-        # Create invite
-        invite = TeamMembership.objects.create(
-            team=team,
-            user=user,
-            status='invited',
-            role='member'
-        )
-        
-        print(f"Invite created successfully: {invite.id}")
-        return {"success": True, "invite_id": invite.id}
-        
-    except json.JSONDecodeError as e:
-        print(f"JSON DECODE ERROR: {str(e)}")
+        body = json.loads(request.body)
+    except json.JSONDecodeError:
         return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
-    except Exception as e:
-        print(f"EXCEPTION in invite_to_team: {str(e)}")
-        print(f"Exception type: {type(e).__name__}")
-        import traceback
-        traceback.print_exc()
-        return JsonResponse({"error": f"Internal server error: {str(e)}"}, status=500)
+    team_id = body.get('team_id')
+    user_id = body.get('user_id')
+    
+    current_user = request.auth
+    team = get_object_or_404(Team, id=team_id)
+    user = get_object_or_404(User, id=user_id)
+    
+    if team.open_positions <= 0:
+        return JsonResponse({"error": "Team is full"}, status=400)
+    
+    # Check if requester is team lead or member
+    membership = TeamMembership.objects.filter(
+        team=team,
+        user=current_user,
+        status='accepted'
+    ).first()
+    
+    if not membership:
+        return JsonResponse({"error": "You must be a team member to invite users"}, status=403)
+    
+    # Check if user already has a membership
+    existing = TeamMembership.objects.filter(
+        team=team,
+        user=user
+    ).first()
+    
+    if existing:
+        # If user sent a join request (pending), convert it to an invite
+        if existing.status == 'pending':
+            existing.status = 'invited'
+            existing.save(update_fields=['status'])
+            return {"success": True, "invite_id": existing.id, "message": "Join request converted to invite"}
+        
+        # If already invited or accepted, return error
+        elif existing.status == 'invited':
+            return JsonResponse({"error": "User has already been invited to this team"}, status=400)
+        elif existing.status == 'accepted':
+            return JsonResponse({"error": "User is already a member of this team"}, status=400)
+        elif existing.status == 'rejected':
+            # Allow re-inviting if previously rejected
+            existing.status = 'invited'
+            existing.save(update_fields=['status'])
+            return {"success": True, "invite_id": existing.id, "message": "User re-invited"}
+    
+    # Create invite
+    invite = TeamMembership.objects.create(
+        team=team,
+        user=user,
+        status='invited',
+        role='member'
+    )
+    logger.info('User %s invited user %s to team %s', current_user.id, user.id, team.id)
+    return {"success": True, "invite_id": invite.id}
+
+
+MAX_BATCH_INVITES = 200
+
+
+@router.post("/invite/batch")
+def batch_invite_to_team(request, data: TeamBatchInviteSchema):
+    """Invite many users to a team in one call (only by team lead)"""
+    team = get_object_or_404(Team, id=data.team_id)
 
+    if team.lead_id != request.auth.id:
+        return router.api.create_response(
+            request,
+            {"detail": "Only team lead can batch invite users"},
+            status=403
+        )
+
+    if team.open_positions <= 0:
+        return router.api.create_response(request, {"detail": "Team is full"}, status=400)
+
+    # Drop duplicate entries while keeping request order for the results
+    user_ids = list(dict.fromkeys(data.user_ids or []))
+    emails = list(dict.fromkeys(e.strip() for e in (data.emails or []) if e.strip()))
+
+    if not user_ids and not emails:
+        return router.api.create_response(
+            request,
+            {"detail": "Provide at least one user_id or email"},
+            status=400
+        )
 
-@router.get("/invites", auth=None)
+    if len(user_ids) + len(emails) > MAX_BATCH_INVITES:
+        return router.api.create_response(
+            request,
+            {"detail": f"At most {MAX_BATCH_INVITES} users can be invited per request"},
+            status=400
+        )
+
+    # Resolve ids and emails with a single IN query
+    users = User.objects.filter(
+        django_models.Q(id__in=user_ids) | django_models.Q(email__in=emails)
+    ).only('id', 'email')
+    users_by_id = {u.id: u for u in users}
+    users_by_email = {u.email: u for u in users_by_id.values()}
+
+    targets = [({'user_id': uid}, users_by_id.get(uid)) for uid in user_ids]
+    targets += [({'email': email}, users_by_email.get(email)) for email in emails]
+
+    with transaction.atomic():
+        # Every existing membership for the resolved users, in one query
+        existing = {
+            m.user_id: m
+            for m in TeamMembership.objects.filter(
+                team=team,
+                user_id__in=users_by_id.keys()
+            ).only('id', 'user_id', 'status')
+        }
+
+        results = []
+        seen = set()
+        reinvite_ids = []
+        new_user_ids = []
+
+        for key, user in targets:
+            outcome = dict(key)
+            if user is None:
+                outcome.update(status='not_found', detail="User not found")
+            elif user.id in seen:
+                outcome.update(user_id=user.id, status='duplicate', detail="User listed more than once")
+            else:
+                seen.add(user.id)
+                outcome['user_id'] = user.id
+                membership = existing.get(user.id)
+                if membership is None:
+                    new_user_ids.append(user.id)
+                    outcome['status'] = 'invited'
+                elif membership.status == 'pending':
+                    reinvite_ids.append(membership.id)
+                    outcome.update(status='converted', invite_id=membership.id,
+                                   detail="Join request converted to invite")
+                elif membership.status == 'rejected':
+                    reinvite_ids.append(membership.id)
+                    outcome.update(status='reinvited', invite_id=membership.id,
+                                   detail="User re-invited")
+                elif membership.status == 'invited':
+                    outcome.update(status='already_invited', invite_id=membership.id,
+                                   detail="User has already been invited to this team")
+                else:
+                    outcome.update(status='already_member',
+                                   detail="User is already a member of this team")
+            results.append(outcome)
+
+        if reinvite_ids:
+            TeamMembership.objects.filter(id__in=reinvite_ids).update(status='invited')
+
+        if new_user_ids:
+            TeamMembership.objects.bulk_create(
+                [
+                    TeamMembership(team=team, user_id=uid, status='invited', role='member')
+                    for uid in new_user_ids
+                ],
+                ignore_conflicts=True,
+            )
+            # ignore_conflicts leaves pks unset, so read the invite ids back
+            created = dict(
+                TeamMembership.objects.filter(
+                    team=team,
+                    user_id__in=new_user_ids,
+                    status='invited'
+                ).values_list('user_id', 'id')
+            )
+            for outcome in results:
+                if outcome['status'] != 'invited':
+                    continue
+                invite_id = created.get(outcome['user_id'])
+                if invite_id is None:
+                    # A concurrent request created a different membership first
+                    outcome.update(status='conflict', detail="Membership changed concurrently")
+                else:
+                    outcome['invite_id'] = invite_id
+
+    invited_count = sum(
+        1 for r in results if r['status'] in ('invited', 'converted', 'reinvited')
+    )
+    return {"success": True, "team_id": team.id, "invited_count": invited_count, "results": results}
+
+
+@router.get("/invites")
+@rate_limit('poll')
 def get_my_invites(request):
     """Get all team invites for the current user"""
     from django.utils import timezone
     from datetime import timedelta
-    from users.api import AuthBearer
-    
-    # Manual authentication
-    auth_header = request.headers.get('Authorization', '')
-    token = auth_header.replace('Bearer ', '').strip()
-    if not token:
-        return []
-    auth = AuthBearer()
-    user = auth.authenticate(request, token)
-    if not user:
-        return []
+    user = request.auth
     
     invites = TeamMembership.objects.filter(
         user=user,
-        status='invited'
+        status='invited',
+        team__deleted_at__isnull=True
     ).select_related('team__lead', 'team__hackathon')
     
     def get_time_ago(dt):
@@ -409,29 +458,16 @@ def get_my_invites(request):
             'viewed': invite.viewed,
             'message': f"Join our team for {invite.team.hackathon.name if invite.team.hackathon else 'a hackathon'}!",
             'time_ago': get_time_ago(invite.joined_at),
-            'created_at': invite.joined_at.isoformat(),
+            'created_at': invite.joined_at,
         }
         for invite in invites
     ]
 
 
-@router.post("/invites/mark-viewed", auth=None)
+@router.post("/invites/mark-viewed")
 def mark_invites_as_viewed(request):
     """Mark all invites as viewed for the current user"""
-    from users.api import AuthBearer
-    
-    # Manual authentication
-    auth_header = request.headers.get('Authorization', '')
-    token = auth_header.replace('Bearer ', '').strip()
-    
-    if not token:
-        return {"error": "Authentication required"}, 401
-    
-    auth = AuthBearer()
-    user = auth.authenticate(request, token)
-    
-    if not user:
-        return {"error": "Invalid authentication"}, 401
+    user = request.auth
     
     # Mark all invited memberships as viewed
     updated_count = TeamMembership.objects.filter(
@@ -443,26 +479,17 @@ def mark_invites_as_viewed(request):
     return {"success": True, "updated_count": updated_count}
 
 
-@router.get("/join-requests", auth=None)
+@router.get("/join-requests")
 def get_my_join_requests(request):
     """Get all join requests sent by the current user"""
     from django.utils import timezone
     from datetime import timedelta
-    from users.api import AuthBearer
-    
-    # Manual authentication
-    auth_header = request.headers.get('Authorization', '')
-    token = auth_header.replace('Bearer ', '').strip()
-    if not token:
-        return []
-    auth = AuthBearer()
-    user = auth.authenticate(request, token)
-    if not user:
-        return []
+    user = request.auth
     
     requests_qs = TeamMembership.objects.filter(
         user=user,
-        status__in=['pending', 'accepted', 'rejected']
+        status__in=['pending', 'accepted', 'rejected'],
+        team__deleted_at__isnull=True
     ).select_related('team').exclude(role='leader')
     
     def get_time_ago(dt):
@@ -491,141 +518,67 @@ def get_my_join_requests(request):
             'status': req.status,
             'message': f"I'd like to join your team!",
             'time_ago': get_time_ago(req.joined_at),
-            'created_at': req.joined_at.isoformat(),
+            'created_at': req.joined_at,
         }
         for req in requests_qs
     ]
 
 
-@router.post("/accept-invite/{invite_id}", auth=None)
+@router.post("/accept-invite/{invite_id}")
 def accept_invite(request, invite_id: int):
     """Accept a team invite"""
-    from users.api import AuthBearer
-    auth_header = request.headers.get('Authorization', '')
-    token = auth_header.replace('Bearer ', '').strip()
-    if not token:
-        return {"error": "Authentication required"}, 401
-    auth = AuthBearer()
-    user = auth.authenticate(request, token)
-    if not user:
-        return {"error": "Invalid authentication"}, 401
-    
-    invite = get_object_or_404(TeamMembership, id=invite_id, user=user, status='invited')
-    invite.status = 'accepted'
-    invite.save()
+    user = request.auth
+    invite = get_object_or_404(TeamMembership.objects.select_related('team'), id=invite_id, user=user, status='invited')
+    with transaction.atomic():
+        outcome = invite.accept()
+        if outcome == 'accepted':
+            team_chat.add_member(invite.team_id, user.id)
+            hackathon_stats.mark_stale([invite.team.hackathon_id])
+    if outcome == 'full':
+        return router.api.create_response(request, {"detail": "Team is full"}, status=409)
+    if outcome == 'stale':
+        return router.api.create_response(request, {"detail": "Invite is no longer open"}, status=409)
     return {"success": True}
 
 
-@router.post("/reject-invite/{invite_id}", auth=None)
+@router.post("/reject-invite/{invite_id}")
 def reject_invite(request, invite_id: int):
     """Reject a team invite"""
-    from users.api import AuthBearer
-    auth_header = request.headers.get('Authorization', '')
-    token = auth_header.replace('Bearer ', '').strip()
-    if not token:
-        return {"error": "Authentication required"}, 401
-    auth = AuthBearer()
-    user = auth.authenticate(request, token)
-    if not user:
-        return {"error": "Invalid authentication"}, 401
-    
+    user = request.auth
     invite = get_object_or_404(TeamMembership, id=invite_id, user=user, status='invited')
-    invite.status = 'rejected'
-    invite.save()
+    with transaction.atomic():
+        invite.status = 'rejected'
+        invite.save(update_fields=['status'])
+        team_chat.remove_member(invite.team_id, user.id)
     return {"success": True}
 
 
 # ==================== TEAM TASKS ENDPOINTS ====================
 
-@router.get("/{team_id}/tasks", auth=None)
+@router.get("/{team_id}/tasks")
 def get_team_tasks(request, team_id: int):
     """Get all tasks for a team"""
-    import traceback
-    try:
-        print(f"=== GET /teams/{team_id}/tasks called ===")
-        from users.api import AuthBearer
-        
-        # Manual authentication
-        auth_header = request.headers.get('Authorization', '')
-        token = auth_header.replace('Bearer ', '').strip()
-        if not token:
-            print("ERROR: No token")
-            return []
-        
-        auth = AuthBearer()
-        user = auth.authenticate(request, token)
-        if not user:
-            print("ERROR: Invalid token")
-            return []
-        
-        print(f"User: {user.id} - {user.username}")
-        
-        team = get_object_or_404(Team, id=team_id)
-        print(f"Team: {team.id} - {team.name}")
-        
-        # Verify user is a member of the team
-        membership = TeamMembership.objects.filter(
-            team=team,
-            user=user,
-            status='accepted'
-        ).first()
-        
-        print(f"Membership: {membership}")
-        print(f"Team lead: {team.lead.id}")
-        
-        if not membership and team.lead != user:
-            print("ERROR: User not a member")
-            return []
-        
-        tasks = TeamTask.objects.filter(team=team).select_related('assigned_to', 'created_by')
-        print(f"Found {tasks.count()} tasks")
-        
-        result = []
-        for task in tasks:
-            try:
-                task_dict = {
-                    'id': task.id,
-                    'title': task.title,
-                    'description': task.description,
-                    'status': task.status,
-                    'priority': task.priority,
-                    'color': task.color,
-                    'assigned_to_id': task.assigned_to.id if task.assigned_to else None,
-                    'assigned_to_name': task.assigned_to.full_name or task.assigned_to.username if task.assigned_to else None,
-                    'created_by_id': task.created_by.id,
-                    'created_by_name': task.created_by.full_name or task.created_by.username,
-                    'due_date': task.due_date.isoformat() if task.due_date else None,
-                    'created_at': task.created_at.isoformat(),
-                    'updated_at': task.updated_at.isoformat(),
-                }
-                result.append(task_dict)
-            except Exception as task_error:
-                print(f"Error processing task {task.id}: {str(task_error)}")
-                print(traceback.format_exc())
-        
-        print(f"Returning {len(result)} tasks")
-        return result
-    except Exception as e:
-        print(f"ERROR in get_team_tasks: {str(e)}")
-        print(traceback.format_exc())
+    user = request.auth
+    team = get_object_or_404(Team, id=team_id)
+    
+    # Verify user is a member of the team
+    membership = TeamMembership.objects.filter(
+        team=team,
+        user=user,
+        status='accepted'
+    ).first()
+    
+    if not membership and team.lead_id != user.id:
         return []
+    
+    return serialize_tasks(TeamTask.objects.filter(team=team))
 
 
-@router.post("/{team_id}/tasks", auth=None)
+@router.post("/{team_id}/tasks")
 def create_team_task(request, team_id: int, data: TaskCreateSchema):
     """Create a new task for a team"""
-    from users.api import AuthBearer
     from datetime import datetime
-    
-    # Manual authentication
-    auth_header = request.headers.get('Authorization', '')
-    token = auth_header.replace('Bearer ', '').strip()
-    if not token:
-        return {"error": "Authentication required"}, 401
-    auth = AuthBearer()
-    user = auth.authenticate(request, token)
-    if not user:
-        return {"error": "Invalid authentication"}, 401
+    user = request.auth
     
     team = get_object_or_404(Team, id=team_id)
     
@@ -669,38 +622,14 @@ def create_team_task(request, team_id: int, data: TaskCreateSchema):
         due_date=due_date,
     )
     
-    return {
-        'id': task.id,
-        'title': task.title,
-        'description': task.description,
-        'status': task.status,
-        'priority': task.priority,
-        'color': task.color,
-        'assigned_to_id': task.assigned_to.id if task.assigned_to else None,
-        'assigned_to_name': task.assigned_to.full_name or task.assigned_to.username if task.assigned_to else None,
-        'created_by_id': task.created_by.id,
-        'created_by_name': task.created_by.full_name or task.created_by.username,
-        'due_date': task.due_date.isoformat() if task.due_date else None,
-        'created_at': task.created_at.isoformat(),
-        'updated_at': task.updated_at.isoformat(),
-    }
+    return serialize_tasks(TeamTask.objects.filter(id=task.id))[0]
 
 
-@router.put("/{team_id}/tasks/{task_id}", auth=None)
+@router.put("/{team_id}/tasks/{task_id}")
 def update_team_task(request, team_id: int, task_id: int, data: TaskUpdateSchema):
     """Update a team task"""
-    from users.api import AuthBearer
     from datetime import datetime
-    
-    # Manual authentication
-    auth_header = request.headers.get('Authorization', '')
-    token = auth_header.replace('Bearer ', '').strip()
-    if not token:
-        return {"error": "Authentication required"}, 401
-    auth = AuthBearer()
-    user = auth.authenticate(request, token)
-    if not user:
-        return {"error": "Invalid authentication"}, 401
+    user = request.auth
     
     team = get_object_or_404(Team, id=team_id)
     task = get_object_or_404(TeamTask, id=task_id, team=team)
@@ -747,37 +676,13 @@ def update_team_task(request, team_id: int, task_id: int, data: TaskUpdateSchema
     
     task.save()
     
-    return {
-        'id': task.id,
-        'title': task.title,
-        'description': task.description,
-        'status': task.status,
-        'priority': task.priority,
-        'color': task.color,
-        'assigned_to_id': task.assigned_to.id if task.assigned_to else None,
-        'assigned_to_name': task.assigned_to.full_name or task.assigned_to.username if task.assigned_to else None,
-        'created_by_id': task.created_by.id,
-        'created_by_name': task.created_by.full_name or task.created_by.username,
-        'due_date': task.due_date.isoformat() if task.due_date else None,
-        'created_at': task.created_at.isoformat(),
-        'updated_at': task.updated_at.isoformat(),
-    }
+    return serialize_tasks(TeamTask.objects.filter(id=task.id))[0]
 
 
-@router.delete("/{team_id}/tasks/{task_id}", auth=None)
+@router.delete("/{team_id}/tasks/{task_id}")
 def delete_team_task(request, team_id: int, task_id: int):
     """Delete a team task"""
-    from users.api import AuthBearer
-    
-    # Manual authentication
-    auth_header = request.headers.get('Authorization', '')
-    token = auth_header.replace('Bearer ', '').strip()
-    if not token:
-        return {"error": "Authentication required"}, 401
-    auth = AuthBearer()
-    user = auth.authenticate(request, token)
-    if not user:
-        return {"error": "Invalid authentication"}, 401
+    user = request.auth
     
     team = get_object_or_404(Team, id=team_id)
     task = get_object_or_404(TeamTask, id=task_id, team=team)
@@ -791,118 +696,85 @@ def delete_team_task(request, team_id: int, task_id: int):
 
 
 @router.get("/{team_id}", response=TeamDetailSchema, auth=None)
-def get_team(request, team_id: int):
+async def get_team(request, team_id: int):
     """Get team details with members"""
-    team = get_object_or_404(
-        Team.objects.select_related('hackathon', 'lead').prefetch_related('memberships__user'),
-        id=team_id
-    )
-    
-    members = [
-        {
-            'id': m.user.id,
-            'username': m.user.username,
-            'full_name': m.user.full_name or m.user.username,
-            'role': m.role,
-            'status': m.status,
-        }
-        for m in team.memberships.filter(status='accepted')
+    rows = await aserialize_teams(Team.objects.filter(id=team_id), 'lead_id')
+    if not rows:
+        raise Http404("No Team matches the given query.")
+    
+    team = rows[0]
+    team['members'] = [
+        serialize_member(m) async for m in member_values(
+            TeamMembership.objects.filter(team_id=team_id, status='accepted', user__deleted_at__isnull=True)
+        )
     ]
-    
-    return {
-        'id': team.id,
-        'name': team.name,
-        'description': team.description,
-        'category': team.category,
-        'hackathon_name': team.hackathon.name,
-        'lead_id': team.lead.id,
-        'lead_name': team.lead.full_name or team.lead.username,
-        'required_skills': team.required_skills,
-        'open_positions': team.open_positions,
-        'member_count': team.member_count,
-        'created_at': team.created_at.isoformat(),
-        'members': members,
-    }
+    return trusted_response(router, request, team)
 
 
-@router.post("/", response=TeamSchema, auth=AuthBearer())
+@router.post("/", response=TeamSchema)
 def create_team(request, data: TeamCreateSchema):
     """Create a new team"""
     from hackathons.models import Hackathon
-    import traceback
     
-    try:
-        # Get or create a default hackathon for teams without specific hackathon
-        hackathon = None
-        if data.hackathon:
-            # Try to find hackathon by name
-            hackathon = Hackathon.objects.filter(name__icontains=data.hackathon).first()
-    
-        # If no hackathon specified or not found, use/create a default one
-        if not hackathon:
-            from django.utils import timezone
-            hackathon, _ = Hackathon.objects.get_or_create(
-                name="General Teams",
-                defaults={
-                    'description': 'Teams not associated with a specific hackathon',
-                    'category': 'other',
-                    'mode': 'remote',
-                    'status': 'registration_open',
-                    'start_date': timezone.now(),
-                    'end_date': timezone.now() + timezone.timedelta(days=365),
-                    'location': 'Online',
-                    'prize': '',
-                    'max_participants': 10000,
-                    'website_url': '',
-                    'registration_url': ''
-                }
-            )
-        
-        max_members = int(data.maxMembers) if data.maxMembers else 4
-        
-        team = Team.objects.create(
-            name=data.name,
-            description=data.description,
-            category='other',
-            hackathon=hackathon,
-            lead=request.auth,
-            required_skills=data.lookingFor or [],
-            open_positions=max_members - 1,  # Subtract 1 for the leader
-        )
-        
-        # Add leader as a member
-        TeamMembership.objects.create(
-            team=team,
-            user=request.auth,
-            role='leader',
-            status='accepted'
+    # Get or create a default hackathon for teams without specific hackathon
+    hackathon = None
+    if data.hackathon:
+        # Try to find hackathon by name
+        hackathon = Hackathon.objects.filter(name__icontains=data.hackathon).first()
+    
+    # If no hackathon specified or not found, use/create a default one
+    if not hackathon:
+        from django.utils import timezone
+        hackathon, _ = Hackathon.objects.get_or_create(
+            name="General Teams",
+            defaults={
+                'description': 'Teams not associated with a specific hackathon',
+                'category': 'other',
+                'mode': 'remote',
+                'status': 'registration_open',
+                'start_date': timezone.now(),
+                'end_date': timezone.now() + timezone.timedelta(days=365),
+                'location': 'Online',
+                'prize': '',
+                'max_participants': 10000,
+                'website_url': '',
+                'registration_url': ''
+            }
         )
-        
-        return {
-            'id': team.id,
-            'name': team.name,
-            'description': team.description,
-            'category': team.category,
-            'hackathon_name': team.hackathon.name,
-            'lead_name': team.lead.full_name or team.lead.username,
-            'required_skills': team.required_skills,
-            'open_positions': team.open_positions,
-            'member_count': team.member_count,
-            'created_at': team.created_at.isoformat(),
-        }
-    except Exception as e:
-        print(f"Error creating team: {str(e)}")
-        print(traceback.format_exc())
-        raise
+    
+    max_members = int(data.maxMembers) if data.maxMembers else 4
+    
+    team = Team.objects.create(
+        name=data.name,
+        description=data.description,
+        category='other',
+        hackathon=hackathon,
+        lead=request.auth,
+        required_skills=data.lookingFor or [],
+        open_positions=max_members - 1,  # Subtract 1 for the leader
+    )
+    
+    # Add leader as a member
+    TeamMembership.objects.create(
+        team=team,
+        user=request.auth,
+        role='leader',
+        status='accepted'
+    )
+    create_team_chat.enqueue(team_id=team.id)
+    hackathon_stats.mark_stale([hackathon.id])
+    facets.invalidate('hackathons', 'teams')
+    
+    return trusted_response(router, request, serialize_teams(Team.objects.filter(id=team.id))[0])
 
 
-@router.put("/{team_id}", response=TeamSchema, auth=AuthBearer())
+@router.put("/{team_id}", response=TeamSchema)
 def update_team(request, team_id: int, data: TeamUpdateSchema):
     """Update team (only by team lead)"""
     team = get_object_or_404(Team, id=team_id)
     
     if team.lead != request.auth:
-        return router.create_response(
+        return router.api.create_response(
             request,
             {"detail": "Only team lead can update team"},
             status=403
@@ -912,38 +784,31 @@ def update_team(request, team_id: int, data: TeamUpdateSchema):
         setattr(team, attr, value)
     
     team.save()
+    facets.invalidate('teams')
+    if data.open_positions is not None:
+        hackathon_stats.mark_stale([team.hackathon_id])
     
-    return {
-        'id': team.id,
-        'name': team.name,
-        'description': team.description,
-        'category': team.category,
-        'hackathon_name': team.hackathon.name,
-        'lead_name': team.lead.full_name or team.lead.username,
-        'required_skills': team.required_skills,
-        'open_positions': team.open_positions,
-        'member_count': team.member_count,
-        'created_at': team.created_at.isoformat(),
-    }
+    return trusted_response(router, request, serialize_teams(Team.objects.filter(id=team.id))[0])
 
 
-@router.delete("/{team_id}", auth=AuthBearer())
+@router.delete("/{team_id}")
 def delete_team(request, team_id: int):
     """Delete team (only by team lead)"""
     team = get_object_or_404(Team, id=team_id)
     
     if team.lead != request.auth:
-        return router.create_response(
+        return router.api.create_response(
             request,
             {"detail": "Only team lead can delete team"},
             status=403
         )
     
-    team.delete()
+    # Hidden right away; memberships, tasks and the team chat are purged in the background
+    soft_delete_teams([team.id])
     return {"success": True}
 
 
-@router.post("/apply", auth=AuthBearer())
+@router.post("/apply")
 def apply_to_team(request, data: ApplicationSchema):
     """Apply to join a team"""
     team = get_object_or_404(Team, id=data.team_id)
@@ -955,12 +820,15 @@ def apply_to_team(request, data: ApplicationSchema):
     ).first()
     
     if existing:
-        return router.create_response(
+        return router.api.create_response(
             request,
             {"detail": "You have already applied to this team"},
             status=400
         )
     
+    if team.open_positions <= 0:
+        return router.api.create_response(request, {"detail": "Team is full"}, status=400)
+    
     membership = TeamMembership.objects.create(
         team=team,
         user=request.auth,
@@ -970,13 +838,13 @@ def apply_to_team(request, data: ApplicationSchema):
     return {"success": True, "status": "pending"}
 
 
-@router.post("/{team_id}/accept/{user_id}", auth=AuthBearer())
+@router.post("/{team_id}/accept/{user_id}")
 def accept_member(request, team_id: int, user_id: int):
     """Accept a team member application (only by team lead)"""
     team = get_object_or_404(Team, id=team_id)
     
     if team.lead != request.auth:
-        return router.create_response(
+        return router.api.create_response(
             request,
             {"detail": "Only team lead can accept members"},
             status=403
@@ -989,19 +857,26 @@ def accept_member(request, team_id: int, user_id: int):
         status='pending'
     )
     
-    membership.status = 'accepted'
-    membership.save()
+    with transaction.atomic():
+        outcome = membership.accept()
+        if outcome == 'accepted':
+            team_chat.add_member(team.id, membership.user_id)
+            hackathon_stats.mark_stale([team.hackathon_id])
+    if outcome == 'full':
+        return router.api.create_response(request, {"detail": "Team is full"}, status=409)
+    if outcome == 'stale':
+        return router.api.create_response(request, {"detail": "Application is no longer pending"}, status=409)
     
     return {"success": True}
 
 
-@router.post("/{team_id}/reject/{user_id}", auth=AuthBearer())
+@router.post("/{team_id}/reject/{user_id}")
 def reject_member(request, team_id: int, user_id: int):
     """Reject a team member application (only by team lead)"""
     team = get_object_or_404(Team, id=team_id)
     
     if team.lead != request.auth:
-        return router.create_response(
+        return router.api.create_response(
             request,
             {"detail": "Only team lead can reject members"},
             status=403
@@ -1014,8 +889,10 @@ def reject_member(request, team_id: int, user_id: int):
         status='pending'
     )
     
-    membership.status = 'rejected'
-    membership.save()
+    with transaction.atomic():
+        membership.status = 'rejected'
+        membership.save(update_fields=['status'])
+        team_chat.remove_member(team.id, membership.user_id)
     
     return {"success": True}
 
@@ -1023,83 +900,23 @@ def reject_member(request, team_id: int, user_id: int):
 @router.get("/my-teams")
 def get_my_teams(request):
     """Get all teams the current user is a member of"""
-    import traceback
-    try:
-        print(f"=== GET /my-teams called ===")
-        print(f"Request auth: {request.auth}")
-        
-        # Check if user is authenticated
-        from users.api import AuthBearer
-        auth = AuthBearer()
-        user = auth.authenticate(request, request.headers.get('Authorization', '').replace('Bearer ', ''))
-        
-        if not user:
-            print("ERROR: No authenticated user!")
-            return {"error": "Authentication required"}, 401
-        
-        print(f"User ID: {user.id}")
-        
-        memberships = TeamMembership.objects.filter(
-            user=user,
-            status='accepted'
-        ).select_related('team__hackathon', 'team__lead')
-        
-        print(f"Found {memberships.count()} memberships")
-        
-        teams = [m.team for m in memberships]
-        
-        result = []
-        for team in teams:
-            team_data = {
-                'id': team.id,
-                'name': team.name,
-                'description': team.description,
-                'category': team.category,
-                'hackathon_name': team.hackathon.name if team.hackathon else 'No Hackathon',
-                'lead_name': team.lead.full_name or team.lead.username,
-                'required_skills': team.required_skills,
-                'open_positions': team.open_positions,
-                'member_count': team.member_count,
-                'created_at': team.created_at.isoformat(),
-            }
-            result.append(team_data)
-            print(f"Added team: {team.name}")
-        
-        print(f"Returning {len(result)} teams")
-        return result
-    except Exception as e:
-        print(f"ERROR in get_my_teams: {str(e)}")
-        print(traceback.format_exc())
-        return {"error": str(e)}, 500
-        raise
+    return serialize_teams(Team.objects.filter(
+        memberships__user=request.auth,
+        memberships__status='accepted'
+    ))
 
 
-@router.post("/request-join/{user_id}", auth=None)
+@router.post("/request-join/{user_id}")
 def request_to_join_team(request, user_id: int):
     """Request to join a user's team"""
-    from users.api import AuthBearer
-    
-    # Manual authentication
-    auth_header = request.headers.get('Authorization', '')
-    token = auth_header.replace('Bearer ', '').strip()
-    if not token:
-        return router.create_response(request, {"detail": "Authentication required"}, status=401)
-    
-    try:
-        auth_bearer = AuthBearer()
-        user = auth_bearer.authenticate(request, token)
-        if not user:
-            return router.create_response(request, {"detail": "Invalid token"}, status=401)
-    except Exception as e:
-        return router.create_response(request, {"detail": str(e)}, status=401)
-    
+    user = request.auth
     target_user = get_object_or_404(User, id=user_id)
     
     # Find teams where target_user is the leader
     teams = Team.objects.filter(lead=target_user)
     
     if not teams.exists():
-        return router.create_response(
+        return router.api.create_response(
             request,
             {"detail": "User does not lead any teams"},
             status=404
@@ -1115,12 +932,15 @@ def request_to_join_team(request, user_id: int):
     ).first()
     
     if existing:
-        return router.create_response(
+        return router.api.create_response(
             request,
             {"detail": "You already have a relationship with this team"},
             status=400
         )
     
+    if team.open_positions <= 0:
+        return router.api.create_response(request, {"detail": "Team is full"}, status=400)
+    
     # Create join request
     membership = TeamMembership.objects.create(
         team=team,
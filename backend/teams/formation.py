@@ -0,0 +1,296 @@
+"""
+Batch team formation for a hackathon's solo registrants.
+
+Registrants who are not on, invited to or applying to any of the hackathon's
+teams are first matched to existing teams with free slots by the required
+skills they would cover, then the rest are grouped into new teams covering as
+many distinct skills as possible. Scoring works on boolean user x skill and
+team x skill matrices: a greedy pass gives every open team its best remaining
+candidate per round, then a local search swaps members between teams while
+that raises total coverage.
+"""
+import math
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from config import facets
+from hackathons.models import HackathonRegistration
+from .models import Team, TeamMembership
+
+# Candidates kept per team and round; the rest of a round's conflicts wait
+# for the next round
+CANDIDATES_PER_TEAM = 8
+# Teams scored per matrix product, bounding the users x teams gain matrix
+TEAM_BLOCK = 512
+SWAP_BATCH = 4096
+
+
+def normalize_skills(skills):
+    if not isinstance(skills, list):
+        return set()
+    return {str(skill).strip().lower() for skill in skills if str(skill).strip()}
+
+
+def load_pool(hackathon):
+    """Solo registrants and open teams of ``hackathon`` with their skill sets"""
+    engaged = TeamMembership.objects.filter(
+        team__hackathon=hackathon,
+        team__deleted_at__isnull=True,
+    ).exclude(status='rejected').values('user_id')
+    registrants = list(
+        HackathonRegistration.objects.filter(hackathon=hackathon, user__deleted_at__isnull=True)
+        .exclude(user_id__in=engaged)
+        .order_by('user_id')
+        .values_list('user_id', 'user__skills')
+    )
+
+    teams = list(
+        Team.objects.filter(hackathon=hackathon, open_positions__gt=0)
+        .only('id', 'open_positions', 'required_skills')
+        .order_by('id')
+    )
+    covered = {team.id: set() for team in teams}
+    for team_id, skills in TeamMembership.objects.filter(
+        team_id__in=covered, status='accepted'
+    ).values_list('team_id', 'user__skills'):
+        covered[team_id] |= normalize_skills(skills)
+
+    return {
+        'user_ids': [user_id for user_id, _ in registrants],
+        'user_skills': [normalize_skills(skills) for _, skills in registrants],
+        'team_ids': [team.id for team in teams],
+        'team_needs': [normalize_skills(team.required_skills) - covered[team.id] for team in teams],
+        'team_free': [team.open_positions for team in teams],
+    }
+
+
+def _matrix(skill_sets, vocab):
+    matrix = np.zeros((len(skill_sets), len(vocab)), dtype=bool)
+    for row, skills in enumerate(skill_sets):
+        matrix[row, [vocab[skill] for skill in skills]] = True
+    return matrix
+
+
+def _coverage(C, W):
+    return int(((C > 0) & W).sum())
+
+
+def _greedy(U, W, C, cap, team_of, teams, min_gain, rng):
+    """Give each open team in ``teams`` one new member per round, best gains first"""
+    Uf = U.astype(np.float32)
+    while True:
+        open_teams = teams[cap[teams] > 0]
+        free_users = np.flatnonzero(team_of < 0)
+        if not len(open_teams) or not len(free_users):
+            return
+        k = min(CANDIDATES_PER_TEAM, len(free_users))
+        candidates = Uf[free_users]
+        spread = np.arange(len(free_users), dtype=np.float32) / len(free_users)
+        pairs = []
+        for start in range(0, len(open_teams), TEAM_BLOCK):
+            block = open_teams[start:start + TEAM_BLOCK]
+            need = (W[block] & (C[block] == 0)).astype(np.float32)
+            gain = need @ candidates.T
+            # Gains are whole skill counts; break ties with a per-team rotation
+            # of the users so tied teams don't all compete for the same ones
+            tie = spread + rng.random(len(block), dtype=np.float32)[:, None]
+            np.subtract(tie, 1, out=tie, where=tie >= 1)
+            gain += 0.5 * tie
+            if k < len(free_users):
+                top = np.argpartition(gain, -k, axis=1)[:, -k:]
+            else:
+                top = np.broadcast_to(np.arange(k), gain.shape)
+            top_gain = np.take_along_axis(gain, top, axis=1)
+            for row, team in enumerate(block.tolist()):
+                pairs.extend(zip(top_gain[row].tolist(), [team] * k, free_users[top[row]].tolist()))
+
+        pairs.sort(key=lambda pair: -pair[0])
+        filled, taken = set(), set()
+        for gain, team, user in pairs:
+            if gain < min_gain:
+                break
+            if team in filled or user in taken:
+                continue
+            filled.add(team)
+            taken.add(user)
+            team_of[user] = team
+            C[team] += U[user]
+            cap[team] -= 1
+        if not filled:
+            return
+
+
+def _local_search(U, W, C, team_of, seconds, rng):
+    """Swap members between teams while total coverage improves"""
+    placed = np.flatnonzero(team_of >= 0)
+    if len(placed) < 2:
+        return
+    Ui = U.astype(np.int32)
+    deadline = time.perf_counter() + seconds
+    stale = 0
+    while stale < 20 and time.perf_counter() < deadline:
+        a = rng.choice(placed, SWAP_BATCH)
+        b = rng.choice(placed, SWAP_BATCH)
+        ta, tb = team_of[a], team_of[b]
+        keep = ta != tb
+        a, b, ta, tb = a[keep], b[keep], ta[keep], tb[keep]
+        moved = Ui[b] - Ui[a]
+        CA, CB = C[ta], C[tb]
+        WA, WB = W[ta], W[tb]
+        delta = (
+            (((CA + moved) > 0) & WA).sum(1) + (((CB - moved) > 0) & WB).sum(1)
+            - ((CA > 0) & WA).sum(1) - ((CB > 0) & WB).sum(1)
+        )
+        improving = np.flatnonzero(delta > 0)
+        if not len(improving):
+            stale += 1
+            continue
+        stale = 0
+        # Deltas go stale once a team changes, so touch each team once per batch
+        touched = set()
+        for i in improving[np.argsort(-delta[improving], kind='stable')]:
+            if ta[i] in touched or tb[i] in touched:
+                continue
+            touched.update((ta[i], tb[i]))
+            C[ta[i]] += moved[i]
+            C[tb[i]] -= moved[i]
+            team_of[a[i]], team_of[b[i]] = tb[i], ta[i]
+
+
+def solve(user_skills, team_needs, team_free, team_size=4, search_seconds=1.0, seed=0):
+    """
+    Place users (skill sets) on existing teams (needed skills, free slots) or new teams.
+
+    Returns ``(placement, groups, stats)``: ``placement[i]`` is the index of the
+    existing team user ``i`` joins or -1, ``groups`` lists the user indexes of
+    each new team and ``stats`` holds the coverage after each phase.
+    """
+    vocab = {skill: i for i, skill in enumerate(sorted(set().union(*user_skills, *team_needs)))}
+    U = _matrix(user_skills, vocab)
+    n_users, n_existing = len(user_skills), len(team_needs)
+
+    # Only users who cover a needed skill join existing teams; the rest are
+    # left for new teams
+    W = _matrix(team_needs, vocab)
+    C = np.zeros(W.shape, dtype=np.int32)
+    cap = np.asarray(team_free, dtype=np.int32).reshape(-1)
+    team_of = np.full(n_users, -1, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    _greedy(U, W, C, cap, team_of, np.arange(n_existing), min_gain=1, rng=rng)
+
+    # New teams want every skill; sizes differ by at most one and no team is
+    # left with a single member
+    leftover = int((team_of < 0).sum())
+    n_new = min(math.ceil(leftover / team_size), leftover // 2)
+    if n_new:
+        sizes = [leftover // n_new + (1 if i < leftover % n_new else 0) for i in range(n_new)]
+        W = np.vstack([W, np.ones((n_new, len(vocab)), dtype=bool)])
+        C = np.vstack([C, np.zeros((n_new, len(vocab)), dtype=np.int32)])
+        cap = np.concatenate([cap, np.asarray(sizes, dtype=np.int32)])
+        new = np.arange(n_existing, n_existing + n_new)
+        # Seed each new team with one of the most skilled remaining users
+        free_users = np.flatnonzero(team_of < 0)
+        seeds = free_users[np.argsort(-U[free_users].sum(1), kind='stable')[:n_new]]
+        team_of[seeds] = new
+        C[new] += U[seeds]
+        cap[new] -= 1
+        _greedy(U, W, C, cap, team_of, new, min_gain=0, rng=rng)
+    greedy_coverage = _coverage(C, W)
+
+    _local_search(U, W, C, team_of, search_seconds, rng)
+
+    placement = np.where(team_of < n_existing, team_of, -1)
+    groups = [[] for _ in range(n_new)]
+    for user in np.flatnonzero(team_of >= n_existing):
+        groups[team_of[user] - n_existing].append(int(user))
+    stats = {
+        'greedy_coverage': greedy_coverage,
+        'final_coverage': _coverage(C, W),
+        'skills': len(vocab),
+    }
+    return placement.tolist(), groups, stats
+
+
+def form_teams(hackathon, team_size=4, search_seconds=None, dry_run=False, seed=0):
+    """
+    Match ``hackathon``'s solo registrants to teams and return a report.
+
+    Matched registrants are invited to existing teams. Each new team is led by
+    its most skilled member, who is added as an accepted leader; the others are
+    invited. With ``dry_run`` nothing is written and new teams have no id.
+    """
+    from hackathons import stats as hackathon_stats
+    from messages_app.tasks import create_team_chat
+
+    if search_seconds is None:
+        search_seconds = settings.TEAM_FORMATION_SEARCH_SECONDS
+    started = time.perf_counter()
+    pool = load_pool(hackathon)
+    user_ids, user_skills = pool['user_ids'], pool['user_skills']
+    placement, groups, stats = solve(
+        user_skills, pool['team_needs'], pool['team_free'],
+        team_size=team_size, search_seconds=search_seconds, seed=seed,
+    )
+
+    joined = {}
+    for user, team in enumerate(placement):
+        if team >= 0:
+            joined.setdefault(pool['team_ids'][team], []).append(user_ids[user])
+    formed = []
+    for group in groups:
+        lead = max(group, key=lambda user: (len(user_skills[user]), -user_ids[user]))
+        formed.append({
+            'team_id': None,
+            'lead_id': user_ids[lead],
+            'user_ids': [user_ids[user] for user in group],
+            'skills': sorted(set().union(*(user_skills[user] for user in group))),
+        })
+
+    if not dry_run:
+        with transaction.atomic():
+            numbered = Team.all_objects.filter(hackathon=hackathon).count()
+            teams = Team.objects.bulk_create([
+                Team(
+                    name=f'{hackathon.name} Team {number}',
+                    description='Formed by team matching',
+                    category=hackathon.category,
+                    hackathon=hackathon,
+                    lead_id=team['lead_id'],
+                    required_skills=[],
+                    open_positions=max(team_size, len(team['user_ids'])) - 1,
+                )
+                for number, team in enumerate(formed, start=numbered + 1)
+            ])
+            memberships = [
+                TeamMembership(team_id=team_id, user_id=user_id, status='invited', role='member')
+                for team_id, members in joined.items()
+                for user_id in members
+            ]
+            for team, plan in zip(teams, formed):
+                plan['team_id'] = team.id
+                memberships += [
+                    TeamMembership(team=team, user_id=user_id, status='accepted', role='leader')
+                    if user_id == plan['lead_id'] else
+                    TeamMembership(team=team, user_id=user_id, status='invited', role='member')
+                    for user_id in plan['user_ids']
+                ]
+            TeamMembership.objects.bulk_create(memberships, ignore_conflicts=True)
+            create_team_chat.enqueue_many([{'team_id': team.id} for team in teams])
+            hackathon_stats.mark_stale([hackathon.id])
+        facets.invalidate('teams')
+
+    placed = sum(len(members) for members in joined.values()) + sum(len(g) for g in groups)
+    return {
+        'registrants': len(user_ids),
+        'joined_existing': sum(len(members) for members in joined.values()),
+        'new_teams': len(formed),
+        'unplaced': len(user_ids) - placed,
+        **stats,
+        'seconds': round(time.perf_counter() - started, 3),
+        'dry_run': dry_run,
+        'joined': [{'team_id': team_id, 'user_ids': members} for team_id, members in joined.items()],
+        'formed': formed,
+    }
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-19 19:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hackathons', '0003_hackathon_hackathon_status_start_idx'),
+        ('teams', '0006_teammembership_viewed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['hackathon', '-created_at'], name='team_hackathon_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammembership',
+            index=models.Index(fields=['user', 'status'], name='membership_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammembership',
+            index=models.Index(fields=['team', 'status'], name='membership_team_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teamtask',
+            index=models.Index(fields=['team', '-created_at'], name='task_team_created_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+
+def open_positions_to_remaining(apps, schema_editor):
+    """open_positions was max members - 1 and never changed; it is now the slots left"""
+    Team = apps.get_model('teams', 'Team')
+    TeamMembership = apps.get_model('teams', 'TeamMembership')
+    accepted = TeamMembership.objects.filter(
+        team=OuterRef('pk'), status='accepted'
+    ).order_by().values('team').annotate(n=Count('id')).values('n')
+    # The lead is accepted but was never counted against open_positions
+    Team.objects.update(open_positions=Greatest(
+        F('open_positions') + 1 - Coalesce(Subquery(accepted, output_field=IntegerField()), Value(1)),
+        Value(0),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0008_soft_delete'),
+    ]
+
+    operations = [
+        migrations.RunPython(open_positions_to_remaining, migrations.RunPython.noop),
+    ]
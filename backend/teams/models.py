@@ -1,5 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.utils import timezone
+from config.soft_delete import SoftDeleteManager
 
 
 class Team(models.Model):
@@ -28,12 +30,19 @@ class Team(models.Model):
         related_name='led_teams'
     )
     required_skills = models.JSONField(default=list)
-    open_positions = models.IntegerField(default=1)
+    open_positions = models.IntegerField(default=1)  # Slots left; taken by TeamMembership.accept()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)  # Set while awaiting purge
+    
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['hackathon', '-created_at'], name='team_hackathon_created_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -41,6 +50,14 @@ class Team(models.Model):
     @property
     def member_count(self):
         return self.memberships.filter(status='accepted').count()
+    
+    @classmethod
+    def claim_position(cls, team_id):
+        """Take one open position in a single conditional UPDATE; False when the team is full"""
+        return bool(
+            cls.objects.filter(id=team_id, open_positions__gt=0)
+            .update(open_positions=models.F('open_positions') - 1, updated_at=timezone.now())
+        )
 
 
 class TeamMembership(models.Model):
@@ -74,9 +91,33 @@ class TeamMembership(models.Model):
     class Meta:
         unique_together = ['team', 'user']
         ordering = ['-joined_at']
+        indexes = [
+            models.Index(fields=['user', 'status'], name='membership_user_status_idx'),
+            models.Index(fields=['team', 'status'], name='membership_team_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.team.name}"
+    
+    def accept(self):
+        """
+        Accept this invite or join request and take one of the team's open positions.
+        
+        Returns 'accepted', 'full' when no position is left, or 'stale' when the
+        membership was accepted or rejected concurrently; only 'accepted' changes
+        anything. Both checks are conditional UPDATEs, so parallel accepts can't
+        overfill a team.
+        """
+        with transaction.atomic():
+            # Only from the status this instance was loaded with ('invited' or 'pending')
+            flipped = TeamMembership.objects.filter(id=self.id, status=self.status).update(status='accepted')
+            if not flipped:
+                return 'stale'
+            if not Team.claim_position(self.team_id):
+                transaction.set_rollback(True)
+                return 'full'
+        self.status = 'accepted'
+        return 'accepted'
 
 
 class TeamTask(models.Model):
@@ -120,6 +161,9 @@ class TeamTask(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['team', '-created_at'], name='task_team_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.team.name}"
@@ -0,0 +1,92 @@
+"""
+Response serializers for team and task endpoints.
+
+Lead/assignee display names and member counts are computed in SQL, so one
+``.values()`` query returns rows ready to render.
+"""
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, NullIf
+
+from .models import TeamMembership
+
+TEAM_FIELDS = (
+    'id',
+    'name',
+    'description',
+    'category',
+    'required_skills',
+    'open_positions',
+    'created_at',
+)
+
+TASK_FIELDS = (
+    'id',
+    'title',
+    'description',
+    'status',
+    'priority',
+    'color',
+    'assigned_to_id',
+    'created_by_id',
+    'due_date',
+    'created_at',
+    'updated_at',
+)
+
+
+def display_name(prefix):
+    """full_name, falling back to username when it is blank"""
+    return Coalesce(NullIf(f'{prefix}__full_name', Value('')), f'{prefix}__username')
+
+
+def accepted_member_count():
+    memberships = TeamMembership.objects.filter(
+        team=OuterRef('pk'),
+        status='accepted'
+    ).order_by().values('team').annotate(n=Count('id')).values('n')
+    return Coalesce(Subquery(memberships), 0)
+
+
+def team_values(queryset, *extra_fields, **extra_expressions):
+    return queryset.values(
+        *TEAM_FIELDS,
+        *extra_fields,
+        hackathon_name=F('hackathon__name'),
+        lead_name=display_name('lead'),
+        member_count=accepted_member_count(),
+        **extra_expressions
+    )
+
+
+def serialize_teams(queryset, *extra_fields, **extra_expressions):
+    return list(team_values(queryset, *extra_fields, **extra_expressions))
+
+
+async def aserialize_teams(queryset, *extra_fields, **extra_expressions):
+    return [row async for row in team_values(queryset, *extra_fields, **extra_expressions)]
+
+
+def serialize_member(row):
+    return {
+        'id': row['user_id'],
+        'username': row['user__username'],
+        'full_name': row['user__full_name'] or row['user__username'],
+        'role': row['role'],
+        'status': row['status'],
+    }
+
+
+def member_values(queryset):
+    return queryset.values('user_id', 'user__username', 'user__full_name', 'role', 'status')
+
+
+def task_values(queryset):
+    return queryset.values(
+        *TASK_FIELDS,
+        assigned_to_name=display_name('assigned_to'),
+        created_by_name=display_name('created_by'),
+    )
+
+
+def serialize_tasks(queryset):
+    return list(task_values(queryset))
@@ -0,0 +1,53 @@
+import logging
+
+from django.utils import timezone
+
+from config import facets
+from config.soft_delete import purge_batches
+from hackathons import stats as hackathon_stats
+from jobs.queue import task
+from messages_app.models import Conversation, Message
+from .models import Team, TeamMembership, TeamTask
+
+logger = logging.getLogger(__name__)
+
+
+def team_purge_steps(teams):
+    """Batched delete steps for everything that hangs off ``teams``, children first"""
+    conversations = Conversation.objects.filter(team__in=teams)
+    return [
+        ('messages', Message.objects.filter(conversation__in=conversations)),
+        ('chat participants', Conversation.participants.through.objects.filter(conversation__in=conversations)),
+        ('tasks', TeamTask.objects.filter(team__in=teams)),
+        ('memberships', TeamMembership.objects.filter(team__in=teams)),
+    ]
+
+
+def detach_last_messages(conversations):
+    """Clear last_message pointers so the raw message deletes don't violate the FK"""
+    conversations.exclude(last_message=None).update(last_message=None)
+
+
+def soft_delete_teams(team_ids):
+    """Hide the teams now and queue their purge"""
+    Team.all_objects.filter(id__in=team_ids, deleted_at=None).update(deleted_at=timezone.now())
+    facets.invalidate('teams')
+    hackathon_stats.mark_stale(
+        Team.all_objects.filter(id__in=team_ids).values_list('hackathon_id', flat=True).distinct()
+    )
+    for team_id in team_ids:
+        purge_team.enqueue(team_id=team_id)
+
+
+@task(queue='purge')
+def purge_team(team_id, progress=None):
+    """Delete a soft-deleted team's dependents in batches, then the team itself"""
+    progress = progress or {}
+    teams = Team.all_objects.filter(id=team_id, deleted_at__isnull=False)
+    detach_last_messages(Conversation.objects.filter(team__in=teams))
+    if purge_batches(team_purge_steps(teams), progress):
+        teams.delete()
+        logger.info('Purged team %s: %s', team_id, progress)
+    else:
+        logger.info('Purging team %s: %s so far', team_id, progress)
+        purge_team.enqueue(team_id=team_id, progress=progress)
@@ -0,0 +1,221 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Count, Q
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from hackathons.models import Hackathon
+from jobs import queue as job_queue
+from jobs.models import Job
+from messages_app.models import Conversation, Message
+from users.tasks import soft_delete_users
+from .models import Team, TeamMembership, TeamTask
+from .tasks import soft_delete_teams
+
+User = get_user_model()
+
+
+def create_hackathon(name='Test Hackathon'):
+    now = timezone.now()
+    return Hackathon.objects.create(
+        name=name,
+        description='Test hackathon',
+        category='other',
+        mode='remote',
+        start_date=now,
+        end_date=now + timedelta(days=2),
+        location='Online',
+    )
+
+
+def create_users(count, prefix='member'):
+    return User.objects.bulk_create([
+        User(email=f'{prefix}-{i}@buildbuddy.local', username=f'{prefix}_{i}')
+        for i in range(count)
+    ])
+
+
+def run_jobs(queue):
+    """Run every job on ``queue``, including the ones the jobs queue themselves"""
+    runs = 0
+    while jobs := job_queue.claim(queue, 1, 'tests'):
+        assert job_queue.run(jobs[0]) == 'done', Job.objects.get(id=jobs[0].id).last_error
+        runs += 1
+    return runs
+
+
+@override_settings(PURGE_BATCH_SIZE=100, PURGE_BATCHES_PER_JOB=5)
+class TeamPurgeTests(TestCase):
+    MEMBERS = 40
+    TASKS = 300
+    MESSAGES = 2000
+
+    def setUp(self):
+        members = create_users(self.MEMBERS)
+        self.team = Team.objects.create(
+            name='Large Team',
+            description='Generated team',
+            category='other',
+            hackathon=create_hackathon(),
+            lead=members[0],
+        )
+        TeamMembership.objects.bulk_create([
+            TeamMembership(team=self.team, user=member, status='accepted') for member in members
+        ])
+        TeamTask.objects.bulk_create([
+            TeamTask(team=self.team, title=f'Task {i}', created_by=members[i % len(members)])
+            for i in range(self.TASKS)
+        ])
+        chat = Conversation.objects.create(team=self.team)
+        chat.participants.set(members)
+        Message.objects.bulk_create([
+            Message(conversation=chat, sender=members[i % len(members)], content=f'Message {i}')
+            for i in range(self.MESSAGES)
+        ])
+        chat.record_message(Message.objects.filter(conversation=chat).last())
+        # A direct conversation between two members must survive the team's purge
+        self.direct = Conversation.objects.create(user_low=members[1], user_high=members[2])
+        Message.objects.create(conversation=self.direct, sender=members[1], content='Hi')
+
+    def conversation_ids(self, auth):
+        return [c['id'] for c in self.client.get('/api/messages/conversations', **auth).json()]
+
+    def test_soft_delete_hides_the_team_immediately(self):
+        soft_delete_teams([self.team.id])
+
+        self.assertFalse(Team.objects.filter(id=self.team.id).exists())
+        self.assertTrue(Team.all_objects.filter(id=self.team.id, deleted_at__isnull=False).exists())
+        self.assertEqual(Job.objects.filter(task='teams.tasks.purge_team', status='queued').count(), 1)
+
+    def test_soft_deleted_team_chat_is_hidden_before_the_purge(self):
+        chat = Conversation.objects.get(team=self.team)
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(self.team.lead).access_token}'}
+        self.assertEqual(self.conversation_ids(auth), [chat.id])
+        soft_delete_teams([self.team.id])
+
+        self.assertEqual(self.conversation_ids(auth), [])
+        self.assertEqual(self.client.get(f'/api/messages/conversations/{chat.id}', **auth).status_code, 404)
+        response = self.client.post(
+            f'/api/messages/conversations/{chat.id}/send',
+            data={'content': 'Still here?'}, content_type='application/json', **auth,
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_purge_leaves_no_dependents(self):
+        soft_delete_teams([self.team.id])
+        runs = run_jobs('purge')
+
+        # 100-row batches, 5 per job: a team this size takes several jobs
+        self.assertGreater(runs, 1)
+        self.assertFalse(Team.all_objects.filter(id=self.team.id).exists())
+        self.assertFalse(TeamMembership.objects.filter(team_id=self.team.id).exists())
+        self.assertFalse(TeamTask.objects.filter(team_id=self.team.id).exists())
+        self.assertFalse(Conversation.objects.filter(team_id=self.team.id).exists())
+        self.assertFalse(Message.objects.filter(conversation__team_id=self.team.id).exists())
+        self.assertFalse(
+            Conversation.participants.through.objects.filter(conversation__team_id=self.team.id).exists()
+        )
+        self.assertEqual(Message.objects.filter(conversation=self.direct).count(), 1)
+        self.assertEqual(User.objects.count(), self.MEMBERS)
+
+
+class TeamCapacityTests(TransactionTestCase):
+    TEAMS = 5
+    SLOTS = 3
+    CANDIDATES = 10
+    THREADS = 16
+
+    def setUp(self):
+        hackathon = create_hackathon()
+        per_team = self.CANDIDATES + 1
+        users = create_users(self.TEAMS * per_team)
+        self.teams = Team.objects.bulk_create([
+            Team(name=f'Team {i}', description='', category='other', hackathon=hackathon,
+                 lead=users[i * per_team], open_positions=self.SLOTS)
+            for i in range(self.TEAMS)
+        ])
+        rows = []
+        for i, team in enumerate(self.teams):
+            rows.append(TeamMembership(team=team, user=users[i * per_team], role='leader', status='accepted'))
+            for j in range(1, per_team):
+                status = 'pending' if j % 2 else 'invited'
+                rows.append(TeamMembership(team=team, user=users[i * per_team + j], status=status))
+        TeamMembership.objects.bulk_create(rows)
+
+    def accept_in_parallel(self, memberships):
+        barrier = threading.Barrier(self.THREADS)
+
+        def worker(batch):
+            barrier.wait()
+            try:
+                return [membership.accept() for membership in batch]
+            finally:
+                connection.close()
+
+        batches = [memberships[i::self.THREADS] for i in range(self.THREADS)]
+        with ThreadPoolExecutor(self.THREADS) as pool:
+            return [outcome for batch in pool.map(worker, batches) for outcome in batch]
+
+    def assert_capacity_holds(self):
+        rows = Team.objects.filter(id__in=[team.id for team in self.teams]).annotate(
+            members=Count('memberships', filter=Q(memberships__status='accepted', memberships__role='member'))
+        ).values_list('members', 'open_positions')
+        for members, open_positions in rows:
+            self.assertGreaterEqual(open_positions, 0)
+            self.assertLessEqual(members, self.SLOTS)
+            self.assertEqual(members + open_positions, self.SLOTS)
+
+    def test_parallel_accepts_never_overfill_a_team(self):
+        memberships = list(TeamMembership.objects.filter(role='member').order_by('?'))
+        outcomes = self.accept_in_parallel(memberships)
+
+        self.assertEqual(outcomes.count('accepted'), self.TEAMS * self.SLOTS)
+        self.assertEqual(outcomes.count('full'), self.TEAMS * (self.CANDIDATES - self.SLOTS))
+        self.assert_capacity_holds()
+
+    def test_parallel_accepts_of_one_membership_take_one_position(self):
+        # Every thread holds its own copy of the same pending request
+        membership = TeamMembership.objects.filter(role='member', status='pending').first()
+        copies = [TeamMembership.objects.get(id=membership.id) for _ in range(self.THREADS)]
+        outcomes = self.accept_in_parallel(copies)
+
+        self.assertEqual(outcomes.count('accepted'), 1)
+        self.assertEqual(outcomes.count('stale'), self.THREADS - 1)
+        self.assert_capacity_holds()
+
+    def test_accept_member_returns_409_once_full(self):
+        team = self.teams[0]
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(team.lead).access_token}'}
+        pending = TeamMembership.objects.filter(team=team, status='pending').order_by('id')
+        user_ids = list(pending.values_list('user_id', flat=True))
+        # Fill the team from its invites first, leaving the join requests
+        for invite in TeamMembership.objects.filter(team=team, status='invited')[:self.SLOTS - 1]:
+            self.assertEqual(invite.accept(), 'accepted')
+
+        response = self.client.post(f'/api/teams/{team.id}/accept/{user_ids[0]}', **auth)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(f'/api/teams/{team.id}/accept/{user_ids[1]}', **auth)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(TeamMembership.objects.get(team=team, user_id=user_ids[1]).status, 'pending')
+        self.assert_capacity_holds()
+
+    def test_soft_deleting_members_gives_their_positions_back(self):
+        team = self.teams[0]
+        invites = list(TeamMembership.objects.filter(team=team, status='invited')[:self.SLOTS])
+        for invite in invites:
+            self.assertEqual(invite.accept(), 'accepted')
+        self.assertEqual(Team.objects.get(id=team.id).open_positions, 0)
+
+        soft_delete_users([invites[0].user_id, invites[1].user_id])
+        soft_delete_users([invites[0].user_id])  # Deleting again frees nothing more
+
+        self.assertEqual(Team.objects.get(id=team.id).open_positions, 2)
+        self.assert_capacity_holds()
+        run_jobs('purge')
+        self.assertEqual(Team.objects.get(id=team.id).open_positions, 2)
+        self.assert_capacity_holds()
@@ -1,14 +1,18 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from config.admin import LargeTableAdminMixin
+from config.soft_delete import SoftDeleteAdminMixin
 from .models import User
+from .tasks import soft_delete_users
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(LargeTableAdminMixin, SoftDeleteAdminMixin, BaseUserAdmin):
     list_display = ('email', 'username', 'full_name', 'is_staff', 'availability')
     list_filter = ('is_staff', 'is_superuser', 'availability')
     search_fields = ('email', 'username', 'full_name')
     ordering = ('-date_joined',)
+    soft_delete_func = staticmethod(soft_delete_users)
     
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Profile Information', {
@@ -1,12 +1,19 @@
+import logging
+
 from ninja import Router, Schema
 from ninja.security import HttpBearer
 from typing import List, Optional
-from django.contrib.auth import authenticate
 from django.shortcuts import get_object_or_404
 from django.db import models as django_models
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from config.db_routers import use_replica
+from config.ratelimit import rate_limit
+from . import passwords
 from .models import User
 
+logger = logging.getLogger(__name__)
+
 router = Router()
 
 
@@ -57,17 +64,51 @@ class TokenSchema(Schema):
     refresh: str
 
 
+def _token_user_id(token):
+    """User id from a valid access token, or None"""
+    try:
+        return AccessToken(token)['user_id']
+    except (TokenError, KeyError) as e:
+        logger.info('Rejected access token: %s', e)
+        return None
+
+
 class AuthBearer(HttpBearer):
+    """
+    JWT bearer auth. The token is decoded and the user loaded once per
+    request and kept on it, so running the check again costs nothing.
+    """
+    def __call__(self, request):
+        if not hasattr(request, '_auth_user'):
+            request._auth_user = super().__call__(request)
+        return request._auth_user
+
     def authenticate(self, request, token):
-        from rest_framework_simplejwt.tokens import AccessToken
+        user_id = _token_user_id(token)
+        if user_id is None:
+            return None
+        try:
+            return User.objects.get(id=user_id)
+        except User.DoesNotExist:
+            return None
+
+
+class AsyncAuthBearer(AuthBearer):
+    """AuthBearer for async endpoints: loads the user with the async ORM"""
+    async def __call__(self, request):
+        if not hasattr(request, '_auth_user'):
+            # None without a bearer header, else the authenticate() coroutine
+            pending = HttpBearer.__call__(self, request)
+            request._auth_user = await pending if pending is not None else None
+        return request._auth_user
+
+    async def authenticate(self, request, token):
+        user_id = _token_user_id(token)
+        if user_id is None:
+            return None
         try:
-            access_token = AccessToken(token)
-            user_id = access_token['user_id']
-            user = User.objects.get(id=user_id)
-            print(f"AuthBearer: Authenticated user {user.username} (ID: {user.id})")
-            return user
-        except Exception as e:
-            print(f"AuthBearer: Authentication failed - {str(e)}")
+            return await User.objects.aget(id=user_id)
+        except User.DoesNotExist:
             return None
 
 
@@ -85,23 +126,12 @@ def register(request, data: UserCreateSchema):
 
 
 @router.post("/login", response=TokenSchema, auth=None)
-def login(request, data: LoginSchema):
+@rate_limit('login')
+async def login(request, data: LoginSchema):
     """Login and get JWT tokens"""
-    user = authenticate(username=data.email, password=data.password)
-    if user is None:
-        # Try with email as username
-        try:
-            user_obj = User.objects.get(email=data.email)
-            user = authenticate(username=user_obj.username, password=data.password)
-        except User.DoesNotExist:
-            return router.create_response(
-                request,
-                {"detail": "Invalid credentials"},
-                status=401
-            )
-    
+    user = await passwords.averify_login(data.email, data.password)
     if user is None:
-        return router.create_response(
+        return router.api.create_response(
             request,
             {"detail": "Invalid credentials"},
             status=401
@@ -122,6 +152,7 @@ def get_current_user(request):
 
 
 @router.get("/search", response=List[UserSchema], auth=None)
+@use_replica
 def search_users(request, q: str = "", skills: str = "", availability: str = ""):
     """Search users by name, skills, or availability"""
     # Exclude admin, superuser, and staff users
@@ -0,0 +1,38 @@
+"""
+Management command to move hackathon statuses along with their dates
+Usage: python manage.py advance_hackathon_statuses [--loop] [--interval 60] [--dry-run]
+
+Stores upcoming -> registration_open -> in_progress -> completed transitions
+that are due, with one range UPDATE per target status (see
+hackathons/lifecycle.py). Run it from cron, or with --loop as a long-lived
+process. API reads derive the status from the dates, so they are correct
+between runs either way.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from hackathons.lifecycle import advance_statuses
+
+
+class Command(BaseCommand):
+    help = 'Advances hackathon statuses whose start or end date has passed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running every --interval seconds')
+        parser.add_argument('--interval', type=int, default=settings.HACKATHON_STATUS_INTERVAL)
+        parser.add_argument('--dry-run', action='store_true', help='Count due transitions without applying them')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            moved = advance_statuses(dry_run=options['dry_run'])
+            elapsed = (time.perf_counter() - started) * 1000
+            summary = ', '.join(f'{count} -> {status}' for status, count in moved.items())
+            self.stdout.write(f"{'Due' if options['dry_run'] else 'Advanced'}: {summary} ({elapsed:.1f} ms)")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Hackathon statuses up to date!'))
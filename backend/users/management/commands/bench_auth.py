@@ -0,0 +1,90 @@
+"""
+Management command to measure per-request token authentication overhead
+Usage: python manage.py bench_auth [--requests 2000] [--repeat 5]
+
+Compares the hand-rolled check the teams endpoints used to run in their bodies
+(strip the header, build an AuthBearer, decode the token, load the user, once
+or twice per request) with the router-level AuthBearer, which decodes and loads
+once per request and answers repeated checks from the request. Also times a
+full GET /api/teams/invites round trip. The benchmark user is created inside a
+transaction that is rolled back afterwards.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from users.api import AuthBearer
+from users.models import User
+
+
+def legacy_authenticate(request):
+    token = request.headers.get('Authorization', '').replace('Bearer ', '').strip()
+    if not token:
+        return None
+    try:
+        return User.objects.get(id=AccessToken(token)['user_id'])
+    except Exception:
+        return None
+
+
+cached_authenticate = AuthBearer()
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks token authentication cost per request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        n, repeat = options['requests'], options['repeat']
+
+        with transaction.atomic():
+            user = User.objects.create(
+                email='bench-auth@buildbuddy.local',
+                username='bench_auth',
+                full_name='Bench Auth',
+            )
+            header = f'Bearer {RefreshToken.for_user(user).access_token}'
+            factory = RequestFactory()
+
+            timings = {}
+            for checks in (1, 2):
+                for variant, authenticate in (('legacy', legacy_authenticate), ('cached', cached_authenticate)):
+                    def run(requests=n):
+                        for _ in range(requests):
+                            request = factory.get('/api/teams/invites', HTTP_AUTHORIZATION=header)
+                            for _ in range(checks):
+                                assert authenticate(request) == user
+
+                    connection.queries_log.clear()
+                    with CaptureQueriesContext(connection) as queries:
+                        run(1)
+                    best = min(self._time(run) for _ in range(repeat))
+                    timings[(checks, variant)] = best
+                    self.stdout.write(
+                        f"{checks} check{'s' if checks > 1 else ' '}  {variant:7} "
+                        f"{best * 1e6 / n:8.1f} µs/request  {len(queries)} queries/request"
+                    )
+
+            client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=header)
+            assert client.get('/api/teams/invites').status_code == 200
+            best = min(self._time(lambda: [client.get('/api/teams/invites') for _ in range(n // 10)])
+                       for _ in range(repeat))
+            self.stdout.write(f"GET /api/teams/invites {best * 1e6 / (n // 10):8.1f} µs/request end to end")
+            transaction.set_rollback(True)
+
+        for checks in (1, 2):
+            speedup = timings[(checks, 'legacy')] / timings[(checks, 'cached')]
+            self.stdout.write(f"{checks} check{'s' if checks > 1 else ' '}  speedup {speedup:5.1f}x")
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmark complete!'))
+
+    def _time(self, run):
+        started = time.perf_counter()
+        run()
+        return time.perf_counter() - started
@@ -0,0 +1,146 @@
+"""
+Management command to measure bytes saved by response compression
+Usage: python manage.py bench_compression [--messages 2000] [--tasks 500]
+
+Seeds a team with a large group chat, a task board and many direct
+conversations, then requests get_team_conversation, list_conversations and
+get_team_tasks with each Accept-Encoding the CompressionMiddleware supports.
+All rows are created inside a transaction that is rolled back afterwards.
+"""
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from config import compression
+from hackathons.models import Hackathon
+from messages_app.models import Conversation, Message
+from teams.models import Team, TeamMembership, TeamTask
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks bytes saved by gzip/brotli on the largest API responses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=2000)
+        parser.add_argument('--tasks', type=int, default=500)
+        parser.add_argument('--conversations', type=int, default=200)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        encodings = ['identity', *compression.supported_encodings()]
+
+        with transaction.atomic():
+            user, team = self._seed(options)
+            client = Client(
+                HTTP_HOST='localhost',
+                HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}',
+            )
+            endpoints = [
+                ('get_team_conversation', f'/api/messages/team/{team.id}/conversation'),
+                ('list_conversations', '/api/messages/conversations'),
+                ('get_team_tasks', f'/api/teams/{team.id}/tasks'),
+            ]
+            for name, path in endpoints:
+                self.stdout.write(name)
+                raw_size = None
+                for encoding in encodings:
+                    size, best = self._measure(client, path, encoding, options['repeat'])
+                    if raw_size is None:
+                        raw_size = size
+                    saved = 100 * (1 - size / raw_size) if raw_size else 0
+                    self.stdout.write(
+                        f"  {encoding:8} {size / 1024:9.1f} KiB  saved {saved:5.1f}%  "
+                        f"{best * 1000:8.1f} ms"
+                    )
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmark complete!'))
+
+    def _measure(self, client, path, encoding, repeat):
+        timings, size = [], 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = client.get(path, HTTP_ACCEPT_ENCODING=encoding)
+            timings.append(time.perf_counter() - started)
+            served = response.get('Content-Encoding', 'identity')
+            if served != encoding:
+                self.stderr.write(f'  expected {encoding}, got {served} for {path}')
+            size = len(response.content)
+        return size, min(timings)
+
+    def _seed(self, options):
+        now = timezone.now()
+        members = User.objects.bulk_create([
+            User(
+                email=f'bench-compression-{i}@buildbuddy.local',
+                username=f'bench_compression_{i}',
+                full_name=f'Bench Member {i}',
+            )
+            for i in range(8)
+        ])
+        lead = members[0]
+        hackathon = Hackathon.objects.create(
+            name='Bench Compression Hackathon',
+            description='Benchmark hackathon',
+            category='other',
+            mode='remote',
+            start_date=now,
+            end_date=now + timedelta(days=2),
+            location='Online',
+        )
+        team = Team.objects.create(
+            name='Bench Compression Team',
+            description='Benchmark team',
+            category='other',
+            hackathon=hackathon,
+            lead=lead,
+        )
+        TeamMembership.objects.bulk_create([
+            TeamMembership(
+                team=team, user=member,
+                role='leader' if member == lead else 'member', status='accepted',
+            )
+            for member in members
+        ])
+
+        group_chat = Conversation.objects.create(team=team)
+        group_chat.participants.set(members)
+        Message.objects.bulk_create([
+            Message(
+                conversation=group_chat,
+                sender=members[i % len(members)],
+                content='Pushed the latest build, can someone review the PR?',
+                is_read=True,
+            )
+            for i in range(options['messages'])
+        ])
+
+        TeamTask.objects.bulk_create([
+            TeamTask(
+                team=team,
+                title=f'Task {i}',
+                description='Wire up the submission form and the judging rubric',
+                assigned_to=members[i % len(members)],
+                created_by=lead,
+                due_date=now + timedelta(days=i % 7),
+            )
+            for i in range(options['tasks'])
+        ])
+
+        for i in range(options['conversations']):
+            conversation = Conversation.objects.create()
+            conversation.participants.add(lead, members[1 + i % (len(members) - 1)])
+            Message.objects.create(
+                conversation=conversation,
+                sender=lead,
+                content=f'Hey, want to pair on the demo? ({i})',
+            )
+        return lead, team
@@ -0,0 +1,118 @@
+"""
+Management command to benchmark JSON rendering of the largest API payloads
+Usage: python manage.py bench_json [--messages 5000] [--repeat 20]
+
+Renders a team conversation with thousands of messages and a large task list
+with the stock Ninja renderer (stdlib json + .isoformat() per field) and with
+config.renderers.FastJSONRenderer (orjson, datetimes handled natively), plus
+its pure-Python fallback.
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from ninja.renderers import JSONRenderer
+
+from config import renderers
+from config.renderers import FastJSONRenderer
+
+
+def conversation_payload(count, isoformat):
+    now = timezone.now()
+    fmt = (lambda dt: dt.isoformat()) if isoformat else (lambda dt: dt)
+    return {
+        'id': 1,
+        'participants': list(range(1, 9)),
+        'participant_names': [f'Member {i}' for i in range(1, 9)],
+        'last_message': 'See you at the demo!',
+        'unread_count': 0,
+        'updated_at': fmt(now),
+        'is_group_chat': True,
+        'team_id': 1,
+        'team_name': 'Bench Team',
+        'messages': [
+            {
+                'id': i,
+                'sender_id': i % 8 + 1,
+                'sender_name': f'Member {i % 8 + 1}',
+                'content': 'Pushed the latest build, can someone review the PR? ' * 2,
+                'is_read': True,
+                'created_at': fmt(now - timedelta(minutes=i)),
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def tasks_payload(count, isoformat):
+    now = timezone.now()
+    fmt = (lambda dt: dt.isoformat()) if isoformat else (lambda dt: dt)
+    return [
+        {
+            'id': i,
+            'title': f'Task {i}',
+            'description': 'Wire up the submission form and the judging rubric',
+            'status': 'in_progress',
+            'priority': 'medium',
+            'color': '#3B82F6',
+            'assigned_to_id': i % 4 + 1,
+            'assigned_to_name': f'Member {i % 4 + 1}',
+            'created_by_id': 1,
+            'created_by_name': 'Member 1',
+            'due_date': fmt(now + timedelta(days=i % 7)),
+            'created_at': fmt(now - timedelta(hours=i)),
+            'updated_at': fmt(now),
+        }
+        for i in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the API JSON renderer on the biggest payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=5000)
+        parser.add_argument('--tasks', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        payloads = [
+            ('conversation', lambda iso: conversation_payload(options['messages'], iso)),
+            ('tasks', lambda iso: tasks_payload(options['tasks'], iso)),
+        ]
+        stock, fast = JSONRenderer(), FastJSONRenderer()
+
+        for name, build in payloads:
+            # The stock renderer needs endpoints to pre-format datetimes, so
+            # that formatting is part of its cost
+            stock_time = self._best(lambda: stock.render(None, build(True), response_status=200), repeat)
+            fast_time = self._best(lambda: fast.render(None, build(False), response_status=200), repeat)
+            fallback_time = self._best(lambda: self._render_fallback(fast, build(False)), repeat)
+            size = len(fast.render(None, build(False), response_status=200))
+
+            self.stdout.write(f"{name} ({size / 1024:.0f} KiB)")
+            self.stdout.write(f"  stock json      {stock_time * 1000:8.2f} ms")
+            self.stdout.write(
+                f"  fast renderer   {fast_time * 1000:8.2f} ms  "
+                f"({stock_time / fast_time:4.1f}x, orjson={'yes' if renderers.orjson else 'no'})"
+            )
+            self.stdout.write(f"  python fallback {fallback_time * 1000:8.2f} ms")
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmark complete!'))
+
+    def _render_fallback(self, renderer, data):
+        orjson, renderers.orjson = renderers.orjson, None
+        try:
+            return renderer.render(None, data, response_status=200)
+        finally:
+            renderers.orjson = orjson
+
+    def _best(self, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
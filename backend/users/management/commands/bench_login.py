@@ -0,0 +1,101 @@
+"""
+Management command to measure login throughput per worker process
+Usage: python manage.py bench_login [--logins 20] [--concurrency 8]
+
+Compares the old login (authenticate() by email, then a second authenticate()
+by username after a failure) with users/passwords.py for correct passwords,
+wrong passwords and unknown emails, then runs --concurrency async logins at a
+time through averify_login, reporting throughput with the PASSWORD_HASH_WORKERS
+pool and the longest the event loop was blocked meanwhile.
+The benchmark user is deleted afterwards.
+"""
+import asyncio
+import time
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.management.base import BaseCommand
+
+from users import passwords
+from users.models import User
+
+EMAIL = 'bench-login@buildbuddy.local'
+PASSWORD = 'bench-login-password'
+
+
+def legacy_login(email, password):
+    user = authenticate(username=email, password=password)
+    if user is None:
+        try:
+            user_obj = User.objects.get(email=email)
+            user = authenticate(username=user_obj.username, password=password)
+        except User.DoesNotExist:
+            return None
+    return user
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks logins per second per worker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20)
+        parser.add_argument('--concurrency', type=int, default=8)
+
+    def handle(self, *args, **options):
+        n, concurrency = options['logins'], options['concurrency']
+        User.all_objects.filter(email=EMAIL).delete()
+        User.objects.create_user(email=EMAIL, username='bench_login', password=PASSWORD)
+        try:
+            cases = [
+                ('correct password', PASSWORD, True),
+                ('wrong password', 'not-the-password', False),
+            ]
+            for name, password, expected in cases + [('unknown email', PASSWORD, False)]:
+                email = EMAIL if name != 'unknown email' else 'nobody@buildbuddy.local'
+                rates = []
+                for variant, login in (('legacy', legacy_login), ('single-pass', passwords.verify_login)):
+                    elapsed = self._time(lambda: [login(email, password) for _ in range(n)])
+                    assert (login(email, password) is not None) == expected
+                    rates.append(n / elapsed)
+                    self.stdout.write(f"{name:17} {variant:12} {n / elapsed:8.1f} logins/s")
+                self.stdout.write(f"{name:17} speedup      {rates[1] / rates[0]:8.1f}x")
+
+            for name, password, expected in cases:
+                started = time.perf_counter()
+                stall = asyncio.run(self._concurrent(n, concurrency, password, expected))
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{name:17} async x{concurrency:<4} {n / elapsed:8.1f} logins/s "
+                    f"({settings.PASSWORD_HASH_WORKERS} hash threads, event loop stalled at most {stall * 1000:.0f} ms)"
+                )
+        finally:
+            User.all_objects.filter(email=EMAIL).delete()
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmark complete!'))
+
+    async def _concurrent(self, n, concurrency, password, expected):
+        """Run the logins and return the longest the event loop went without a turn"""
+        limit = asyncio.Semaphore(concurrency)
+        done = asyncio.Event()
+        stall = 0.0
+
+        async def one():
+            async with limit:
+                assert (await passwords.averify_login(EMAIL, password) is not None) == expected
+
+        async def tick():
+            nonlocal stall
+            while not done.is_set():
+                started = time.perf_counter()
+                await asyncio.sleep(0.005)
+                stall = max(stall, time.perf_counter() - started - 0.005)
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.gather(*(one() for _ in range(n)))
+        done.set()
+        await ticker
+        return stall
+
+    def _time(self, run):
+        started = time.perf_counter()
+        run()
+        return time.perf_counter() - started
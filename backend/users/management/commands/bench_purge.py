@@ -0,0 +1,133 @@
+"""
+Management command to compare in-request CASCADE deletes with soft delete + purge
+Usage: python manage.py bench_purge [--messages 50000] [--members 50] [--tasks 2000]
+
+Generates two identical large teams (members, tasks, a busy team chat), deletes
+one with Team.delete() and the other with soft_delete_teams() followed by the
+purge jobs, printing the progress each job records and checking that nothing
+was left behind. All rows are created inside a transaction that is rolled back.
+"""
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from hackathons.models import Hackathon
+from jobs import queue as job_queue
+from messages_app.models import Conversation, Message
+from teams.models import Team, TeamMembership, TeamTask
+from teams.tasks import soft_delete_teams
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks deleting a large team inline vs soft delete + background purge'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=50000)
+        parser.add_argument('--members', type=int, default=50)
+        parser.add_argument('--tasks', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            members = self._seed_members(options['members'])
+            cascade_team = self._seed_team('cascade', members, options)
+            purge_team = self._seed_team('purge', members, options)
+            self.stdout.write(f"Seeded two teams with {self._dependents(cascade_team)} dependent rows each\n")
+
+            started = time.perf_counter()
+            Team.objects.get(id=cascade_team).delete()
+            cascade_time = time.perf_counter() - started
+            self.stdout.write(f"CASCADE delete in request   {cascade_time * 1000:9.1f} ms")
+
+            started = time.perf_counter()
+            soft_delete_teams([purge_team])
+            soft_time = time.perf_counter() - started
+            self.stdout.write(f"soft delete in request      {soft_time * 1000:9.1f} ms")
+            if Team.objects.filter(id=purge_team).exists():
+                raise CommandError('Soft-deleted team is still visible')
+
+            started = time.perf_counter()
+            runs = 0
+            while True:
+                jobs = job_queue.claim('purge', 1, 'bench_purge')
+                if not jobs:
+                    break
+                job = jobs[0]
+                job_started = time.perf_counter()
+                if job_queue.run(job) != 'done':
+                    raise CommandError(f'Purge job {job.id} failed')
+                runs += 1
+                latest = job_queue.Job.objects.filter(task=job.task, status='queued').first()
+                progress = latest.payload['progress'] if latest else 'finished'
+                self.stdout.write(
+                    f"  purge job {runs:3}  {(time.perf_counter() - job_started) * 1000:8.1f} ms  {progress}"
+                )
+            purge_time = time.perf_counter() - started
+            self.stdout.write(f"background purge ({runs} jobs)  {purge_time * 1000:9.1f} ms")
+
+            leftovers = self._dependents(purge_team) + Team.all_objects.filter(id=purge_team).count()
+            transaction.set_rollback(True)
+
+        if leftovers:
+            raise CommandError(f'{leftovers} rows were left behind by the purge')
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmark complete!'))
+
+    def _dependents(self, team_id):
+        return (
+            Message.objects.filter(conversation__team_id=team_id).count()
+            + TeamTask.objects.filter(team_id=team_id).count()
+            + TeamMembership.objects.filter(team_id=team_id).count()
+            + Conversation.participants.through.objects.filter(conversation__team_id=team_id).count()
+        )
+
+    def _seed_members(self, count):
+        return User.objects.bulk_create([
+            User(
+                email=f'bench-purge-{i}@buildbuddy.local',
+                username=f'bench_purge_{i}',
+                full_name=f'Bench Member {i}',
+            )
+            for i in range(count)
+        ])
+
+    def _seed_team(self, label, members, options):
+        now = timezone.now()
+        hackathon = Hackathon.objects.create(
+            name=f'Bench Purge Hackathon ({label})',
+            description='Benchmark hackathon',
+            category='other',
+            mode='remote',
+            start_date=now,
+            end_date=now + timedelta(days=2),
+            location='Online',
+        )
+        team = Team.objects.create(
+            name=f'Bench Purge Team ({label})',
+            description='Benchmark team',
+            category='other',
+            hackathon=hackathon,
+            lead=members[0],
+        )
+        TeamMembership.objects.bulk_create([
+            TeamMembership(team=team, user=member, status='accepted') for member in members
+        ])
+        TeamTask.objects.bulk_create([
+            TeamTask(team=team, title=f'Task {i}', created_by=members[i % len(members)])
+            for i in range(options['tasks'])
+        ])
+        chat = Conversation.objects.create(team=team)
+        chat.participants.set(members)
+        Message.objects.bulk_create(
+            [
+                Message(conversation=chat, sender=members[i % len(members)], content=f'Message {i}')
+                for i in range(options['messages'])
+            ],
+            batch_size=5000,
+        )
+        chat.record_message(Message.objects.filter(conversation=chat).first())
+        return team.id
@@ -0,0 +1,62 @@
+"""
+Management command to measure rate limiting overhead per request
+Usage: python manage.py bench_ratelimit [--requests 200000] [--clients 10000]
+
+Calls a trivial view wrapped in @rate_limit('poll') with requests spread over
+--clients users, and compares it with the bare view. The buckets are timed both
+in-process (what a local-memory RATE_LIMIT_CACHE uses) and through the Django
+cache API (what shared caches use), here backed by a throwaway LocMemCache.
+"""
+import time
+from types import SimpleNamespace
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+
+from config import ratelimit
+
+
+def view(request):
+    return request
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks per-request rate limiting overhead'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200000)
+        parser.add_argument('--clients', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        n = options['requests']
+        requests = [
+            SimpleNamespace(auth=SimpleNamespace(pk=i), META={})
+            for i in range(options['clients'])
+        ]
+        limited = ratelimit.rate_limit('poll')(view)
+        bare = self._time(view, requests, n)
+        self.stdout.write(f"bare view          {bare * 1e6 / n:6.2f} µs/request")
+
+        cases = [
+            ('in-process', ratelimit._LocalBuckets()),
+            ('cache API', ratelimit._CacheBuckets(LocMemCache('bench-ratelimit', {}))),
+        ]
+        for name, buckets in cases:
+            original = ratelimit._buckets
+            ratelimit._buckets = lambda alias: buckets
+            try:
+                elapsed = self._time(limited, requests, n)
+            finally:
+                ratelimit._buckets = original
+            self.stdout.write(
+                f"{name:18} {elapsed * 1e6 / n:6.2f} µs/request  "
+                f"(+{(elapsed - bare) * 1e6 / n:.2f} µs)"
+            )
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmark complete!'))
+
+    def _time(self, run, requests, n):
+        clients = len(requests)
+        started = time.perf_counter()
+        for i in range(n):
+            run(requests[i % clients])
+        return time.perf_counter() - started
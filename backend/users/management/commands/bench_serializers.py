@@ -0,0 +1,151 @@
+"""
+Management command to measure response serialization cost per 1k rows
+Usage: python manage.py bench_serializers [--rows 1000] [--repeat 5]
+
+Compares the old hand-built dicts (model instances, per-row counts,
+hasattr/isoformat checks and pydantic re-validation) with the .values()
+serializers in hackathons/serializers.py and teams/serializers.py. All rows are
+created inside a transaction that is rolled back afterwards.
+"""
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from hackathons.api import HackathonSchema
+from hackathons.models import Hackathon, HackathonRegistration
+from hackathons.serializers import serialize_hackathons
+from teams.api import TeamSchema
+from teams.models import Team, TeamMembership
+from teams.serializers import serialize_teams
+
+User = get_user_model()
+
+
+def legacy_hackathons(queryset):
+    rows = [
+        {
+            'id': h.id,
+            'name': h.name,
+            'description': h.description,
+            'category': h.category,
+            'mode': h.mode,
+            'status': h.status,
+            'start_date': h.start_date.isoformat() if hasattr(h.start_date, 'isoformat') else str(h.start_date),
+            'end_date': h.end_date.isoformat() if hasattr(h.end_date, 'isoformat') else str(h.end_date),
+            'location': h.location,
+            'prize': h.prize,
+            'max_participants': h.max_participants,
+            'participant_count': h.participant_count,
+            'website_url': h.website_url or '',
+            'registration_url': h.registration_url or '',
+        }
+        for h in queryset
+    ]
+    return [HackathonSchema.model_validate(row).model_dump() for row in rows]
+
+
+def legacy_teams(queryset):
+    rows = [
+        {
+            'id': team.id,
+            'name': team.name,
+            'description': team.description,
+            'category': team.category,
+            'hackathon_name': team.hackathon.name,
+            'lead_name': team.lead.full_name or team.lead.username,
+            'required_skills': team.required_skills,
+            'open_positions': team.open_positions,
+            'member_count': team.member_count,
+            'created_at': team.created_at.isoformat(),
+        }
+        for team in queryset.select_related('hackathon', 'lead')
+    ]
+    return [TeamSchema.model_validate(row).model_dump() for row in rows]
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks hackathon/team response serialization per 1k rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+
+        with transaction.atomic():
+            hackathons, teams = self._seed(rows)
+            cases = [
+                ('hackathons', 'legacy', lambda: legacy_hackathons(hackathons)),
+                ('hackathons', 'values', lambda: serialize_hackathons(hackathons)),
+                ('teams', 'legacy', lambda: legacy_teams(teams)),
+                ('teams', 'values', lambda: serialize_teams(teams)),
+            ]
+            timings = {}
+            for name, variant, run in cases:
+                best = min(self._time(run) for _ in range(repeat))
+                timings[(name, variant)] = best
+                self.stdout.write(
+                    f"{name:11} {variant:7} {best * 1000:9.1f} ms total  "
+                    f"{best * 1000 * 1000 / rows:9.1f} ms per 1k rows"
+                )
+            transaction.set_rollback(True)
+
+        for name in ('hackathons', 'teams'):
+            speedup = timings[(name, 'legacy')] / timings[(name, 'values')]
+            self.stdout.write(f"{name:11} speedup {speedup:5.1f}x")
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmark complete!'))
+
+    def _time(self, run):
+        started = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - started
+        assert len(result) > 0
+        return elapsed
+
+    def _seed(self, rows):
+        now = timezone.now()
+        lead = User.objects.create(
+            email='bench-serializers@buildbuddy.local',
+            username='bench_serializers',
+            full_name='Bench Lead',
+        )
+        created = Hackathon.objects.bulk_create([
+            Hackathon(
+                name=f'Bench Hackathon {i}',
+                description='Benchmark hackathon ' * 10,
+                category='other',
+                mode='remote',
+                start_date=now + timedelta(days=i % 90),
+                end_date=now + timedelta(days=i % 90 + 2),
+                location='Online',
+            )
+            for i in range(rows)
+        ])
+        HackathonRegistration.objects.bulk_create([
+            HackathonRegistration(hackathon=h, user=lead) for h in created
+        ])
+        created_teams = Team.objects.bulk_create([
+            Team(
+                name=f'Bench Team {i}',
+                description='Benchmark team ' * 10,
+                category='other',
+                hackathon=created[i],
+                lead=lead,
+                required_skills=['Python', 'React'],
+                open_positions=3,
+            )
+            for i in range(rows)
+        ])
+        TeamMembership.objects.bulk_create([
+            TeamMembership(team=t, user=lead, role='leader', status='accepted')
+            for t in created_teams
+        ])
+        return (
+            Hackathon.objects.filter(name__startswith='Bench Hackathon '),
+            Team.objects.filter(lead=lead),
+        )
@@ -0,0 +1,162 @@
+"""
+Management command to compare API throughput under the WSGI and ASGI servers
+Usage: python manage.py bench_server [--concurrency 1 10 50] [--requests 2000]
+
+Starts gunicorn once per interface (see gunicorn.conf.py), hammers the read
+endpoints with concurrent keep-alive clients and reports requests/sec and
+latency percentiles.
+"""
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+DEFAULT_PATHS = [
+    '/api/messages/unread-count',
+    '/api/hackathons/',
+    '/api/teams/',
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks concurrent-connection throughput of the WSGI vs ASGI server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Endpoint to hit (repeatable)')
+        parser.add_argument('--interfaces', nargs='+', default=['wsgi', 'asgi'],
+                            choices=['wsgi', 'asgi'])
+        parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 10, 50])
+        parser.add_argument('--requests', type=int, default=2000,
+                            help='Requests per path and concurrency level')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Gunicorn workers per server')
+        parser.add_argument('--port', type=int, default=8765)
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or DEFAULT_PATHS
+        token = self._bench_token()
+        results = []
+
+        for interface in options['interfaces']:
+            if interface == 'asgi':
+                try:
+                    import uvicorn  # noqa: F401
+                except ImportError:
+                    raise CommandError('uvicorn is required for the ASGI benchmark')
+
+            server = self._start_server(interface, options['port'], options['workers'])
+            try:
+                for path in paths:
+                    for concurrency in options['concurrency']:
+                        stats = self._run_load(
+                            options['port'], path, token, concurrency, options['requests']
+                        )
+                        results.append((interface, path, concurrency, stats))
+                        self.stdout.write(
+                            f"{interface:5} {path:32} c={concurrency:<4} "
+                            f"{stats['rps']:8.1f} req/s  p50={stats['p50']:6.1f}ms  "
+                            f"p95={stats['p95']:6.1f}ms  errors={stats['errors']}"
+                        )
+            finally:
+                server.terminate()
+                server.wait(timeout=10)
+
+        self._print_comparison(results)
+
+    def _bench_token(self):
+        user, created = User.objects.get_or_create(
+            email='bench@buildbuddy.local',
+            defaults={'username': 'bench_user', 'full_name': 'Bench User'}
+        )
+        if created:
+            user.set_unusable_password()
+            user.save()
+        return str(AccessToken.for_user(user))
+
+    def _start_server(self, interface, port, workers):
+        env = dict(os.environ, SERVER_INTERFACE=interface)
+        server = subprocess.Popen(
+            [
+                sys.executable, '-m', 'gunicorn',
+                '--config', 'gunicorn.conf.py',
+                '--bind', f'127.0.0.1:{port}',
+                '--workers', str(workers),
+                '--access-logfile', os.devnull,
+            ],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f'{interface} server exited with code {server.returncode}')
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+                return server
+            except OSError:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError(f'{interface} server did not start on port {port}')
+
+    def _run_load(self, port, path, token, concurrency, total):
+        headers = {'Authorization': f'Bearer {token}', 'Connection': 'keep-alive'}
+        per_client = max(1, total // concurrency)
+
+        def client(_):
+            latencies, errors = [], 0
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            for _ in range(per_client):
+                started = time.perf_counter()
+                try:
+                    conn.request('GET', path, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    if response.status >= 400:
+                        errors += 1
+                except (OSError, http.client.HTTPException):
+                    errors += 1
+                    conn.close()
+                    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                latencies.append((time.perf_counter() - started) * 1000)
+            conn.close()
+            return latencies, errors
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(client, range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(l for lats, _ in outcomes for l in lats)
+        return {
+            'rps': len(latencies) / elapsed,
+            'p50': statistics.median(latencies),
+            'p95': latencies[int(len(latencies) * 0.95) - 1],
+            'errors': sum(e for _, e in outcomes),
+        }
+
+    def _print_comparison(self, results):
+        by_key = {(i, p, c): s for i, p, c, s in results}
+        rows = [(p, c) for i, p, c, _ in results if i == 'wsgi' and ('asgi', p, c) in by_key]
+        if not rows:
+            return
+        self.stdout.write('\nASGI vs WSGI throughput')
+        for path, concurrency in rows:
+            wsgi, asgi = by_key[('wsgi', path, concurrency)], by_key[('asgi', path, concurrency)]
+            self.stdout.write(
+                f"  {path:32} c={concurrency:<4} {asgi['rps'] / wsgi['rps']:5.2f}x"
+            )
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmark complete!'))
@@ -0,0 +1,43 @@
+"""
+Management command to export a hackathon's registrations, teams or memberships
+Usage: python manage.py export_hackathon <hackathon_id> <registrations|teams|memberships> [--format csv] [--output file]
+
+Uses the same streaming iterator as GET /api/hackathons/{id}/export/{kind},
+so large exports are written chunk by chunk without loading every row.
+"""
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hackathons.exports import EXPORTS, FORMATS, iter_export
+from hackathons.models import Hackathon
+
+
+class Command(BaseCommand):
+    help = "Exports a hackathon's registrations, teams or memberships as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument('hackathon_id', type=int)
+        parser.add_argument('kind', choices=list(EXPORTS))
+        parser.add_argument('--format', choices=list(FORMATS), default='ndjson')
+        parser.add_argument('--output', help='File to write (default: stdout)')
+
+    def handle(self, *args, **options):
+        if not Hackathon.objects.filter(id=options['hackathon_id']).exists():
+            raise CommandError(f"Hackathon {options['hackathon_id']} does not exist")
+
+        queryset = EXPORTS[options['kind']](options['hackathon_id'])
+        out = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        written = 0
+        try:
+            for chunk in iter_export(queryset, options['format']):
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if options['output']:
+                out.close()
+
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(
+                f"\n✅ Wrote {written / 1024:.1f} KiB to {options['output']}"
+            ))
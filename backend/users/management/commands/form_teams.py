@@ -0,0 +1,50 @@
+"""
+Management command to form teams from a hackathon's solo registrants
+Usage: python manage.py form_teams <hackathon_id> [--team-size 4] [--search-seconds 1.0] [--dry-run]
+
+Runs the same matcher as POST /api/hackathons/{id}/form-teams: registrants who
+bring skills an open team still needs are invited to it, the rest are grouped
+into new teams of about --team-size members.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from hackathons.models import Hackathon
+from teams.formation import form_teams
+
+
+class Command(BaseCommand):
+    help = 'Matches solo registrants of a hackathon to existing or new teams'
+
+    def add_arguments(self, parser):
+        parser.add_argument('hackathon_id', type=int)
+        parser.add_argument('--team-size', type=int, default=4)
+        parser.add_argument('--search-seconds', type=float,
+                            help='Local search budget (default: TEAM_FORMATION_SEARCH_SECONDS)')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--dry-run', action='store_true', help='Print the plan without writing it')
+
+    def handle(self, *args, **options):
+        if options['team_size'] < 2:
+            raise CommandError('--team-size must be at least 2')
+        hackathon = Hackathon.objects.filter(id=options['hackathon_id']).first()
+        if hackathon is None:
+            raise CommandError(f"Hackathon {options['hackathon_id']} does not exist")
+
+        report = form_teams(
+            hackathon,
+            team_size=options['team_size'],
+            search_seconds=options['search_seconds'],
+            dry_run=options['dry_run'],
+            seed=options['seed'],
+        )
+
+        self.stdout.write(f"Solo registrants:       {report['registrants']}")
+        self.stdout.write(f"Invited to open teams:  {report['joined_existing']}")
+        self.stdout.write(f"New teams:              {report['new_teams']}")
+        self.stdout.write(f"Left unplaced:          {report['unplaced']}")
+        self.stdout.write(
+            f"Skill coverage:         {report['greedy_coverage']} greedy -> "
+            f"{report['final_coverage']} after search ({report['skills']} distinct skills)"
+        )
+        verb = 'Planned' if options['dry_run'] else 'Formed'
+        self.stdout.write(self.style.SUCCESS(f"\n✅ {verb} teams in {report['seconds']:.2f}s"))
@@ -0,0 +1,46 @@
+"""
+Management command to import a hackathon catalog
+Usage: python manage.py import_hackathons <catalog.csv|catalog.json> [--format csv] [--batch-size 500] [--dry-run]
+
+Streams the file, validates rows in batches and upserts them on
+Hackathon.external_id, like POST /api/hackathons/import. Prints the
+inserted/updated/rejected counts and rows per second.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from hackathons import importer
+
+
+class Command(BaseCommand):
+    help = 'Imports (upserts) hackathons from a CSV, NDJSON or JSON catalog'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'json'],
+                            help='Defaults to csv for *.csv files and json otherwise')
+        parser.add_argument('--batch-size', type=int)
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Validate and count without writing')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or importer.detect_format(options['path'])
+        try:
+            with open(options['path'], 'rb') as catalog:
+                report = importer.import_catalog(
+                    importer.read_rows(catalog, fmt),
+                    batch_size=options['batch_size'],
+                    dry_run=options['dry_run'],
+                )
+        except OSError as e:
+            raise CommandError(f'Could not open catalog: {e}')
+        except (ValueError, UnicodeDecodeError) as e:
+            raise CommandError(f'Could not read catalog: {e}')
+
+        for error in report['errors']:
+            self.stdout.write(self.style.WARNING(f"  row {error['row']}: {error['error']}"))
+        verb = 'Would import' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f"\n✅ {verb}: {report['inserted']} inserted, {report['updated']} updated, "
+            f"{report['rejected']} rejected in {report['seconds']:.2f}s "
+            f"({report['rows_per_second']} rows/s)"
+        ))
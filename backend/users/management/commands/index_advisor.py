@@ -0,0 +1,165 @@
+"""
+Management command to check the hot API queries against their EXPLAIN plans
+Usage: python manage.py index_advisor [--query unread_count] [--force-index] [--verbose]
+
+Replays the filters the benchmarked endpoints run, captures the query plan on
+the active database (SQLite or PostgreSQL), flags full table scans and sorts
+that could not use an index, and proposes the composite index that would
+serve each query. Indexes already declared in Meta.indexes/unique_together
+are reported as covering the query instead.
+"""
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from hackathons.models import Hackathon
+from messages_app.models import Conversation, ConversationParticipant, Message
+from teams.models import Team, TeamMembership, TeamTask
+
+User = get_user_model()
+
+SQLITE_SCAN = re.compile(r'\bSCAN (\w+)(?! USING (?:COVERING )?INDEX)')
+SQLITE_SORT = re.compile(r'USE TEMP B-TREE FOR (?:ORDER BY|RIGHT PART OF ORDER BY)')
+POSTGRES_SCAN = re.compile(r'Seq Scan on (\w+)')
+POSTGRES_SORT = re.compile(r'^\s*(?:->\s*)?Sort\b', re.MULTILINE)
+
+
+def hot_queries(user, team, conversation):
+    """(name, endpoint, model, index fields, queryset) for each hot filter path."""
+    return [
+        ('my_teams', 'GET /teams/myteams', TeamMembership, ['user', 'status'],
+         TeamMembership.objects.filter(user=user, status='accepted')),
+        ('pending_invites', 'GET /teams/invites', TeamMembership, ['user', 'status'],
+         TeamMembership.objects.filter(user=user, status='invited')),
+        ('team_members', 'GET /teams/{id}', TeamMembership, ['team', 'status'],
+         TeamMembership.objects.filter(team=team, status='accepted')),
+        ('join_requests', 'GET /teams/{id}/join-requests', TeamMembership, ['team', 'status'],
+         TeamMembership.objects.filter(team=team, status='pending')),
+        ('unread_count', 'GET /messages/unread-count', ConversationParticipant, ['user'],
+         ConversationParticipant.objects.filter(user=user)),
+        ('conversation_messages', 'GET /messages/conversations/{id}', Message,
+         ['conversation', '-created_at'],
+         Message.objects.filter(conversation=conversation).order_by('-created_at')),
+        ('hackathons_by_status', 'GET /hackathons/?status=', Hackathon, ['status', 'start_date'],
+         Hackathon.objects.filter(status='upcoming').order_by('start_date')),
+        ('hackathon_teams', 'GET /teams/?hackathon_id=', Team, ['hackathon', '-created_at'],
+         Team.objects.filter(hackathon_id=team.hackathon_id if team else 0).order_by('-created_at')),
+        ('team_tasks', 'GET /teams/{id}/tasks', TeamTask, ['team', '-created_at'],
+         TeamTask.objects.filter(team=team).order_by('-created_at')),
+    ]
+
+
+def declared_indexes(model):
+    """Map of index name to its field names (descending order markers stripped)."""
+    indexes = {index.name: [f.lstrip('-') for f in index.fields] for index in model._meta.indexes}
+    for fields in model._meta.unique_together:
+        indexes['unique(' + ', '.join(fields) + ')'] = list(fields)
+    for field in model._meta.concrete_fields:
+        if field.db_index or field.unique:
+            indexes.setdefault(f'{field.name} ({field.get_internal_type()})', [field.name])
+    return indexes
+
+
+def covering_index(model, fields):
+    wanted = [f.lstrip('-') for f in fields]
+    for name, index_fields in declared_indexes(model).items():
+        if index_fields[:len(wanted)] == wanted:
+            return name
+    return None
+
+
+def ordering_fields(queryset):
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return {f.lstrip('-') for f in ordering}
+
+
+def proposed_index(model, fields):
+    base = f"{model._meta.model_name}_{'_'.join(f.lstrip('-') for f in fields)}"
+    name = base[:26].rstrip('_') + '_idx'
+    return f"models.Index(fields={fields!r}, name='{name}')"
+
+
+class Command(BaseCommand):
+    help = 'Flags hot API queries that scan or sort without an index and proposes indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--query', action='append', dest='queries',
+                            help='Only check this query (repeatable)')
+        parser.add_argument('--force-index', action='store_true',
+                            help='PostgreSQL only: disable seq scans so small tables show '
+                                 'whether an index is usable at all')
+        parser.add_argument('--analyze', action='store_true',
+                            help='Refresh planner statistics (ANALYZE) before explaining')
+        parser.add_argument('--verbose', action='store_true', help='Print the full plans')
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f'Unsupported database vendor: {vendor}')
+
+        user = User.objects.order_by('id').first()
+        team = Team.objects.order_by('id').first()
+        conversation = Conversation.objects.order_by('id').first()
+        if user is None:
+            raise CommandError('No users found; run populate_data first')
+
+        queries = hot_queries(user, team, conversation)
+        if options['queries']:
+            queries = [q for q in queries if q[0] in options['queries']]
+
+        if options['analyze']:
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        self.stdout.write(f'Checking {len(queries)} queries on {vendor}\n')
+        proposals = {}
+        with transaction.atomic():
+            if vendor == 'postgresql' and options['force_index']:
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for name, endpoint, model, fields, queryset in queries:
+                plan = queryset.explain()
+                scans, sorted_in_memory = self._problems(vendor, plan)
+                problems = list(scans)
+                # Sorting a handful of filtered rows is cheap; it only matters
+                # when the index is meant to deliver rows in order as well
+                if sorted_in_memory and ordering_fields(queryset) & {f.lstrip('-') for f in fields}:
+                    problems.append('sort without an index')
+                covered_by = covering_index(model, fields)
+
+                status = self.style.SUCCESS('ok') if not problems else self.style.WARNING('scan')
+                self.stdout.write(f'{status:>4}  {name:24} {endpoint}')
+                for problem in problems:
+                    self.stdout.write(f'        {problem}')
+                if options['verbose']:
+                    for line in plan.splitlines():
+                        self.stdout.write(f'        | {line}')
+
+                if covered_by:
+                    if problems:
+                        self.stdout.write(
+                            f'        {covered_by} covers this query; the planner may prefer a '
+                            f'scan on small tables (re-run with --analyze or --force-index)'
+                        )
+                else:
+                    proposals.setdefault(model, []).append(fields)
+
+        if proposals:
+            self.stdout.write('\nProposed indexes')
+            for model, field_sets in proposals.items():
+                self.stdout.write(f'  {model._meta.label}.Meta.indexes:')
+                for fields in dict.fromkeys(tuple(f) for f in field_sets):
+                    self.stdout.write(f'    {proposed_index(model, list(fields))}')
+        else:
+            self.stdout.write(self.style.SUCCESS('\n✅ Every hot query has a covering index!'))
+
+    def _problems(self, vendor, plan):
+        """Return (table scan descriptions, whether rows are sorted in memory)."""
+        if vendor == 'sqlite':
+            scans = [f'full scan of {table}' for table in SQLITE_SCAN.findall(plan)]
+            return scans, bool(SQLITE_SORT.search(plan))
+        scans = [f'sequential scan of {table}' for table in POSTGRES_SCAN.findall(plan)]
+        return scans, bool(POSTGRES_SORT.search(plan))
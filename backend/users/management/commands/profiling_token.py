@@ -0,0 +1,22 @@
+"""
+Management command to print a token that asks for a request profile
+Usage: python manage.py profiling_token
+
+Send the token as the X-Profile header to a server running with
+PROFILING_ENABLED; the response's X-Profile-Id header names the profile, which
+staff download from /api/profiles/<id>. Tokens are signed with SECRET_KEY and
+expire after PROFILING_TOKEN_MAX_AGE seconds.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from config import profiling
+
+
+class Command(BaseCommand):
+    help = 'Prints an X-Profile header value for profiling requests'
+
+    def handle(self, *args, **options):
+        self.stdout.write(profiling.make_token())
+        if not settings.PROFILING_ENABLED:
+            self.stderr.write('PROFILING_ENABLED is off; the server will ignore the header')
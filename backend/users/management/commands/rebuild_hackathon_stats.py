@@ -0,0 +1,42 @@
+"""
+Management command to rebuild hackathon analytics rollups
+Usage: python manage.py rebuild_hackathon_stats [--hackathon 3] [--batch-size 200] [--stale-only]
+
+Recomputes HackathonStats and HackathonDailyRegistrations for every hackathon
+(or one), a batch of hackathons per set of grouped queries. Use it after bulk
+changes that bypass the API, such as admin edits or imports.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from hackathons import stats
+from hackathons.models import Hackathon
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the precomputed hackathon analytics rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hackathon', type=int, help='Only rebuild this hackathon')
+        parser.add_argument('--batch-size', type=int, default=200, help='Hackathons per refresh')
+        parser.add_argument('--stale-only', action='store_true',
+                            help='Only refresh rollups flagged stale or never built')
+
+    def handle(self, *args, **options):
+        hackathons = Hackathon.objects.order_by('id')
+        if options['hackathon']:
+            hackathons = hackathons.filter(id=options['hackathon'])
+        if options['stale_only']:
+            hackathons = hackathons.exclude(stats__stale=False)
+        ids = list(hackathons.values_list('id', flat=True))
+
+        started = time.perf_counter()
+        batch_size = options['batch_size']
+        for start in range(0, len(ids), batch_size):
+            stats.refresh(ids[start:start + batch_size])
+            self.stdout.write(f"  {min(start + batch_size, len(ids))}/{len(ids)} hackathons")
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ Rebuilt {len(ids)} hackathon rollups in {time.perf_counter() - started:.2f}s'
+        ))
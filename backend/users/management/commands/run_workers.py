@@ -0,0 +1,126 @@
+"""
+Management command to run background job workers
+Usage: python manage.py run_workers [--queues default:4,email:1] [--processes 2] [--burst]
+
+Each process polls the queues in jobs_job and runs claimed jobs on a thread
+pool per queue; the number after the colon caps how many jobs of that queue
+run at once in one process. With --processes N the command starts N worker
+processes with the same queue limits. --burst exits once the queues are empty.
+"""
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from jobs import queue as job_queue
+
+
+class Command(BaseCommand):
+    help = 'Runs background job workers for the database-backed job queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queues', default=settings.JOB_QUEUES,
+                            help='Comma-separated queue:concurrency pairs')
+        parser.add_argument('--processes', type=int, default=1,
+                            help='Worker processes to start')
+        parser.add_argument('--poll-interval', type=float, default=settings.JOB_POLL_INTERVAL,
+                            help='Seconds to sleep when no job is due')
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit when no jobs are queued or running')
+
+    def handle(self, *args, **options):
+        try:
+            queues = job_queue.parse_queues(options['queues'])
+        except ValueError:
+            raise CommandError(f"Invalid --queues value: {options['queues']}")
+        if not queues:
+            raise CommandError('No queues to work on')
+
+        if options['processes'] > 1:
+            return self._supervise(options)
+
+        self.stdout.write(
+            f"Worker {os.getpid()} on " + ', '.join(f'{q} (x{n})' for q, n in queues.items())
+        )
+        done, failed = self._work(queues, options['poll_interval'], options['burst'])
+        self.stdout.write(self.style.SUCCESS(f'\n✅ Worker stopped ({done} done, {failed} failed)'))
+
+    def _supervise(self, options):
+        argv = [
+            sys.executable, sys.argv[0], 'run_workers',
+            '--queues', options['queues'],
+            '--poll-interval', str(options['poll_interval']),
+        ]
+        if options['burst']:
+            argv.append('--burst')
+        children = [subprocess.Popen(argv) for _ in range(options['processes'])]
+        try:
+            for child in children:
+                child.wait()
+        except KeyboardInterrupt:
+            for child in children:
+                child.send_signal(signal.SIGINT)
+            for child in children:
+                child.wait()
+
+    def _work(self, queues, poll_interval, burst):
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        pools = {
+            name: ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f'jobs-{name}')
+            for name, concurrency in queues.items()
+        }
+        in_flight = {name: set() for name in queues}
+        outcomes = {'done': 0, 'failed': 0, 'queued': 0}
+        outcomes_lock = threading.Lock()
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            stop.set()
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+
+        def execute(job):
+            try:
+                status = job_queue.run(job)
+                with outcomes_lock:
+                    outcomes[status] += 1
+            finally:
+                connection.close()
+
+        next_maintenance = 0.0
+        try:
+            while not stop.is_set():
+                if time.monotonic() >= next_maintenance:
+                    job_queue.requeue_stale(settings.JOB_STALE_AFTER)
+                    job_queue.delete_finished(settings.JOB_RETENTION_SECONDS, settings.JOB_CLEANUP_BATCH_SIZE)
+                    next_maintenance = time.monotonic() + 60
+
+                claimed = 0
+                for name, concurrency in queues.items():
+                    in_flight[name] = {f for f in in_flight[name] if not f.done()}
+                    free = concurrency - len(in_flight[name])
+                    if free <= 0:
+                        continue
+                    for job in job_queue.claim(name, free, worker_id):
+                        in_flight[name].add(pools[name].submit(execute, job))
+                        claimed += 1
+
+                busy = any(in_flight.values())
+                if burst and not claimed and not busy:
+                    break
+                if not claimed:
+                    stop.wait(poll_interval)
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=True)
+            connection.close()
+        return outcomes['done'], outcomes['failed']
@@ -0,0 +1,126 @@
+"""
+Management command to stress-test team capacity under parallel accepts
+Usage: python manage.py stress_team_capacity [--teams 20] [--slots 3] [--candidates 10] [--threads 16] [--naive]
+
+Creates throwaway teams with --slots open positions and --candidates pending
+join requests or invites each, accepts them all from --threads threads at once
+through TeamMembership.accept(), then checks that no team holds more accepted
+members than it had slots and that no open_positions went negative. --naive
+replays the old read-count-then-save() flow for comparison. Everything created
+is deleted afterwards.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from hackathons.models import Hackathon
+from teams.models import Team, TeamMembership
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Accepts memberships in parallel and checks that no team is overfilled'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--teams', type=int, default=20)
+        parser.add_argument('--slots', type=int, default=3)
+        parser.add_argument('--candidates', type=int, default=10, help='Join requests/invites per team')
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--naive', action='store_true', help='Use the unguarded check-then-save flow')
+
+    def handle(self, *args, **options):
+        tag = f'stress-{uuid.uuid4().hex[:8]}'
+        hackathon, teams, memberships = self._setup(tag, options)
+        self.stdout.write(
+            f"{len(teams)} teams x {options['slots']} slots, {len(memberships)} accepts "
+            f"on {options['threads']} threads ({'naive' if options['naive'] else 'conditional UPDATE'})"
+        )
+        try:
+            accept = self._naive_accept if options['naive'] else self._accept
+            barrier = threading.Barrier(options['threads'])
+
+            def worker(batch):
+                barrier.wait()
+                try:
+                    return [accept(membership, options['slots']) for membership in batch]
+                finally:
+                    connection.close()
+
+            batches = [memberships[i::options['threads']] for i in range(options['threads'])]
+            started = time.perf_counter()
+            with ThreadPoolExecutor(options['threads']) as pool:
+                outcomes = [outcome for batch in pool.map(worker, batches) for outcome in batch]
+            elapsed = time.perf_counter() - started
+            close_old_connections()
+
+            rows = Team.all_objects.filter(id__in=[team.id for team in teams]).annotate(
+                members=Count('memberships', filter=Q(memberships__status='accepted', memberships__role='member'))
+            ).values_list('members', 'open_positions')
+            overfilled = sum(1 for members, _ in rows if members > options['slots'])
+            negative = sum(1 for _, open_positions in rows if open_positions < 0)
+            drift = sum(1 for members, open_positions in rows if members + open_positions != options['slots'])
+
+            self.stdout.write(f"  accepted           {outcomes.count('accepted')}")
+            self.stdout.write(f"  refused (full)     {outcomes.count('full')}")
+            self.stdout.write(f"  stale              {outcomes.count('stale')}")
+            self.stdout.write(f"  overfilled teams   {overfilled}")
+            self.stdout.write(f"  negative openings  {negative}")
+            self.stdout.write(f"  count drift        {drift}")
+            self.stdout.write(f"  elapsed            {elapsed:.2f}s")
+        finally:
+            self._cleanup(hackathon, tag)
+
+        if overfilled or negative:
+            self.stdout.write(self.style.ERROR(f'\n❌ {overfilled} teams overfilled'))
+        else:
+            self.stdout.write(self.style.SUCCESS('\n✅ No team overfilled!'))
+
+    def _setup(self, tag, options):
+        now = timezone.now()
+        hackathon = Hackathon.objects.create(
+            name=tag, description='', category='other', mode='remote',
+            start_date=now, end_date=now, location='',
+        )
+        per_team = options['candidates'] + 1
+        users = User.objects.bulk_create([
+            User(username=f'{tag}-{i}', email=f'{tag}-{i}@example.com')
+            for i in range(options['teams'] * per_team)
+        ])
+        teams = Team.objects.bulk_create([
+            Team(name=f'{tag}-{i}', description='', category='other', hackathon=hackathon,
+                 lead=users[i * per_team], open_positions=options['slots'])
+            for i in range(options['teams'])
+        ])
+        rows = []
+        for i, team in enumerate(teams):
+            rows.append(TeamMembership(team=team, user=users[i * per_team], role='leader', status='accepted'))
+            for j in range(1, per_team):
+                status = 'pending' if j % 2 else 'invited'
+                rows.append(TeamMembership(team=team, user=users[i * per_team + j], status=status))
+        TeamMembership.objects.bulk_create(rows)
+        memberships = list(TeamMembership.objects.filter(team__in=teams, role='member').order_by('?'))
+        return hackathon, teams, memberships
+
+    def _accept(self, membership, slots):
+        return membership.accept()
+
+    def _naive_accept(self, membership, slots):
+        # The flow before conditional UPDATEs: count, decide, then save the row
+        accepted = TeamMembership.objects.filter(team_id=membership.team_id, status='accepted', role='member').count()
+        if accepted >= slots:
+            return 'full'
+        time.sleep(0.001)  # request handling between the check and the write
+        membership.status = 'accepted'
+        membership.save()
+        return 'accepted'
+
+    def _cleanup(self, hackathon, tag):
+        Team.all_objects.filter(hackathon=hackathon).delete()
+        User.all_objects.filter(username__startswith=f'{tag}-').delete()
+        hackathon.delete()
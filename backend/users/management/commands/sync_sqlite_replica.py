@@ -0,0 +1,37 @@
+"""
+Management command to refresh the local stand-in read replica
+Usage: SQLITE_REPLICA_NAME=replica.sqlite3 python manage.py sync_sqlite_replica
+
+Copies the default SQLite database into the replica file with SQLite's online
+backup API, so the replica routing can be exercised locally without a
+PostgreSQL streaming replica. Re-run it to simulate replication catching up.
+"""
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Copies the default SQLite database into the stand-in replica'
+
+    def handle(self, *args, **kwargs):
+        alias = settings.REPLICA_DATABASE_ALIAS
+        if alias not in settings.DATABASES:
+            raise CommandError('No replica configured. Set SQLITE_REPLICA_NAME first.')
+
+        primary = settings.DATABASES['default']
+        replica = settings.DATABASES[alias]
+        if 'sqlite3' not in primary['ENGINE'] or 'sqlite3' not in replica['ENGINE']:
+            raise CommandError('sync_sqlite_replica only works with SQLite databases')
+
+        source = sqlite3.connect(primary['NAME'])
+        target = sqlite3.connect(replica['NAME'])
+        try:
+            with target:
+                source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Replica '{alias}' synced from {primary['NAME']}"))
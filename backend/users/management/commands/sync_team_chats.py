@@ -0,0 +1,37 @@
+"""
+Management command to repair team group-chat participants
+Usage: python manage.py sync_team_chats [--batch-size 500] [--dry-run]
+
+Diffs every team chat against the team's accepted memberships and adds or
+removes only the participant rows that differ.
+"""
+from django.core.management.base import BaseCommand
+
+from messages_app.team_chat import sync_team_chats
+
+
+class Command(BaseCommand):
+    help = 'Diff-syncs team chat participants with accepted team memberships'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Team chats compared per round trip')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report differences without changing anything')
+
+    def handle(self, *args, **options):
+        changed = added = removed = 0
+        for conversation_id, added_ids, removed_ids in sync_team_chats(
+            batch_size=options['batch_size'], dry_run=options['dry_run']
+        ):
+            changed += 1
+            added += len(added_ids)
+            removed += len(removed_ids)
+            self.stdout.write(
+                f'  conversation {conversation_id}: +{added_ids or "[]"} -{removed_ids or "[]"}'
+            )
+
+        verb = 'Would sync' if options['dry_run'] else 'Synced'
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ {verb} {changed} team chats ({added} added, {removed} removed)'
+        ))
@@ -1,8 +1,13 @@
 from django.db import models
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
+from config.soft_delete import SoftDeleteManager
 from django.core.validators import URLValidator
 
 
+class ActiveUserManager(SoftDeleteManager, UserManager):
+    pass
+
+
 class User(AbstractUser):
     AVAILABILITY_CHOICES = [
         ('available', 'Available'),
@@ -34,6 +39,10 @@ class User(AbstractUser):
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)  # Set while awaiting purge
+    
+    objects = ActiveUserManager()
+    all_objects = UserManager()
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
@@ -0,0 +1,74 @@
+"""
+Login credential checks.
+
+A login looks the user up by email (unique, so indexed) once and verifies the
+password once; unknown emails still pay for one hash so they cannot be told
+apart from wrong passwords by timing. Passwords stored with an outdated hasher
+or work factor are rehashed with the preferred one on the next successful
+login, as ``User.check_password`` would.
+
+``averify_login`` runs the hashing in a bounded thread pool
+(PASSWORD_HASH_WORKERS) so slow hashes don't block the event loop and a burst
+of logins can't take every thread in the process.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+
+from .models import User
+
+_executor = None
+
+
+def _hash_pool():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(settings.PASSWORD_HASH_WORKERS, thread_name_prefix='password-hash')
+    return _executor
+
+
+def _login_user(email):
+    return User.objects.filter(email=email, is_active=True).only('id', 'password', 'is_active')
+
+
+def check(password, encoded):
+    """
+    Verify ``password`` against the ``encoded`` hash, or None for no user.
+
+    Returns ``(valid, rehashed)`` where ``rehashed`` is a new hash to store
+    when the old one used an outdated hasher, else None.
+    """
+    if encoded is None:
+        make_password(password)
+        return False, None
+    if not check_password(password, encoded):
+        return False, None
+    preferred = get_hasher('default')
+    if identify_hasher(encoded).algorithm != preferred.algorithm or preferred.must_update(encoded):
+        return True, make_password(password, hasher=preferred)
+    return True, None
+
+
+def verify_login(email, password):
+    """The active user with ``email`` and ``password``, or None"""
+    user = _login_user(email).first()
+    valid, rehashed = check(password, user.password if user else None)
+    if not valid:
+        return None
+    if rehashed:
+        User.objects.filter(id=user.id, password=user.password).update(password=rehashed)
+    return user
+
+
+async def averify_login(email, password):
+    """``verify_login`` with the hash computed off the event loop"""
+    user = await _login_user(email).afirst()
+    loop = asyncio.get_running_loop()
+    valid, rehashed = await loop.run_in_executor(_hash_pool(), check, password, user.password if user else None)
+    if not valid:
+        return None
+    if rehashed:
+        await User.objects.filter(id=user.id, password=user.password).aupdate(password=rehashed)
+    return user
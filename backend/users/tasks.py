@@ -0,0 +1,75 @@
+import logging
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from config import facets
+from config.soft_delete import purge_batches
+from hackathons import stats as hackathon_stats
+from hackathons.models import HackathonRegistration
+from jobs.queue import task
+from messages_app.models import Conversation, Message
+from teams.models import Team, TeamMembership, TeamTask
+from teams.tasks import detach_last_messages, team_purge_steps
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+def release_positions(user_ids):
+    """Give the users' places on other teams back as open positions and drop those memberships"""
+    released = TeamMembership.objects.filter(user_id__in=user_ids, status='accepted', role='member')
+    per_team = released.filter(team=OuterRef('pk')).order_by().values('team').annotate(n=Count('pk')).values('n')
+    Team.all_objects.filter(id__in=released.values('team_id')).update(
+        open_positions=F('open_positions') + Subquery(per_team), updated_at=timezone.now()
+    )
+    released.delete()
+
+
+def soft_delete_users(user_ids):
+    """Hide the users and the teams they lead now, free their team places and queue the purge"""
+    now = timezone.now()
+    stale_hackathons = (
+        list(HackathonRegistration.objects.filter(user_id__in=user_ids).values_list('hackathon_id', flat=True))
+        + list(Team.all_objects.filter(memberships__user_id__in=user_ids).values_list('hackathon_id', flat=True))
+    )
+    with transaction.atomic():
+        newly_deleted = list(
+            User.all_objects.filter(id__in=user_ids, deleted_at=None).values_list('id', flat=True)
+        )
+        User.all_objects.filter(id__in=newly_deleted).update(deleted_at=now, is_active=False)
+        Team.all_objects.filter(lead_id__in=user_ids, deleted_at=None).update(deleted_at=now)
+        release_positions(newly_deleted)
+    facets.invalidate('teams')
+    hackathon_stats.mark_stale(stale_hackathons)
+    for user_id in user_ids:
+        purge_user.enqueue(user_id=user_id)
+
+
+@task(queue='purge')
+def purge_user(user_id, progress=None):
+    """Delete a soft-deleted user's teams, messages and memberships in batches, then the user"""
+    progress = progress or {}
+    users = User.all_objects.filter(id=user_id, deleted_at__isnull=False)
+    led_teams = Team.all_objects.filter(lead__in=users)
+    direct = Conversation.objects.filter(Q(user_low__in=users) | Q(user_high__in=users))
+    detach_last_messages(Conversation.objects.filter(
+        Q(team__in=led_teams) | Q(id__in=direct) | Q(last_message__sender__in=users)
+    ))
+    steps = team_purge_steps(led_teams) + [
+        ('direct messages', Message.objects.filter(conversation__in=direct)),
+        ('sent messages', Message.objects.filter(sender__in=users)),
+        ('conversation memberships', Conversation.participants.through.objects.filter(
+            Q(user__in=users) | Q(conversation__in=direct)
+        )),
+        ('created tasks', TeamTask.objects.filter(created_by__in=users)),
+        ('team memberships', TeamMembership.objects.filter(user__in=users)),
+        ('registrations', HackathonRegistration.objects.filter(user__in=users)),
+    ]
+    if purge_batches(steps, progress):
+        users.delete()
+        logger.info('Purged user %s: %s', user_id, progress)
+    else:
+        logger.info('Purging user %s: %s so far', user_id, progress)
+        purge_user.enqueue(user_id=user_id, progress=progress)
@@ -0,0 +1,80 @@
+import json
+from itertools import count
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+from django.test import TestCase, override_settings
+
+from . import passwords
+from .models import User
+from .tasks import soft_delete_users
+
+PASSWORD = 'correct horse battery staple'
+client_addresses = (f'10.0.0.{n}' for n in count(1))
+
+
+class CountingHasher(PBKDF2PasswordHasher):
+    """PBKDF2 with a tiny work factor that counts every hash it computes"""
+    algorithm = 'counting_pbkdf2'
+    iterations = 2
+    hashes = 0
+
+    def encode(self, password, salt, iterations=None):
+        CountingHasher.hashes += 1
+        return super().encode(password, salt, iterations)
+
+
+@override_settings(PASSWORD_HASHERS=[
+    'users.tests.CountingHasher',
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+])
+class LoginTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='ada@buildbuddy.local', username='ada', password=PASSWORD)
+        CountingHasher.hashes = 0
+
+    def login(self, email, password):
+        # A fresh client address per login keeps the tests clear of the login rate limit
+        return self.client.post(
+            '/api/users/login',
+            data=json.dumps({'email': email, 'password': password}),
+            content_type='application/json',
+            REMOTE_ADDR=next(client_addresses),
+        )
+
+    def test_valid_credentials_return_tokens(self):
+        response = self.login(self.user.email, PASSWORD)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.json())
+
+    def test_unknown_email_still_pays_one_hash(self):
+        self.assertIsNone(passwords.verify_login('nobody@buildbuddy.local', PASSWORD))
+        self.assertEqual(CountingHasher.hashes, 1)
+
+    def test_wrong_password_pays_one_hash(self):
+        self.assertIsNone(passwords.verify_login(self.user.email, 'wrong'))
+        self.assertEqual(CountingHasher.hashes, 1)
+
+    def test_wrong_password_returns_401(self):
+        response = self.login(self.user.email, 'wrong')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {'detail': 'Invalid credentials'})
+
+    def test_inactive_user_is_refused(self):
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        self.assertEqual(self.login(self.user.email, PASSWORD).status_code, 401)
+
+    def test_soft_deleted_user_is_refused(self):
+        soft_delete_users([self.user.id])
+        self.assertEqual(self.login(self.user.email, PASSWORD).status_code, 401)
+
+    def test_outdated_hash_is_rewritten_once(self):
+        outdated = make_password(PASSWORD, hasher='md5')
+        User.objects.filter(id=self.user.id).update(password=outdated)
+
+        self.assertEqual(passwords.verify_login(self.user.email, PASSWORD).id, self.user.id)
+        rehashed = User.objects.get(id=self.user.id).password
+        self.assertTrue(rehashed.startswith('counting_pbkdf2$'))
+
+        # The next login verifies the new hash and leaves it alone
+        self.assertEqual(self.login(self.user.email, PASSWORD).status_code, 200)
+        self.assertEqual(User.objects.get(id=self.user.id).password, rehashed)